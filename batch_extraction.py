@@ -0,0 +1,187 @@
+from collections import deque
+
+from llm_cache import estimate_tokens, parse_json_reply
+
+# Budgets for one batched request. gpt-4o-mini (128k context, 16k output) is not
+# the limit: a failed or truncated batch is resent, so the prompt budget only needs
+# to fit MAX_BATCH_SIZE posts compressed to tiered_extractor.DESCRIPTION_TOKEN_BUDGET
+# plus the shared header, and the output budget MAX_BATCH_SIZE answers with every field
+MAX_PROMPT_TOKENS = 10000
+MAX_OUTPUT_TOKENS = 3500
+TOKENS_PER_FIELD = 40
+MAX_BATCH_SIZE = 12
+MAX_RETRIES = 2
+
+def parse_json_array(text):
+    """Parse a JSON array of answers from a model reply, also accepting {"results": [...]} or {id: {...}}"""
+    data = parse_json_reply(text, opening="[")
+    if isinstance(data, dict):
+        # {"results": [...]} or {"p1": {...}, "p2": {...}}
+        if isinstance(data.get("results"), list):
+            data = data["results"]
+        else:
+            data = [dict(value, id=key) for key, value in data.items() if isinstance(value, dict)]
+    return data if isinstance(data, list) else None
+
+
+class BatchExtractor:
+    """
+    Packs several posts into one chat completion and maps the answers back by id.
+
+    items are dicts with "id", "title", "description" and "fields" (the fields to
+    extract for that post).
+
+    build_prompt(items) -> prompt text with one shared instruction header
+    complete(prompt, max_tokens) -> (reply text, finish_reason), or None on API error
+    validate(answer, fields) -> cleaned answer dict, or None if unusable
+    repair(text) -> (fixed reply text, finish_reason) or None; optional, asked
+        once to fix a reply that is not parseable JSON before the batch is retried
+
+    Batches are filled greedily up to the prompt and output token budgets and the
+    current batch size, adding up each post's own share of the prompt (measured
+    once per post against the empty header) instead of rebuilding it per candidate. Elements that are missing or fail validation are split in
+    halves and retried (up to max_retries per post); a truncated or unparseable
+    reply halves the batch size, and each clean batch grows it again by one.
+    """
+
+    def __init__(self, build_prompt, complete, validate,
+                 max_prompt_tokens=MAX_PROMPT_TOKENS, max_output_tokens=MAX_OUTPUT_TOKENS,
+                 max_batch_size=MAX_BATCH_SIZE, max_retries=MAX_RETRIES, repair=None):
+        self.build_prompt = build_prompt
+        self.complete = complete
+        self.validate = validate
+        self.repair = repair
+        self.max_prompt_tokens = max_prompt_tokens
+        self.max_output_tokens = max_output_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.batch_size = max_batch_size
+        self.post_tokens = {}
+        self.stats = {
+            "requests": 0,
+            "posts_sent": 0,
+            "posts_answered": 0,
+            "retries": 0,
+            "resplits": 0,
+            "failed_posts": 0,
+            "prompt_tokens_sent": 0,
+            "repairs": 0,
+            "repaired": 0,
+        }
+
+    def _item_output_tokens(self, item):
+        return 10 + TOKENS_PER_FIELD * len(item["fields"])
+
+    def _output_tokens(self, items):
+        return sum(self._item_output_tokens(item) for item in items)
+
+    def _post_tokens(self, item, header_tokens):
+        """Prompt tokens one post adds to the shared header"""
+        if item["id"] not in self.post_tokens:
+            self.post_tokens[item["id"]] = max(0, estimate_tokens(self.build_prompt([item])) - header_tokens)
+        return self.post_tokens[item["id"]]
+
+    def _next_batch(self, pending):
+        """Take posts from the queue while they fit the token budgets and batch size"""
+        header_tokens = estimate_tokens(self.build_prompt([]))
+        batch = [pending.popleft()]
+        prompt_tokens = header_tokens + self._post_tokens(batch[0], header_tokens)
+        output_tokens = self._item_output_tokens(batch[0])
+        while pending and len(batch) < self.batch_size:
+            post_tokens = self._post_tokens(pending[0], header_tokens)
+            if prompt_tokens + post_tokens > self.max_prompt_tokens:
+                break
+            if output_tokens + self._item_output_tokens(pending[0]) > self.max_output_tokens:
+                break
+            prompt_tokens += post_tokens
+            output_tokens += self._item_output_tokens(pending[0])
+            batch.append(pending.popleft())
+        return batch
+
+    def _request(self, batch):
+        """Send one batch; return ({id: answer}, whole_reply_failed)"""
+        prompt = self.build_prompt(batch)
+        max_tokens = min(self.max_output_tokens, self._output_tokens(batch))
+        self.stats["requests"] += 1
+        self.stats["posts_sent"] += len(batch)
+        self.stats["prompt_tokens_sent"] += estimate_tokens(prompt)
+
+        reply = self.complete(prompt, max_tokens)
+        if reply is None:
+            return {}, True
+        text, finish_reason = reply
+
+        elements = parse_json_array(text)
+        if elements is None and self.repair is not None:
+            # one short fix-up request is cheaper than resending every post
+            self.stats["repairs"] += 1
+            fixed = self.repair(text)
+            elements = parse_json_array(fixed[0]) if fixed else None
+            if elements is not None:
+                self.stats["repaired"] += 1
+        if elements is None:
+            print(f"⚠️ Batch reply for {len(batch)} posts was not a JSON array")
+            return {}, True
+
+        fields_by_id = {item["id"]: item["fields"] for item in batch}
+        answers = {}
+        for element in elements:
+            if not isinstance(element, dict):
+                continue
+            post_id = str(element.get("id"))
+            if post_id not in fields_by_id or post_id in answers:
+                continue
+            cleaned = self.validate(element, fields_by_id[post_id])
+            if cleaned is not None:
+                answers[post_id] = cleaned
+        # a cut-off reply means the batch was too big even if some elements parsed
+        return answers, finish_reason == "length"
+
+    def run(self, items):
+        """Extract all items; returns {id: answer} for every post that got a valid answer"""
+        results = {}
+        attempts = {}
+        pending = deque(items)
+        retry_batches = deque()
+
+        while retry_batches or pending:
+            batch = retry_batches.popleft() if retry_batches else self._next_batch(pending)
+            answers, reply_failed = self._request(batch)
+            results.update(answers)
+            self.stats["posts_answered"] += len(answers)
+
+            if reply_failed:
+                self.batch_size = max(1, len(batch) // 2)
+            elif len(answers) == len(batch):
+                self.batch_size = min(self.max_batch_size, self.batch_size + 1)
+
+            failed = [item for item in batch if item["id"] not in answers]
+            retry = []
+            for item in failed:
+                attempts[item["id"]] = attempts.get(item["id"], 0) + 1
+                if attempts[item["id"]] <= self.max_retries:
+                    retry.append(item)
+                else:
+                    self.stats["failed_posts"] += 1
+            if not retry:
+                continue
+
+            self.stats["retries"] += len(retry)
+            if len(retry) > 1:
+                self.stats["resplits"] += 1
+                middle = len(retry) // 2
+                retry_batches.appendleft(retry[middle:])
+                retry_batches.appendleft(retry[:middle])
+            else:
+                retry_batches.appendleft(retry)
+
+        return results
+
+    def print_report(self):
+        s = self.stats
+        print("\n📦 BATCH EXTRACTION")
+        print(f"   Requests: {s['requests']} for {s['posts_sent']} post slots")
+        print(f"   Posts answered: {s['posts_answered']}  Failed after retries: {s['failed_posts']}")
+        print(f"   Retried posts: {s['retries']}  Resplits: {s['resplits']}")
+        print(f"   Broken replies repaired: {s['repaired']}/{s['repairs']}")
+        print(f"   Final batch size: {self.batch_size}")
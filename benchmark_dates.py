@@ -0,0 +1,111 @@
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime
+
+from dates import MONTH_NAMES, _parse, _parse_cached, parse_date
+from telemetry import REPORTS_DIR
+
+# Writing styles seen in the scraped deadline fields
+TEMPLATES = [
+    "{iso}",
+    "{d}/{m}/{y}",
+    "{d}.{m}.{y}",
+    "{d} {month} {y}",
+    "{d}th of {month} {y}",
+    "{month} {d}, {y}",
+    "{d} {month} {y}, 17:00 Brussels time",
+    "Monday, {d} {month} {y} 23:59 CET",
+    "{d}–{d2} {month} {y}",
+    "{month} {d}-{d2}, {y}",
+    "{d} {month}",
+    "{month} {y}",
+    "{d} {month_bg} {y} г.",
+    "{d}-ви {month_bg} {y}",
+    "{d} {month_eu} {y}",
+    "No date found",
+    "UPCOMING",
+]
+
+
+def synthetic_deadlines(records, distinct, seed=0):
+    """records deadline strings drawn from `distinct` variants, a few of them very common"""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        y = rng.choice([2025, 2026, 2027])
+        m = rng.randint(1, 12)
+        d = rng.randint(1, 27)
+        names = MONTH_NAMES[m]
+        month_bg = next(name for name in names if "а" <= name[0] <= "я")
+        pool.append(rng.choice(TEMPLATES).format(
+            iso=f"{y}-{m:02d}-{d:02d}", d=d, d2=d + 1, m=m, y=y,
+            month=names[0].capitalize(), month_bg=month_bg, month_eu=rng.choice(names[5:]),
+        ))
+    # repeated deadlines: weights fall off like a long-tail distribution
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    return rng.choices(pool, weights=weights, k=records)
+
+
+def timed(function, corpus):
+    started = time.perf_counter()
+    results = [function(text) for text in corpus]
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deadline parser benchmark over a synthetic corpus")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_deadlines(args.records, args.distinct, args.seed)
+    today = date.today()
+    print(f"📅 {len(corpus)} deadline strings, {len(set(corpus))} distinct")
+
+    # without the memo: every string goes through the full parser
+    uncached, uncached_seconds = timed(lambda text: _parse(text, today), corpus)
+    _parse_cached.cache_clear()
+    memoized, cold_seconds = timed(parse_date, corpus)
+    _, warm_seconds = timed(parse_date, corpus)
+    memo = _parse_cached.cache_info()
+    assert uncached == memoized
+
+    parsed = [result for result in memoized if result]
+    results = {
+        "settings": vars(args),
+        "records": len(corpus),
+        "distinct": len(set(corpus)),
+        "parsed": len(parsed),
+        "ranges": sum(1 for result in parsed if result.start),
+        "ambiguous": sum(1 for result in parsed if result.ambiguous),
+        "precision": {p: sum(1 for result in parsed if result.precision == p) for p in ("day", "month", "year")},
+        "uncached_seconds": round(uncached_seconds, 3),
+        "memoized_cold_seconds": round(cold_seconds, 3),
+        "memoized_warm_seconds": round(warm_seconds, 3),
+        "uncached_per_second": round(len(corpus) / uncached_seconds),
+        "memoized_per_second": round(len(corpus) / cold_seconds),
+        "memo": {"hits": memo.hits, "misses": memo.misses, "size": memo.currsize},
+    }
+
+    print(f"\n{'='*50}")
+    print("📈 DATE PARSER BENCHMARK")
+    print(f"   Parsed: {results['parsed']}/{results['records']}  Ranges: {results['ranges']}  "
+          f"Ambiguous: {results['ambiguous']}  Precision: {results['precision']}")
+    print(f"   Uncached: {results['uncached_seconds']}s ({results['uncached_per_second']}/s)")
+    print(f"   Memoized: {results['memoized_cold_seconds']}s cold ({results['memoized_per_second']}/s), "
+          f"{results['memoized_warm_seconds']}s warm")
+    print(f"   Memo: {memo.hits} hits, {memo.misses} misses")
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORTS_DIR / f"benchmark_dates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Report saved to: {path}")
+    print(f"{'='*50}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from boilerplate import strip_entries
+from llm_gateway import LLMGateway
+from openai_standin import start_in_background
+from telemetry import Telemetry, REPORTS_DIR
+from translation_memory import TranslationMemory
+from translator import BulgarianTranslator
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+SCRAPERS_DIR = BASE_DIR / "scrapers"
+
+BOILERPLATE = [
+    "This project is funded by the European Union through the Erasmus+ programme.",
+    "Travel and accommodation costs are covered according to the programme rules.",
+    "Participants will receive a Youthpass certificate.",
+]
+TOPICS = ["climate action", "digital skills", "media literacy", "social inclusion", "entrepreneurship",
+          "mental health", "rural youth", "European citizenship"]
+PLACES = ["Sofia, Bulgaria", "Lisbon, Portugal", "Berlin, Germany", "online", "Plovdiv, Bulgaria"]
+
+
+def synthetic_entries(count):
+    """Opportunity-like records with repeated titles and shared boilerplate paragraphs"""
+    entries = []
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        place = PLACES[i % len(PLACES)]
+        # every fifth title repeats an earlier one, as when sources overlap
+        title = f"Youth exchange on {topic} in {place}" if i % 5 else f"Training course: {topic}"
+        paragraphs = [
+            f"Opportunity {i}: a {topic} activity hosted in {place} for young people aged 18-30.",
+            f"Deadline: {1 + i % 28} December 2026. Apply through the online form.",
+            BOILERPLATE[i % len(BOILERPLATE)],
+        ]
+        entries.append({"postNo": i + 1, "title": title, "description": "\n".join(paragraphs)})
+    return entries
+
+
+def bench_translation(gateway, entries, concurrency):
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TranslationMemory(Path(tmp) / "memory.sqlite")
+        translator = BulgarianTranslator(memory=memory, gateway=gateway)
+        started = time.perf_counter()
+        # same order as the merge: strip boilerplate, then translate
+        boilerplate = strip_entries(entries)
+        translator.translate_entries(entries, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        untranslated = sum(1 for e in entries if e.get("title_bg") == e.get("title"))
+        memory.close()
+    return {
+        "entries": len(entries),
+        "seconds": round(elapsed, 2),
+        "entries_per_second": round(len(entries) / elapsed, 1) if elapsed else None,
+        "api_calls": translator.api_calls,
+        "deduplicated": translator.deduplicated,
+        "untranslated_titles": untranslated,
+        "boilerplate": boilerplate.report(),
+    }
+
+
+def bench_extraction(gateway, entries):
+    sys.path.append(str(SCRAPERS_DIR))
+    try:
+        from smokinya_scraper import SmokinyaScraper, MODEL, PROMPT_VERSION
+        from llm_cache import ExtractionCache
+    except ImportError as e:
+        print(f"⚠️ Skipping extraction benchmark (scraper dependencies missing: {e})")
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ExtractionCache(model=MODEL, prompt_version=PROMPT_VERSION, path=Path(tmp) / "extraction.sqlite")
+        scraper = SmokinyaScraper(cache=cache)
+        scraper.gateway = gateway
+        started = time.perf_counter()
+        results = scraper.extractor.extract_many(
+            [(e["postNo"], e["title"], e["description"]) for e in entries], scraper.batch_extractor
+        )
+        elapsed = time.perf_counter() - started
+        cache.close()
+    return {
+        "posts": len(entries),
+        "seconds": round(elapsed, 2),
+        "posts_per_second": round(len(entries) / elapsed, 1) if elapsed else None,
+        "extracted": sum(1 for r in results if r),
+        "tiered": scraper.extractor.report(),
+        "batch": dict(scraper.batch_extractor.stats, final_batch_size=scraper.batch_extractor.batch_size),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline translation / extraction benchmark against the local stand-in")
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--rate-limit", type=int, default=20, help="stand-in requests per second (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of random 429 replies")
+    parser.add_argument("--malformed-rate", type=float, default=0.1, help="share of broken JSON replies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-extraction", action="store_true")
+    args = parser.parse_args()
+
+    server, state, base_url = start_in_background(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit=args.rate_limit,
+        error_rate=args.error_rate, malformed_rate=args.malformed_rate, seed=args.seed
+    )
+    telemetry = Telemetry()
+    gateway = LLMGateway(api_key="stand-in", base_url=base_url, telemetry=telemetry)
+    print(f"🧪 Stand-in at {base_url}: {args.latency_ms}±{args.jitter_ms} ms, "
+          f"{args.rate_limit or 'unlimited'} req/s, {args.error_rate:.0%} 429s, {args.malformed_rate:.0%} malformed")
+
+    results = {"settings": vars(args)}
+    try:
+        print(f"\n🔤 Translating {args.entries} synthetic entries...")
+        results["translation"] = bench_translation(gateway, synthetic_entries(args.entries), args.concurrency)
+        if not args.skip_extraction:
+            print(f"\n🤖 Extracting {args.entries} synthetic posts...")
+            results["extraction"] = bench_extraction(gateway, synthetic_entries(args.entries))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    results["standin"] = state.stats
+    results["gateway"] = gateway.stats
+    results["telemetry"] = telemetry.report()
+
+    print(f"\n{'='*50}")
+    print("📈 BENCHMARK")
+    for stage in ("translation", "extraction"):
+        if results.get(stage):
+            print(f"   {stage}: " + ", ".join(f"{k}={v}" for k, v in results[stage].items()
+                                             if not isinstance(v, dict)))
+    print(f"   stand-in: {state.stats}")
+    print(f"   gateway: {gateway.stats}")
+    telemetry.print_report()
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORTS_DIR / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Report saved to: {path}")
+    print(f"{'='*50}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import re
+from collections import Counter
+
+from tiered_extractor import KEY_LINE_RE, estimate_tokens
+
+# A paragraph is boilerplate for a source once it shows up in at least this
+# many of its documents and in at least this share of them
+MIN_DOCUMENTS = 3
+MIN_SHARE = 0.3
+
+PARAGRAPH_SPLIT_RE = re.compile(r"(\n+)")
+NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def paragraph_fingerprint(paragraph):
+    """Hash of a paragraph with case, punctuation and spacing ignored (None for empty text)"""
+    normalized = NON_WORD_RE.sub(" ", paragraph.casefold()).strip()
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class BoilerplateDetector:
+    """
+    Learns which paragraphs repeat across the documents of one source (share
+    prompts, "follow us" footers, disclaimers) and strips them before texts
+    go to token-billed calls. Paragraphs with deadline, location or eligibility
+    cues are never stripped, and a document is never stripped down to nothing.
+    """
+
+    def __init__(self, min_documents=MIN_DOCUMENTS, min_share=MIN_SHARE):
+        self.min_documents = min_documents
+        self.min_share = min_share
+        self.documents = Counter()
+        self.counts = {}
+        self.stats = {}
+
+    def learn(self, source, descriptions):
+        """Count each paragraph fingerprint once per document of the source"""
+        counts = self.counts.setdefault(source, Counter())
+        for description in descriptions:
+            if not description:
+                continue
+            self.documents[source] += 1
+            counts.update({paragraph_fingerprint(p) for p in description.splitlines()} - {None})
+
+    def is_boilerplate(self, source, paragraph):
+        if KEY_LINE_RE.search(paragraph):
+            return False
+        fingerprint = paragraph_fingerprint(paragraph)
+        count = self.counts.get(source, {}).get(fingerprint, 0) if fingerprint else 0
+        return count >= self.min_documents and count >= self.min_share * self.documents[source]
+
+    def strip(self, source, description):
+        """Description without the source's boilerplate paragraphs"""
+        if not description:
+            return description
+        # paragraphs at even positions, the newlines before them at odd ones
+        parts = PARAGRAPH_SPLIT_RE.split(description)
+        kept = []
+        removed = 0
+        for i in range(0, len(parts), 2):
+            if not parts[i].strip():
+                continue
+            if self.is_boilerplate(source, parts[i]):
+                removed += 1
+            else:
+                kept.append((parts[i - 1] if i else "", parts[i]))
+        if not removed or not kept:
+            return description
+
+        cleaned = kept[0][1] + "".join(separator + paragraph for separator, paragraph in kept[1:])
+        stats = self.stats.setdefault(source, {"documents": 0, "paragraphs_removed": 0,
+                                               "chars_removed": 0, "tokens_removed": 0})
+        stats["documents"] += 1
+        stats["paragraphs_removed"] += removed
+        stats["chars_removed"] += len(description) - len(cleaned)
+        stats["tokens_removed"] += estimate_tokens(description) - estimate_tokens(cleaned)
+        return cleaned
+
+    def report(self):
+        return {source: dict(stats) for source, stats in self.stats.items()}
+
+    def print_report(self):
+        print("\n🧹 BOILERPLATE STRIPPED")
+        if not self.stats:
+            print("   Nothing stripped")
+        for source, s in self.stats.items():
+            print(f"   {source}: {s['paragraphs_removed']} paragraphs from {s['documents']} documents, "
+                  f"{s['chars_removed']} chars (~{s['tokens_removed']} tokens)")
+
+
+def strip_entries(entries, detector=None):
+    """
+    Learn boilerplate per entry["source"] across all entries, then strip it from
+    every description. The untouched text is kept in originalDescription.
+    """
+    detector = detector or BoilerplateDetector()
+    by_source = {}
+    for entry in entries:
+        by_source.setdefault(entry.get("source"), []).append(entry.get("description"))
+    for source, descriptions in by_source.items():
+        detector.learn(source, descriptions)
+
+    for entry in entries:
+        description = entry.get("description")
+        if not entry.get("originalDescription"):
+            entry["originalDescription"] = description
+        entry["description"] = detector.strip(entry.get("source"), description)
+    return detector
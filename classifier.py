@@ -0,0 +1,260 @@
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+CONFIG_DIR = BASE_DIR / "config"
+CATEGORY_KEYWORDS_FILE = CONFIG_DIR / "category_keywords.json"
+
+# Order matters: the first type / mode with a keyword hit wins
+TYPE_KEYWORDS = {
+    'competition': ['competition', 'contest', 'prize', 'award', 'challenge', 'tournament'],
+    'exchange': ['exchange', 'cultural exchange', 'youth exchange', 'student exchange'],
+    'event': ['event', 'conference', 'summit', 'workshop', 'seminar', 'forum', 'meeting'],
+    'scholarship': ['scholarship', 'grant', 'funding', 'financial aid', 'stipend'],
+    'erasmus': ['erasmus', 'erasmus+', 'erasmus plus'],
+    'volunteering': ['volunteering', 'volunteer', 'solidarity']
+}
+
+MODE_KEYWORDS = {
+    'hybrid': ['hybrid', 'both online and in-person', 'online and onsite', 'partially remote'],
+    'remote': ['remote', 'virtual', 'digital', 'zoom', 'webinar', 'from home'],
+    'on-site': ['on-site', 'onsite', 'in-person', 'physical', 'venue', 'location', 'face-to-face']
+}
+
+DEFAULT_TYPE = 'volunteering'
+DEFAULT_MODE = 'on-site'
+
+TOKEN_RE = re.compile(r"\w+")
+WORD_CHAR_RE = re.compile(r"\w")
+
+
+def tokenize(text):
+    """Lowercase word tokens; keywords and documents go through the same tokenizer"""
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _trie_pattern(node):
+    """Regex for a {char: subtree, "": whole_word} trie that prefers the longest keyword"""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if "" in node:
+        branches.append(r"(?!\w)" if node[""] else "")
+    elif len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def load_category_keywords(path=CATEGORY_KEYWORDS_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not load {path}: {e}")
+        return {}
+
+
+class BatchClassifier:
+    """
+    Keyword classifier that scores a whole batch of (title, description) pairs at once.
+
+    Every keyword phrase (and its plain plural) becomes a column of a sparse
+    term-document matrix, so type, mode and category scores for N documents are
+    three sparse matrix products instead of N x keywords substring scans.
+
+    substrings=True matches keywords as substrings of the lowercased text
+    instead of whole tokens ("award" also hits "awarded"), for scrapers whose
+    output was built that way. Keywords are lowercased too; ones written with
+    capitals ("AI", "SEO", "Java") are names and must stand as whole words, so
+    "ai" does not hit "training". One compiled regex finds every keyword
+    occurrence in a single scan of each text.
+    """
+
+    def __init__(self, type_keywords=None, mode_keywords=None, category_keywords=None,
+                 default_type=DEFAULT_TYPE, default_mode=DEFAULT_MODE, substrings=False):
+        self.default_type = default_type
+        self.default_mode = default_mode
+        self.substrings = substrings
+        self.vocabulary = {}
+        # first token of every multi-word phrase -> phrase lengths starting with it
+        self.phrase_starts = {}
+        # substring mode: lowercased keyword -> True if it only matches as a whole word
+        self.whole_words = {}
+
+        if category_keywords is None:
+            category_keywords = load_category_keywords()
+
+        type_pairs = self._register_keywords(type_keywords or TYPE_KEYWORDS)
+        mode_pairs = self._register_keywords(mode_keywords or MODE_KEYWORDS)
+        category_pairs = self._register_keywords(category_keywords)
+
+        self.type_labels = list((type_keywords or TYPE_KEYWORDS).keys())
+        self.mode_labels = list((mode_keywords or MODE_KEYWORDS).keys())
+        self.category_labels = list(category_keywords.keys())
+
+        self.type_weights = self._label_matrix(type_pairs, len(self.type_labels))
+        self.mode_weights = self._label_matrix(mode_pairs, len(self.mode_labels))
+        self.category_weights = self._label_matrix(category_pairs, len(self.category_labels))
+        if substrings:
+            self._compile_substrings()
+
+    def _register_keywords(self, keyword_map):
+        """Add keyword phrases to the vocabulary, return (term column, label index) pairs"""
+        pairs = []
+        for label_index, keywords in enumerate(keyword_map.values()):
+            for keyword in keywords:
+                if self.substrings:
+                    phrase = keyword.lower()
+                    if phrase:
+                        pairs.append((self.vocabulary.setdefault(phrase, len(self.vocabulary)), label_index))
+                        self.whole_words[phrase] = self.whole_words.get(phrase, True) and phrase != keyword
+                    continue
+                tokens = tokenize(keyword)
+                if not tokens:
+                    continue
+                variants = [tokens]
+                if not tokens[-1].endswith('s'):
+                    variants.append(tokens[:-1] + [tokens[-1] + 's'])
+                for variant in variants:
+                    phrase = " ".join(variant)
+                    column = self.vocabulary.setdefault(phrase, len(self.vocabulary))
+                    pairs.append((column, label_index))
+                    if len(variant) > 1:
+                        self.phrase_starts.setdefault(variant[0], set()).add(len(variant))
+        return pairs
+
+    def _compile_substrings(self):
+        """
+        One lookahead regex over a character trie of the keywords, so each text
+        position yields the longest keyword starting there (the branches are
+        tried before the end of a keyword); the shorter keywords starting at the
+        same position are exactly its keyword prefixes.
+        """
+        phrases = sorted(self.vocabulary, key=len, reverse=True)
+        trie = {}
+        for phrase in phrases:
+            node = trie
+            for ch in phrase:
+                node = node.setdefault(ch, {})
+            node[""] = self.whole_words[phrase]
+        self.substring_re = re.compile(f"(?=({_trie_pattern(trie)}))") if phrases else None
+        self.keyword_prefixes = {
+            phrase: [(prefix, self.vocabulary[prefix], self.whole_words[prefix])
+                     for prefix in phrases if phrase.startswith(prefix)]
+            for phrase in phrases
+        }
+
+    def _substring_columns(self, text):
+        """Vocabulary columns of every keyword occurrence in the lowercased text"""
+        columns = []
+        if self.substring_re is None:
+            return columns
+        for match in self.substring_re.finditer(text):
+            start = match.start()
+            for prefix, column, whole_word in self.keyword_prefixes[match.group(1)]:
+                end = start + len(prefix)
+                if whole_word and (WORD_CHAR_RE.match(text[start - 1:start])
+                                   or WORD_CHAR_RE.match(text[end:end + 1])):
+                    continue
+                columns.append(column)
+        return columns
+
+    def _label_matrix(self, pairs, n_labels):
+        """Binary (terms x labels) matrix; duplicate keywords within a label count once"""
+        pairs = sorted(set(pairs))
+        rows = np.fromiter((p[0] for p in pairs), dtype=np.int32, count=len(pairs))
+        cols = np.fromiter((p[1] for p in pairs), dtype=np.int32, count=len(pairs))
+        data = np.ones(len(pairs), dtype=np.float32)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(self.vocabulary), n_labels))
+
+    def document_term_matrix(self, texts):
+        """Sparse (documents x keyword terms) count matrix built in one pass over the batch"""
+        indptr = [0]
+        indices = []
+        vocabulary = self.vocabulary
+        phrase_starts = self.phrase_starts
+
+        for text in texts:
+            if self.substrings:
+                indices.extend(self._substring_columns((text or "").lower()))
+                indptr.append(len(indices))
+                continue
+            tokens = tokenize(text)
+            for start, token in enumerate(tokens):
+                column = vocabulary.get(token)
+                if column is not None:
+                    indices.append(column)
+                # Only tokens that open a multi-word keyword pay for n-gram lookups
+                for n in phrase_starts.get(token, ()):
+                    column = vocabulary.get(" ".join(tokens[start:start + n]))
+                    if column is not None:
+                        indices.append(column)
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), len(vocabulary))
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def score(self, pairs):
+        """
+        Return raw keyword-hit scores for a batch of (title, description) pairs:
+        {"type": (N x types), "mode": (N x modes), "categories": sparse (N x categories)}
+        Mode is scored on the description only, like the per-post scrapers did.
+        """
+        titles = [title or "" for title, _ in pairs]
+        descriptions = [description or "" for _, description in pairs]
+
+        title_matrix = self.document_term_matrix(titles)
+        description_matrix = self.document_term_matrix(descriptions)
+        full_matrix = title_matrix + description_matrix
+
+        return {
+            "type": (full_matrix @ self.type_weights).toarray(),
+            "mode": (description_matrix @ self.mode_weights).toarray(),
+            "categories": (full_matrix @ self.category_weights).tocsr(),
+        }
+
+    def _pick_first(self, scores, labels, default):
+        """First label (in keyword-table order) with a hit per row, else the default"""
+        if scores.shape[1] == 0:
+            return np.full(scores.shape[0], default, dtype=object)
+        hits = scores > 0
+        first = hits.argmax(axis=1)
+        return np.where(hits.any(axis=1), np.asarray(labels, dtype=object)[first], default)
+
+    def classify(self, pairs):
+        """Classify a batch of (title, description) pairs into type, modeOfWork and categories"""
+        pairs = list(pairs)
+        if not pairs:
+            return []
+
+        scores = self.score(pairs)
+        types = self._pick_first(scores["type"], self.type_labels, self.default_type)
+        modes = self._pick_first(scores["mode"], self.mode_labels, self.default_mode)
+
+        category_scores = scores["categories"]
+        category_scores.eliminate_zeros()
+        category_labels = np.asarray(self.category_labels, dtype=object)
+        results = []
+        for i in range(len(pairs)):
+            start, end = category_scores.indptr[i], category_scores.indptr[i + 1]
+            matched = np.sort(category_scores.indices[start:end])
+            results.append({
+                "type": types[i],
+                "modeOfWork": modes[i],
+                "categories": category_labels[matched].tolist(),
+            })
+        return results
+
+    def classify_one(self, title, description):
+        """Convenience wrapper for per-post use inside the scrapers"""
+        return self.classify([(title, description)])[0]
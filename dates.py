@@ -0,0 +1,259 @@
+import re
+import unicodedata
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Distinct deadline strings kept in the parse memo
+DATE_CACHE_SIZE = 8192
+
+# A year-less date further in the past than this is taken to mean next year
+PAST_SLACK = timedelta(days=183)
+
+# date: ISO end of the deadline (the last day of a range), start: ISO first day
+# of a range or None; precision: "day", "month" or "year"; ambiguous: day/month
+# order or year had to be guessed
+ParsedDate = namedtuple("ParsedDate", "date precision ambiguous start")
+
+# Month names and abbreviations, accent-free and lowercase (see fold());
+# genitive forms where a language uses them in dates
+MONTH_NAMES = {
+    1: ["january", "jan", "януари", "яну", "januar", "janner", "janvier", "janv", "enero", "ene", "gennaio",
+        "gen", "janeiro", "ianuarie", "ian", "januari", "stycznia", "styczen", "ιανουαριου", "ιανουαριος"],
+    2: ["february", "feb", "февруари", "фев", "februar", "fevrier", "fevr", "febrero", "febbraio", "fevereiro",
+        "fev", "februarie", "februari", "lutego", "luty", "φεβρουαριου", "φεβρουαριος"],
+    3: ["march", "mar", "март", "marz", "mars", "marzo", "marco", "martie", "maart", "marca", "marzec",
+        "μαρτιου", "μαρτιος"],
+    4: ["april", "apr", "април", "апр", "avril", "abril", "abr", "aprile", "aprilie", "kwietnia", "kwiecien",
+        "απριλιου", "απριλιος"],
+    5: ["may", "май", "mai", "mayo", "maggio", "maio", "mei", "maja", "maj", "μαιου", "μαιος"],
+    6: ["june", "jun", "юни", "juni", "juin", "junio", "giugno", "junho", "iunie", "czerwca", "czerwiec",
+        "ιουνιου", "ιουνιος"],
+    7: ["july", "jul", "юли", "juli", "juillet", "juil", "julio", "luglio", "julho", "iulie", "lipca", "lipiec",
+        "ιουλιου", "ιουλιος"],
+    8: ["august", "aug", "август", "авг", "aout", "agosto", "ago", "augustus", "sierpnia", "sierpien",
+        "αυγουστου", "αυγουστος"],
+    9: ["september", "sep", "sept", "септември", "сеп", "септ", "septembre", "septiembre", "settembre",
+        "setembro", "septembrie", "wrzesnia", "wrzesien", "σεπτεμβριου", "σεπτεμβριος"],
+    10: ["october", "oct", "октомври", "окт", "oktober", "okt", "octobre", "octubre", "ottobre", "ott",
+         "outubro", "out", "octombrie", "pazdziernika", "pazdziernik", "οκτωβριου", "οκτωβριος"],
+    11: ["november", "nov", "ноември", "ное", "novembre", "noviembre", "novembro", "noiembrie", "listopada",
+         "listopad", "νοεμβριου", "νοεμβριος"],
+    12: ["december", "dec", "декември", "дек", "dezember", "dez", "decembre", "diciembre", "dic", "dicembre",
+         "dezembro", "decembrie", "grudnia", "grudzien", "δεκεμβριου", "δεκεμβριος"],
+}
+
+# Placeholders the scrapers write when a post has no deadline
+NO_DATE_VALUES = {"no date found", "upcoming", "unknown", "n/a", "no application deadline", "текущо", "yyyy-mm-dd"}
+
+ISO_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[t\s].*)?$")
+TIME_RE = re.compile(r"\b\d{1,2}[:h]\d{2}(?::\d{2})?\s*(?:am|pm|ч\.?)?")
+# 21/10/2025, 21.10.2025, 21-10-2025, 2025/10/21, 21.10. / 21/10 (no year; never with
+# "-", which is a day range in "1-15 October")
+NUMERIC_RE = re.compile(
+    r"(?<![\d.])(?:(\d{4})[./-](\d{1,2})[./-](\d{1,2})"
+    r"|(\d{1,2})(?:([./-])(\d{1,2})\5(\d{4}|\d{2})|[./](\d{1,2})))(?!\d)"
+)
+TOKEN_RE = re.compile(r"\d+|[^\W\d_]+")
+
+# Words allowed between the day, month and year of one date ("15th of March",
+# "1-ви май 2026 г.", "1er mars", "5 de mayo")
+FILLER_WORDS = {"st", "nd", "rd", "th", "of", "the", "de", "del", "di", "du", "der", "den", "er", "eme", "ème",
+                "ви", "ри", "ти", "ми", "г", "год", "o", "º"}
+# Punctuation allowed inside one date
+INNER_GAP_RE = re.compile(r"^[\s,./']*$")
+# ... and before an ordinal suffix ("1-ви")
+FILLER_GAP_RE = re.compile(r"^[\s,./'-]*$")
+# What joins the two ends of a range ("1–15 October", "15 December to 10 January")
+RANGE_GAP_RE = re.compile(r"^[\s,.]*(?:[-–—]|to|till|until|through|thru|bis|au|до|al)[\s,.]*$")
+
+
+def fold(text):
+    """Lowercase, accent-free form used for month lookups ("Décembre" -> "decembre")"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+MONTHS = {fold(name): number for number, names in MONTH_NAMES.items() for name in names}
+
+
+def _iso(year, month, day):
+    try:
+        return date(year, month, day)
+    except (TypeError, ValueError):
+        return None
+
+
+def _chains(parts, text):
+    """Split (start, end, fields) parts into runs joined by a dash or range word"""
+    chains = []
+    for part in parts:
+        if chains and RANGE_GAP_RE.match(text[chains[-1][-1][1]:part[0]]):
+            chains[-1].append(part)
+        else:
+            chains.append([part])
+    return [[fields for _, _, fields in chain] for chain in chains]
+
+
+def _numeric_dates(text):
+    """[(year, month, day, ambiguous)] for the first numeric date or range in the text"""
+    found = []
+    for m in NUMERIC_RE.finditer(text):
+        if m[1]:
+            found.append((m.start(), m.end(), (int(m[1]), int(m[2]), int(m[3]), False)))
+            continue
+        first, second = int(m[4]), int(m[6] or m[8])
+        year = int(m[7]) if m[7] else None
+        if year is not None and year < 100:
+            year += 2000
+        if first > 12 and second <= 12:
+            day, month, ambiguous = first, second, False
+        elif second > 12 and first <= 12:
+            # only readable as month/day
+            day, month, ambiguous = second, first, False
+        else:
+            # European order unless the numbers say otherwise
+            day, month, ambiguous = first, second, first != second
+        found.append((m.start(), m.end(), (year, month, day, ambiguous)))
+    chains = _chains(found, text)
+    return chains[0] if chains else []
+
+
+def _word_groups(text):
+    """
+    (start, end, {day, month, year}) for runs of adjacent day / month name /
+    year tokens. Month names only count next to a day or year number, so words
+    such as "may", "mar" or "out" in running text are never months.
+    """
+    groups, current = [], None
+    for m in TOKEN_RE.finditer(text):
+        token = m.group(0)
+        if token.isdigit():
+            value = int(token)
+            if len(token) == 4 and 1900 <= value <= 2100:
+                field = "year"
+            elif 1 <= value <= 31 and len(token) <= 2:
+                field = "day"
+            else:
+                field = None
+        elif token in MONTHS:
+            field, value = "month", MONTHS[token]
+        elif token in FILLER_WORDS and current is not None and FILLER_GAP_RE.match(text[current[1]:m.start()]):
+            current[1] = m.end()
+            continue
+        else:
+            field = None
+
+        adjacent = current is not None and INNER_GAP_RE.match(text[current[1]:m.start()])
+        if field is None or not adjacent or field in current[2]:
+            if current is not None:
+                groups.append(current)
+            current = None
+        if field is not None:
+            if current is None:
+                current = [m.start(), m.end(), {}]
+            current[1] = m.end()
+            current[2][field] = value
+    if current is not None:
+        groups.append(current)
+    return [tuple(group) for group in groups]
+
+
+def _word_dates(text):
+    """[(year, month, day, False)] for the first written date or range in the text"""
+    # a month name on its own is no date
+    groups = [group for group in _word_groups(text) if set(group[2]) != {"month"}]
+    for chain in _chains(groups, text):
+        # bare day numbers ("Ages 18-30") are not a date either
+        if not any("month" in d or "year" in d for d in chain):
+            continue
+        dates = [dict(d) for d in chain]
+        # "1-15 October 2025": share the month and year with the other end of the range
+        for field in ("month", "year"):
+            for i, d in enumerate(dates):
+                if field not in d:
+                    later = [other[field] for other in dates[i + 1:] if field in other]
+                    earlier = [other[field] for other in dates[:i] if field in other]
+                    if later or earlier:
+                        d[field] = later[0] if later else earlier[-1]
+        return [(d.get("year"), d.get("month"), d.get("day"), False) for d in dates]
+    return []
+
+
+def _resolve(year, month, day, reference):
+    """(date, precision, year guessed) for one parsed part; date is None when invalid"""
+    if month is None:
+        if year is None or day is not None:
+            return None, None, False
+        return _iso(year, 1, 1), "year", False
+    precision = "day" if day is not None else "month"
+    day = day or 1
+    if year is not None:
+        return _iso(year, month, day), precision, False
+    guess = _iso(reference.year, month, day)
+    if guess is not None and guess < reference - PAST_SLACK:
+        guess = _iso(reference.year + 1, month, day)
+    return guess, precision, True
+
+
+def _parse(value, reference):
+    text = " ".join(fold(value).split())
+    if text in NO_DATE_VALUES:
+        return None
+    iso = ISO_RE.match(text)
+    if iso:
+        parsed = _iso(int(iso[1]), int(iso[2]), int(iso[3]))
+        return ParsedDate(parsed.isoformat(), "day", False, None) if parsed else None
+
+    text = TIME_RE.sub(" ", text)
+    parts = _numeric_dates(text) or _word_dates(text)
+    if not parts:
+        return None
+
+    resolved = []
+    for year, month, day, ambiguous in parts:
+        parsed, precision, guessed = _resolve(year, month, day, reference)
+        if parsed is not None:
+            resolved.append((parsed, precision, ambiguous or guessed))
+    if not resolved:
+        return None
+
+    end, precision, ambiguous = resolved[-1]
+    start = resolved[0][0] if len(resolved) > 1 else None
+    if start is not None:
+        ambiguous = ambiguous or resolved[0][2]
+        if start > end:
+            # "15 December - 10 January 2026": the year belongs to the end only
+            start = _iso(start.year - 1, start.month, start.day) or start
+    return ParsedDate(end.isoformat(), precision, ambiguous, start.isoformat() if start else None)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_cached(value, reference):
+    return _parse(value, reference)
+
+
+def parse_date(value, reference=None):
+    """
+    Parse a deadline string into a ParsedDate, or None if it holds no date.
+
+    Understands ISO and numeric dates (day first unless the numbers say
+    otherwise), English, Bulgarian and other EU month names, times and ordinal
+    suffixes, and ranges such as "1–15 October 2025" (date is the last day,
+    start the first). Dates without a year get the year of `reference`
+    (default today) and are flagged ambiguous. Results are memoized.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    # keyed on the raw string, so repeats skip even the normalisation
+    return _parse_cached(value, reference or date.today())
+
+
+def standardize_date(value):
+    """YYYY-MM-DD for a deadline string, or None"""
+    parsed = parse_date(value)
+    return parsed.date if parsed else None
+
+
+def cache_info():
+    return _parse_cached.cache_info()
@@ -0,0 +1,206 @@
+import re
+import zlib
+
+import numpy as np
+
+from eligibility import BULGARIA
+from identity import canonical_url
+
+# ---------------------------
+# MinHash / LSH settings
+# ---------------------------
+NUM_PERM = 128
+BANDS = 32
+ROWS = 4                  # BANDS * ROWS <= NUM_PERM; candidates from ~0.42 similarity
+SHINGLE_SIZE = 3          # words per shingle
+MAX_SHINGLE_CHARS = 4000  # title + start of the description is enough to recognise a post
+THRESHOLD = 0.6           # estimated Jaccard similarity of a near-duplicate
+URL_MATCH_THRESHOLD = 0.4 # same canonical URL needs less textual overlap, but still a lot
+MAX_URL_SHARERS = 2       # a URL on more records is a generic apply/portal page, not an identity
+MAX_BUCKET_PAIRS = 20     # larger LSH buckets are linked through their first member only
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+# Sources in order of trust when duplicate records disagree
+SOURCE_PRIORITY = [
+    "european_youth_portal_bulgaria_eligible.json",
+    "eurodesk_learning.json",
+    "smokinya_bulgaria_eligible.json",
+    "opportunit4u_data.json",
+]
+# Deadline fields travel together, from the record with the most precise date
+DATE_FIELDS = ["validUntil", "originalDate", "validFrom", "datePrecision", "dateAmbiguous"]
+PRECISION_RANK = {"day": 0, "month": 1, "year": 2, None: 3}
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """32-bit hashes of the word n-grams of a text (single words for very short texts)"""
+    words = WORD_RE.findall((text or "")[:MAX_SHINGLE_CHARS].casefold())
+    if len(words) < size:
+        grams = words
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+def _mix64(values):
+    """splitmix64 finaliser: a bijective, well-mixed 64-bit hash (uint64 arithmetic wraps)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class MinHasher:
+    """
+    MinHash signatures from num_perm independent seeded 64-bit hashes: slot i
+    keeps the minimum of mix64(shingle ^ seed_i) over the shingles of a text
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.seeds = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, hashes):
+        if not hashes:
+            return None
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        with np.errstate(over="ignore"):
+            return _mix64(values[:, None] ^ self.seeds[None, :]).min(axis=0)
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of the two shingle sets"""
+    return float(np.mean(signature_a == signature_b))
+
+
+def record_text(entry):
+    return f"{entry.get('title') or ''}\n{entry.get('description') or ''}"
+
+
+def find_duplicates(entries, threshold=THRESHOLD, bands=BANDS, rows=ROWS):
+    """
+    Groups of indexes of entries that describe the same opportunity.
+
+    Candidate pairs come from equal canonical application URLs (only URLs that
+    at most MAX_URL_SHARERS records share; a form used by many posts says
+    nothing about which post it is) and from LSH buckets (one per band of the MinHash signature), so the work grows with the
+    number of records and candidates, not with all pairs. Candidates are
+    confirmed by estimated similarity; records with different deadlines are
+    never grouped.
+    """
+    hasher = MinHasher(num_perm=max(NUM_PERM, bands * rows))
+    signatures = [hasher.signature(shingles(record_text(entry))) for entry in entries]
+
+    candidates = set()
+    by_url = {}
+    for i, entry in enumerate(entries):
+        url = canonical_url(entry.get("applicationUrl"))
+        if url:
+            by_url.setdefault(url, []).append(i)
+    url_pairs = {(group[0], other) for group in by_url.values() if len(group) <= MAX_URL_SHARERS
+                 for other in group[1:]}
+    candidates |= url_pairs
+
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(key, []).append(i)
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET_PAIRS:
+            candidates.update((members[0], other) for other in members[1:])
+        elif len(members) > 1:
+            candidates.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidates:
+        deadline_i, deadline_j = entries[i].get("validUntil"), entries[j].get("validUntil")
+        if deadline_i and deadline_j and deadline_i != deadline_j:
+            continue
+        if signatures[i] is None or signatures[j] is None:
+            score = 1.0 if (i, j) in url_pairs else 0.0
+        else:
+            score = similarity(signatures[i], signatures[j])
+        if score >= (URL_MATCH_THRESHOLD if (i, j) in url_pairs else threshold):
+            parent[find(j)] = find(i)
+
+    groups = {}
+    for i in range(len(entries)):
+        groups.setdefault(find(i), []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def _priority(entry):
+    source = entry.get("source")
+    return SOURCE_PRIORITY.index(source) if source in SOURCE_PRIORITY else len(SOURCE_PRIORITY)
+
+
+def merge_group(entries):
+    """
+    One record from duplicates, field by field: the most trusted source's
+    value unless it is empty, the longest description, the most precise
+    deadline, all categories and the union of eligibility masks.
+    """
+    ranked = sorted(entries, key=_priority)
+    merged = dict(ranked[0])
+    for field in merged:
+        if field in DATE_FIELDS or merged[field] not in (None, "", []):
+            continue
+        for other in ranked[1:]:
+            if other.get(field) not in (None, "", []):
+                merged[field] = other[field]
+                break
+
+    with_date = [e for e in ranked if e.get("validUntil")]
+    if with_date:
+        best = min(with_date, key=lambda e: (PRECISION_RANK.get(e.get("datePrecision"), 3),
+                                             bool(e.get("dateAmbiguous"))))
+        for field in DATE_FIELDS:
+            merged[field] = best.get(field)
+
+    longest = max(ranked, key=lambda e: len(e.get("description") or ""))
+    for field in ("description", "originalDescription"):
+        if field in longest:
+            merged[field] = longest.get(field)
+
+    merged["categories"] = list(dict.fromkeys(c for e in ranked for c in (e.get("categories") or [])))
+    mask = 0
+    for e in ranked:
+        mask |= e.get("eligibilityMask") or 0
+    merged["eligibilityMask"] = mask
+    merged["bulgariaEligible"] = bool(mask & BULGARIA)
+    merged["sources"] = list(dict.fromkeys(e.get("source") for e in ranked))
+    return merged
+
+
+def dedupe_entries(entries):
+    """
+    Entries with every group of near-duplicates merged into its first record's
+    place; returns (entries, groups). Every record lists its `sources`.
+    """
+    groups = find_duplicates(entries)
+    replacement, dropped = {}, set()
+    for members in groups:
+        members = sorted(members)
+        replacement[members[0]] = merge_group([entries[i] for i in members])
+        dropped.update(members[1:])
+    result = []
+    for i, entry in enumerate(entries):
+        if i in dropped:
+            continue
+        if i not in replacement:
+            entry["sources"] = [entry.get("source")]
+        result.append(replacement.get(i, entry))
+    return result, groups
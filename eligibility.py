@@ -0,0 +1,197 @@
+import re
+
+import numpy as np
+
+# ---------------------------
+# Supported countries
+# ---------------------------
+# Bit i of an eligibility mask stands for SUPPORTED_COUNTRIES[i].
+# Only ever append to this list: masks are stored on records, so reordering
+# would silently change the meaning of every saved mask.
+SUPPORTED_COUNTRIES = [
+    # EU member states
+    "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czech Republic",
+    "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary",
+    "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta",
+    "Netherlands", "Poland", "Portugal", "Romania", "Slovakia", "Slovenia",
+    "Spain", "Sweden",
+    # Third countries associated to Erasmus+ / European Solidarity Corps
+    "Iceland", "Liechtenstein", "Norway", "North Macedonia", "Serbia", "Turkey",
+    # Neighbouring partner countries
+    "Albania", "Bosnia and Herzegovina", "Kosovo", "Montenegro",
+    "Armenia", "Azerbaijan", "Georgia", "Moldova", "Ukraine",
+    "United Kingdom", "Switzerland",
+]
+
+assert len(SUPPORTED_COUNTRIES) <= 64, "eligibility masks must fit in a uint64"
+
+COUNTRY_BITS = {name.lower(): 1 << i for i, name in enumerate(SUPPORTED_COUNTRIES)}
+
+
+def mask_for(countries):
+    """Build a mask from country names; unsupported names are ignored"""
+    mask = 0
+    for country in countries:
+        mask |= COUNTRY_BITS.get((country or "").strip().lower(), 0)
+    return mask
+
+
+def countries_from_mask(mask):
+    """Country names whose bit is set in the mask, in SUPPORTED_COUNTRIES order"""
+    return [name for i, name in enumerate(SUPPORTED_COUNTRIES) if mask >> i & 1]
+
+
+ALL_SUPPORTED = (1 << len(SUPPORTED_COUNTRIES)) - 1
+EU_COUNTRIES = mask_for(SUPPORTED_COUNTRIES[:27])
+PROGRAMME_COUNTRIES = EU_COUNTRIES | mask_for([
+    "Iceland", "Liechtenstein", "Norway", "North Macedonia", "Serbia", "Turkey"
+])
+WESTERN_BALKANS = mask_for([
+    "Albania", "Bosnia and Herzegovina", "Kosovo", "Montenegro", "North Macedonia", "Serbia"
+])
+EASTERN_PARTNERSHIP = mask_for(["Armenia", "Azerbaijan", "Georgia", "Moldova", "Ukraine"])
+
+BULGARIA = COUNTRY_BITS["bulgaria"]
+
+# Alternative spellings of supported countries
+COUNTRY_ALIASES = {
+    "czechia": "Czech Republic",
+    "macedonia": "North Macedonia",
+    "republic of north macedonia": "North Macedonia",
+    "türkiye": "Turkey",
+    "turkiye": "Turkey",
+    "holland": "Netherlands",
+    "the netherlands": "Netherlands",
+    "bosnia": "Bosnia and Herzegovina",
+    "bosnia & herzegovina": "Bosnia and Herzegovina",
+    "uk": "United Kingdom",
+    "great britain": "United Kingdom",
+    "republic of moldova": "Moldova",
+}
+
+# Phrases that expand to a group of countries. Outside an eligibility section
+# (a whole post description) the loose ones in CONTEXT_GROUP_TERMS only count
+# after eligibility phrasing, so "European Commission" or "Erasmus+ funded"
+# do not open a post to every country.
+GROUP_RULES = {
+    # open to everyone
+    "all countries": ALL_SUPPORTED,
+    "all nationalities": ALL_SUPPORTED,
+    "any country": ALL_SUPPORTED,
+    "any nationality": ALL_SUPPORTED,
+    "worldwide": ALL_SUPPORTED,
+    "global": ALL_SUPPORTED,
+    "europe": ALL_SUPPORTED,
+    "european": ALL_SUPPORTED,
+    # EU only
+    "eu countries": EU_COUNTRIES,
+    "eu member states": EU_COUNTRIES,
+    "eu member countries": EU_COUNTRIES,
+    "member states of the european union": EU_COUNTRIES,
+    "european union": EU_COUNTRIES,
+    "eu residents": EU_COUNTRIES,
+    "eu citizens": EU_COUNTRIES,
+    # Erasmus+ / European Solidarity Corps programme countries
+    "erasmus": PROGRAMME_COUNTRIES,
+    "erasmus+": PROGRAMME_COUNTRIES,
+    "erasmus plus": PROGRAMME_COUNTRIES,
+    "programme countries": PROGRAMME_COUNTRIES,
+    "program countries": PROGRAMME_COUNTRIES,
+    "erasmus+ programme countries": PROGRAMME_COUNTRIES,
+    "erasmus+ program countries": PROGRAMME_COUNTRIES,
+    "youth programme countries": PROGRAMME_COUNTRIES,
+    "eu member states and third countries associated to the programme": PROGRAMME_COUNTRIES,
+    "european solidarity corps": PROGRAMME_COUNTRIES,
+    # regions
+    "western balkans": WESTERN_BALKANS,
+    "eastern partnership": EASTERN_PARTNERSHIP,
+    "eastern partnership countries": EASTERN_PARTNERSHIP,
+}
+
+CONTEXT_GROUP_TERMS = {"worldwide", "global", "europe", "european", "european union", "erasmus", "erasmus+",
+                       "erasmus plus", "european solidarity corps"}
+
+# Wording that introduces who may apply; in free text it must precede a country
+# name or CONTEXT_GROUP_TERMS hit in the same sentence, within CONTEXT_WINDOW
+# characters, so a host country ("youth exchange in Spain") is not read as eligible
+ELIGIBILITY_CUE_RE = re.compile(
+    r"(?<!\w)(?:open to|eligible|eligibility|participants?|applicants?|candidates?|citizens?|nationals?|"
+    r"residents?|living in|based in|coming from|young people from|youth from|who can apply|can apply|"
+    r"may apply|countries)(?!\w)",
+    re.IGNORECASE,
+)
+CONTEXT_WINDOW = 150
+SENTENCE_BREAK_RE = re.compile(r"[.!?\n]")
+
+
+class EligibilityMatcher:
+    """
+    Computes an eligibility bitmask over SUPPORTED_COUNTRIES in one regex pass.
+
+    Country names, aliases and group phrases are compiled into a single
+    alternation (longest phrase first), so each eligibility section is scanned
+    once no matter how many countries we serve.
+    """
+
+    def __init__(self, extra_rules=None):
+        self.rules = {name.lower(): bit for name, bit in COUNTRY_BITS.items()}
+        for alias, country in COUNTRY_ALIASES.items():
+            self.rules[alias] = COUNTRY_BITS[country.lower()]
+        # single countries and loose group words need eligibility wording in free text
+        self.cue_phrases = set(self.rules) | CONTEXT_GROUP_TERMS
+        self.rules.update(GROUP_RULES)
+        self.rules.update({phrase.lower(): bits for phrase, bits in (extra_rules or {}).items()})
+
+        alternation = "|".join(re.escape(p) for p in sorted(self.rules, key=len, reverse=True))
+        self.pattern = re.compile(r"(?<!\w)(?:" + alternation + r")(?!\w)", re.IGNORECASE)
+
+    def mask(self, text, section=True):
+        """
+        Return the OR of all country / group bits mentioned in the text.
+        section=False marks free text (a whole description): country names and
+        loose group terms then need eligibility phrasing before them.
+        """
+        mask = 0
+        if not text:
+            return mask
+        for match in self.pattern.finditer(text):
+            phrase = match.group(0).lower()
+            if not section and phrase in self.cue_phrases and not self._after_cue(text, match.start()):
+                continue
+            mask |= self.rules[phrase]
+        return mask
+
+    @staticmethod
+    def _after_cue(text, start):
+        before = text[max(0, start - CONTEXT_WINDOW):start]
+        breaks = list(SENTENCE_BREAK_RE.finditer(before))
+        if breaks:
+            before = before[breaks[-1].end():]
+        return bool(ELIGIBILITY_CUE_RE.search(before))
+
+
+default_matcher = EligibilityMatcher()
+
+
+def eligibility_mask(text, section=True):
+    """Eligibility mask of an eligibility section (section=False for a whole description)"""
+    return default_matcher.mask(text, section)
+
+
+def is_eligible(mask, country):
+    """True if the given country's bit is set in the mask"""
+    return bool((mask or 0) & COUNTRY_BITS.get(country.lower(), 0))
+
+
+def filter_by_country(records, country):
+    """
+    Records eligible for a country, as one vectorised AND over all stored masks.
+    Records without an eligibilityMask are treated as not eligible.
+    """
+    bit = COUNTRY_BITS.get(country.lower())
+    if bit is None or not records:
+        return []
+    masks = np.fromiter((r.get("eligibilityMask") or 0 for r in records),
+                        dtype=np.uint64, count=len(records))
+    selected = np.flatnonzero(masks & np.uint64(bit))
+    return [records[i] for i in selected]
@@ -0,0 +1,106 @@
+import hashlib
+import os
+from collections import Counter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from merge_manifest import record_hash
+
+# ---------------------------
+# URL canonicalization
+# ---------------------------
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src",
+                   "_ga", "_gl", "yclid", "spm"}
+TRACKING_PREFIXES = ("utm_",)
+PLACEHOLDER_URLS = {"no url found", "no image found", "n/a"}
+
+# Short, stable names of the scraper outputs used as id prefixes
+SOURCE_SLUGS = {
+    "opportunit4u_data.json": "opportunit4u",
+    "european_youth_portal_bulgaria_eligible.json": "european_youth",
+    "smokinya_bulgaria_eligible.json": "smokinya",
+    "eurodesk_learning.json": "eurodesk",
+}
+
+ID_HASH_LENGTH = 16
+# Enough of the description to tell posts apart, little enough to ignore trailing edits
+ID_TEXT_CHARS = 2000
+
+
+def canonical_url(url):
+    """
+    Comparable form of a URL: no scheme, "www.", fragment, tracking parameters
+    or trailing slash; host lowercased and the remaining parameters sorted.
+    None for empty or placeholder values.
+    """
+    if not url or not isinstance(url, str) or url.strip().lower() in PLACEHOLDER_URLS:
+        return None
+    parts = urlsplit(url.strip() if "//" in url else "//" + url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, urlencode(query), "")).lstrip("/") or None
+
+
+def source_slug(source):
+    """"smokinya" for "smokinya_bulgaria_eligible.json" (or the file stem / name as given)"""
+    if not source:
+        return "unknown"
+    return SOURCE_SLUGS.get(source) or os.path.splitext(os.path.basename(source))[0]
+
+
+def record_id(source, url=None, title=None, description=None):
+    """
+    Stable id "<source>-<hash>" for a scraped record.
+
+    The hash is taken from the canonical URL of the post, so the id survives
+    re-scrapes, listing order changes and tracking parameters; records without
+    a usable URL fall back to a hash of their title and description (case and
+    spacing ignored).
+    """
+    url = canonical_url(url)
+    if url:
+        key = f"url:{url}"
+    else:
+        text = f"{title or ''}\n{(description or '')[:ID_TEXT_CHARS]}"
+        key = "text:" + " ".join(text.casefold().split())
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:ID_HASH_LENGTH]
+    return f"{source_slug(source)}-{digest}"
+
+
+def ensure_unique_ids(entries):
+    """
+    Give every record that shares its id with another one (distinct posts
+    behind the same URL) the id of its title and description instead, so the
+    result does not depend on record order. Records identical in those too
+    are numbered ("-2", "-3", ...) in the order of their full content hash.
+    Returns how many ids were changed.
+    """
+    original = [entry["id"] for entry in entries]
+    counts = Counter(original)
+    for entry in entries:
+        if counts[entry["id"]] > 1:
+            prefix = entry["id"].rsplit("-", 1)[0]
+            entry["id"] = record_id(prefix, None, entry.get("title"), entry.get("description"))
+
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry["id"], []).append(entry)
+    taken = set(groups)
+    for base, group in groups.items():
+        if len(group) < 2:
+            continue
+        group.sort(key=record_hash)
+        n = 2
+        for entry in group[1:]:
+            while f"{base}-{n}" in taken:
+                n += 1
+            entry["id"] = f"{base}-{n}"
+            taken.add(entry["id"])
+    return sum(before != entry["id"] for before, entry in zip(original, entries))
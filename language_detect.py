@@ -0,0 +1,63 @@
+import re
+
+# Letters that exist in Russian / Ukrainian / Serbian Cyrillic but not in Bulgarian
+NON_BULGARIAN_LETTERS = set("ыэёіїєґўјљњћђџ")
+
+# Small word model: frequent function words that are distinctive for Bulgarian
+# versus the other Cyrillic languages we might meet (mostly Russian)
+BULGARIAN_WORDS = {
+    "на", "за", "от", "се", "да", "са", "ще", "това", "тези", "който", "която",
+    "които", "към", "във", "със", "му", "ѝ", "си", "като", "но", "или", "до",
+    "след", "чрез", "между", "може", "трябва", "има", "няма", "кандидатстване",
+    "програма", "обучение", "младежи", "срок", "текущо",
+}
+RUSSIAN_WORDS = {
+    "что", "это", "как", "для", "его", "она", "они", "был", "была", "были",
+    "который", "которые", "также", "только", "нет", "при", "через", "может",
+}
+
+# Character trigrams typical of Bulgarian spelling: definite articles and ъ before
+# a consonant (възможност, бъде, въпрос), which Russian never writes
+BULGARIAN_TRIGRAMS = ("ът ", "та ", "то ", "ите", "ата", "ото", "ъзм", "ъде", "ъпр", "ънт", " ще", "ния")
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+
+# Share of letters that must be Cyrillic
+MIN_CYRILLIC_RATIO = 0.5
+
+
+def cyrillic_ratio(text):
+    """Share of letters in the text that are Cyrillic (0.0 for text without letters)"""
+    letters = [ch for ch in text or "" if ch.isalpha()]
+    if not letters:
+        return 0.0
+    return sum(1 for ch in letters if CYRILLIC_RE.match(ch)) / len(letters)
+
+
+def bulgarian_score(text):
+    """
+    Evidence that Cyrillic text is Bulgarian rather than Russian/Ukrainian:
+    positive for Bulgarian function words and trigrams, negative for words or
+    letters the Bulgarian alphabet does not use.
+    """
+    lowered = (text or "").lower()
+    if NON_BULGARIAN_LETTERS & set(lowered):
+        return -1.0
+    words = WORD_RE.findall(lowered)
+    score = sum(1 for w in words if w in BULGARIAN_WORDS) - sum(1 for w in words if w in RUSSIAN_WORDS)
+    padded = f" {lowered} "
+    score += 0.5 * sum(1 for gram in BULGARIAN_TRIGRAMS if gram in padded)
+    return score
+
+
+def is_bulgarian(text):
+    """
+    True if the text is already Bulgarian and needs no translation.
+    Mostly-Cyrillic text counts as Bulgarian unless the word/letter model
+    points to another Cyrillic language. Short strings (a title, "ТЕКУЩО")
+    without any evidence either way are taken as Bulgarian.
+    """
+    if cyrillic_ratio(text) < MIN_CYRILLIC_RATIO:
+        return False
+    return bulgarian_score(text) >= 0
@@ -0,0 +1,81 @@
+import json
+import unicodedata
+from pathlib import Path
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+LEXICON_FILE = BASE_DIR / "config" / "lexicon_bg.json"
+
+# Fields translated from the lexicon; each gets a "<field>_bg" twin
+LEXICON_FIELDS = ["type", "modeOfWork", "categories", "city", "country"]
+
+# Latin letters without a decomposition into base letter + accent
+LATIN_EXTRA = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe", "ı": "i"})
+
+
+def fold(text):
+    """Lowercase accent-free form used for lookups ("Kraków" -> "krakow"; other scripts are kept)"""
+    decomposed = unicodedata.normalize("NFKD", text.strip().lower().translate(LATIN_EXTRA))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class Lexicon:
+    """
+    Offline English -> Bulgarian lookup for the closed vocabularies of
+    opportunity records (types, modes of work, categories, countries, cities).
+    Values missing from the lexicon are kept as written: letter-by-letter
+    transliteration mangles English names (Brisbane -> "Брисбане"), and a Latin
+    name reads better than a wrong Cyrillic one.
+    """
+
+    def __init__(self, path=LEXICON_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.tables = {
+            field: {fold(key): value for key, value in data.get(field, {}).items()}
+            for field in LEXICON_FIELDS
+        }
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, field, value):
+        """Bulgarian name for a single value; falls back to the original"""
+        if not value or not isinstance(value, str):
+            return value
+        translated = self.tables[field].get(fold(value))
+        if translated is not None:
+            self.hits += 1
+            return translated
+        self.misses += 1
+        return value
+
+    def localize_entry(self, entry):
+        """Add <field>_bg for every lexicon field of the entry"""
+        for field in LEXICON_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, list):
+                entry[f"{field}_bg"] = [self.lookup(field, item) for item in value]
+            else:
+                entry[f"{field}_bg"] = self.lookup(field, value)
+        return entry
+
+
+_lexicon = None
+
+
+def get_lexicon():
+    """Shared Lexicon, loaded on first use"""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = Lexicon()
+    return _lexicon
+
+
+def localize_entries(entries):
+    """Add Bulgarian variants of the fixed-vocabulary fields to every entry"""
+    lexicon = get_lexicon()
+    for entry in entries:
+        lexicon.localize_entry(entry)
+    return entries
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = BASE_DIR / "data" / "cache"
+EXTRACTION_CACHE_FILE = CACHE_DIR / "llm_extraction.sqlite"
+
+DEFAULT_MAX_ENTRIES = 20000
+
+FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def fingerprint(*parts):
+    """Stable short hash of JSON-serialisable parts (prompt text, category list, ...)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_tokens(text):
+    """Rough token count for English/Bulgarian prompts (about 4 characters per token)"""
+    return max(1, len(text or "") // 4)
+
+
+def parse_json_reply(content, opening="{"):
+    """
+    JSON value from a model reply, tolerating code fences and stray prose around
+    the outermost {...} (or [...] with opening="["); None if there is none
+    """
+    reply = FENCE_RE.sub("", (content or "").strip())
+    try:
+        return json.loads(reply)
+    except ValueError:
+        start, end = reply.find(opening), reply.rfind("}" if opening == "{" else "]")
+        try:
+            return json.loads(reply[start:end + 1]) if start != -1 and end > start else None
+        except ValueError:
+            return None
+
+
+class SQLiteLRUCache:
+    """
+    One SQLite table of LLM results keyed by a hash, shared by the extraction
+    cache and the translation memory. Subclasses create the table (with key and
+    last_access columns) in create_table(); rows past max_entries are evicted
+    least recently used first. Counts hits, misses, writes and evictions.
+
+    The row count is read once on open and then tracked in memory (a put only
+    grows it when the key is new), so writes never run COUNT(*).
+    Hits buffer their new access time and write them in one batch with the next
+    put, every TOUCH_BATCH hits, before eviction, or on flush()/close().
+    """
+
+    TABLE = "entries"
+    VALUE_COLUMN = "value"
+    TITLE = "🗃️ CACHE"
+    TOUCH_BATCH = 500
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.touched = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.create_table()
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_last_access ON {self.TABLE}(last_access)")
+        self.conn.commit()
+        self.size = self.count()
+
+    def create_table(self):
+        raise NotImplementedError
+
+    def _lookup(self, key):
+        """Stored value for a key (refreshing its last access), or None"""
+        row = self.conn.execute(f"SELECT {self.VALUE_COLUMN} FROM {self.TABLE} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.touched[key] = time.time()
+        if len(self.touched) >= self.TOUCH_BATCH:
+            self.flush()
+        return row[0]
+
+    def _store(self, columns, values):
+        """Insert or replace one row (key first among the columns), then evict past max_entries"""
+        self._write_touches()
+        new = self.conn.execute(f"SELECT 1 FROM {self.TABLE} WHERE key = ?", (values[0],)).fetchone() is None
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {self.TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            values
+        )
+        self.writes += 1
+        self.size += new
+        if self.size > self.max_entries:
+            self._evict()
+        self.conn.commit()
+
+    def _write_touches(self):
+        if self.touched:
+            self.conn.executemany(f"UPDATE {self.TABLE} SET last_access = ? WHERE key = ?",
+                                  [(accessed, key) for key, accessed in self.touched.items()])
+            self.touched.clear()
+
+    def flush(self):
+        """Write buffered access times"""
+        self._write_touches()
+        self.conn.commit()
+
+    def _evict(self):
+        self._write_touches()
+        overflow = self.size - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                f"DELETE FROM {self.TABLE} WHERE key IN "
+                f"(SELECT key FROM {self.TABLE} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += overflow
+            self.size = self.max_entries
+
+    def count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": self.count(),
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"\n{self.TITLE}")
+        print(f"   Hits: {s['hits']}  Misses: {s['misses']}  Hit rate: {s['hit_rate']*100:.1f}%")
+        print(f"   New entries: {s['writes']}  Evicted: {s['evictions']}  Total entries: {s['entries']}")
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class ExtractionCache(SQLiteLRUCache):
+    """
+    Persistent SQLite cache of parsed LLM extraction results.
+
+    Entries are keyed by sha256(title, description, requested fields, prompt
+    version, model). The prompt version is stored in a meta table; opening the
+    cache with a different version (new prompt wording or category list) drops
+    every entry. Size is capped at max_entries with least-recently-used eviction.
+    """
+
+    TITLE = "🗃️ EXTRACTION CACHE"
+
+    def __init__(self, model, prompt_version, path=EXTRACTION_CACHE_FILE,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.model = model
+        self.prompt_version = prompt_version
+        super().__init__(path, max_entries)
+        self._check_version()
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _check_version(self):
+        """Invalidate everything when the prompt / category fingerprint changed"""
+        version = f"{self.prompt_version}:{self.model}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == version:
+            return
+        if row:
+            print(f"♻️ Extraction prompt changed - dropping {self.count()} cached results")
+        self.conn.execute("DELETE FROM entries")
+        self.size = 0
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+        self.conn.commit()
+
+    def make_key(self, title, description, fields=()):
+        payload = json.dumps(
+            [title or "", description or "", sorted(fields), self.prompt_version, self.model],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, title, description, fields=()):
+        """Cached extraction dict, or None on a miss"""
+        value = self._lookup(self.make_key(title, description, fields))
+        return json.loads(value) if value is not None else None
+
+    def put(self, title, description, value, fields=()):
+        now = time.time()
+        self._store(("key", "value", "created_at", "last_access"),
+                    (self.make_key(title, description, fields), json.dumps(value, ensure_ascii=False), now, now))
@@ -0,0 +1,220 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from openai import (
+    OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+)
+
+from rate_limit import AdaptiveThrottle, retry_after_seconds
+from telemetry import get_telemetry
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+# Import API key from config/config.py (scrapers put config/ itself on sys.path,
+# where the same file is importable as plain "config")
+try:
+    from config.config import OPENAI_API_KEY
+except ImportError:
+    try:
+        from config import OPENAI_API_KEY
+    except ImportError as e:
+        print("❌ Could not import OPENAI_API_KEY from config/config.py")
+        print(f"Error: {e}")
+        OPENAI_API_KEY = None
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+DEFAULT_TIMEOUT = 60
+MAX_ATTEMPTS = 5
+
+# Errors worth retrying with backoff; anything else fails the call immediately
+TRANSIENT_ERRORS = (APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class LLMGateway:
+    """
+    Single entry point for chat completions, shared by translation and extraction.
+
+    The OpenAI clients (and their pooled HTTP connections) are created on first
+    use, not on import, and no request is made until there is real work.
+    complete() and complete_async() retry 429s and transient errors with
+    exponential backoff and jitter and return None when the call finally fails.
+    Every call is recorded in the run telemetry under its stage and source.
+    health_check() is opt-in.
+    """
+
+    def __init__(self, api_key=None, timeout=DEFAULT_TIMEOUT, max_attempts=MAX_ATTEMPTS, telemetry=None,
+                 base_url=None):
+        self.api_key = api_key if api_key is not None else OPENAI_API_KEY
+        # None = api.openai.com (or $OPENAI_BASE_URL); e.g. the local stand-in for benchmarks
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._client = None
+        self._async_client = None
+        # backoff schedule for the sync path
+        self.backoff = AdaptiveThrottle(max_concurrency=1)
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+        self.telemetry = telemetry if telemetry is not None else get_telemetry()
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        if self._client is None and self.available:
+            # retries are handled here, not inside the SDK
+            self._client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                  timeout=self.timeout, max_retries=0)
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None and self.available:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                             timeout=self.timeout, max_retries=0)
+        return self._async_client
+
+    async def aclose(self):
+        """Close the async client; its connections belong to the current event loop"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def _record(self, stage, source, request, called, busy, attempt, response=None, error=None):
+        """Record one call: wall latency since `called`, of which everything but `busy` was waiting"""
+        usage = getattr(response, "usage", None)
+        latency = time.perf_counter() - called
+        self.telemetry.record_call(
+            stage, source,
+            model=request.get("model"),
+            latency=latency,
+            wait=max(0.0, latency - busy),
+            prompt_tokens=getattr(usage, "prompt_tokens", 0),
+            completion_tokens=getattr(usage, "completion_tokens", 0),
+            retries=attempt,
+            error=str(error) if error is not None else None,
+        )
+
+    def complete(self, label="request", stage="llm", source=None, **request):
+        """Blocking chat completion; returns the response or None"""
+        if not self.available:
+            print("❌ OpenAI client not available")
+            return None
+
+        error = None
+        called = time.perf_counter()
+        busy = 0.0  # time spent in requests, summed over attempts (backoff sleeps excluded)
+        for attempt in range(self.max_attempts):
+            self.stats["calls"] += 1
+            started = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(**request)
+                self._record(stage, source, request, called, busy + time.perf_counter() - started, attempt,
+                             response=response)
+                return response
+            except RateLimitError as e:
+                retry_after = retry_after_seconds(e.response.headers if e.response else None)
+                delay = max(retry_after or 0, self.backoff.backoff_delay(attempt))
+                error = e
+            except TRANSIENT_ERRORS as e:
+                delay = self.backoff.backoff_delay(attempt)
+                error = e
+            except Exception as e:
+                print(f"❌ OpenAI error for {label}: {e}")
+                self.stats["failures"] += 1
+                self._record(stage, source, request, called, busy + time.perf_counter() - started, attempt, error=e)
+                return None
+            busy += time.perf_counter() - started
+
+            if attempt + 1 < self.max_attempts:
+                self.stats["retries"] += 1
+                time.sleep(delay)
+
+        print(f"❌ OpenAI call for {label} failed after {self.max_attempts} attempts: {error}")
+        self.stats["failures"] += 1
+        self._record(stage, source, request, called, busy, self.max_attempts - 1, error=error)
+        return None
+
+    async def complete_async(self, request, throttle, label="request", stage="llm", source=None):
+        """
+        Async chat completion: waits for a throttle slot, feeds rate-limit headers
+        back into the throttle and backs off outside the slot so other requests
+        keep flowing. Returns the response or None.
+        """
+        if not self.available:
+            return None
+
+        error = None
+        called = time.perf_counter()
+        busy = 0.0  # time holding a slot, summed over attempts (queueing and backoff excluded)
+        for attempt in range(self.max_attempts):
+            async with throttle.slot():
+                self.stats["calls"] += 1
+                started = time.perf_counter()
+                try:
+                    raw = await self.async_client.chat.completions.with_raw_response.create(**request)
+                    throttle.observe_headers(raw.headers)
+                    throttle.on_success()
+                    response = raw.parse()
+                    self._record(stage, source, request, called, busy + time.perf_counter() - started, attempt,
+                                 response=response)
+                    return response
+                except RateLimitError as e:
+                    retry_after = retry_after_seconds(e.response.headers if e.response else None)
+                    throttle.on_rate_limited(retry_after)
+                    error = e
+                except TRANSIENT_ERRORS as e:
+                    error = e
+                except Exception as e:
+                    print(f"⚠️ OpenAI error for {label}: {e}")
+                    self.stats["failures"] += 1
+                    self._record(stage, source, request, called, busy + time.perf_counter() - started, attempt,
+                                 error=e)
+                    return None
+                busy += time.perf_counter() - started
+
+            if attempt + 1 < self.max_attempts:
+                self.stats["retries"] += 1
+                await asyncio.sleep(throttle.backoff_delay(attempt))
+
+        print(f"⚠️ OpenAI call for {label} failed after {self.max_attempts} attempts: {error}")
+        self.stats["failures"] += 1
+        self._record(stage, source, request, called, busy, self.max_attempts - 1, error=error)
+        return None
+
+    def health_check(self, model=DEFAULT_MODEL):
+        """Opt-in connectivity test (one tiny completion); True if the API answered"""
+        response = self.complete(
+            label="health check",
+            stage="health_check",
+            model=model,
+            messages=[{"role": "user", "content": "Say 'OK'"}],
+            max_tokens=5
+        )
+        if response is None:
+            print("❌ OpenAI health check failed")
+            return False
+        print("✅ OpenAI client configured successfully")
+        return True
+
+
+_gateway = None
+
+
+def get_gateway():
+    """Process-wide gateway, created on first use"""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
+
+
+if __name__ == "__main__":
+    sys.exit(0 if get_gateway().health_check() else 1)
@@ -1,13 +1,23 @@
 # merge_all_json.py
+import argparse
 import json
 import os
-import time
+from collections import Counter
+from datetime import date
 from pathlib import Path
-from datetime import datetime
-import re
 
 # Import the translator
-from translator import translate_entry
+from translator import translate_entries, get_translator, TARGET_LANGUAGES, MODEL, PROMPT_VERSION
+from classifier import BatchClassifier, CATEGORY_KEYWORDS_FILE
+from eligibility import BULGARIA
+from lexicon import localize_entries, get_lexicon, LEXICON_FILE
+from merge_manifest import MergeManifest, file_hash, record_hash, pipeline_fingerprint
+from store import OpportunityStore, STORE_FILE
+from boilerplate import strip_entries
+from dates import parse_date, cache_info
+from dedupe import dedupe_entries
+from identity import record_id, ensure_unique_ids
+from telemetry import get_telemetry
 
 DATA_DIR = "data"
 OUTPUT_FILE = os.path.join(DATA_DIR, "all_opportunities.json")
@@ -19,146 +29,62 @@ FILES = [
     "eurodesk_learning.json",
 ]
 
-def standardize_date(date_str):
-    """
-    Convert various date formats to standardized UTC format (YYYY-MM-DD).
-    Returns None if date cannot be parsed.
-    """
-    if not date_str or not isinstance(date_str, str):
-        return None
-    
-    # Clean the date string
-    date_str = date_str.strip()
-    
-    # Skip known non-date values
-    invalid_values = [
-        "No date found", "UPCOMING", "Unknown", "N/A", 
-        "No application deadline", "ТЕКУЩО", "YYYY-MM-DD"
-    ]
-    if date_str in invalid_values:
-        return None
-    
-    # Remove time parts and timezone info
-    date_str = re.sub(r'\s+\d{1,2}:\d{2}.*$', '', date_str)  # Remove time
-    date_str = re.sub(r'\s*[A-Za-z]+\s*time.*$', '', date_str)  # Remove "Brussels time" etc
-    date_str = re.sub(r'\s*\d{1,2}:\d{2}.*$', '', date_str)  # Remove time with colon
-    
-    # Remove ordinal indicators (st, nd, rd, th)
-    date_str = re.sub(r'(\d+)(st|nd|rd|th)\s+', r'\1 ', date_str)
-    
-    # Remove "of" from dates like "7th of October 2025"
-    date_str = re.sub(r'\s+of\s+', ' ', date_str)
-    
-    # Try different date patterns
-    patterns = [
-        # YYYY-MM-DD (already standardized)
-        (r'^(\d{4})-(\d{2})-(\d{2})$', lambda m: f"{m[1]}-{m[2]}-{m[3]}"),
-        
-        # DD/MM/YYYY
-        (r'^(\d{1,2})/(\d{1,2})/(\d{4})$', lambda m: f"{m[3]}-{m[2].zfill(2)}-{m[1].zfill(2)}"),
-        
-        # DD Month YYYY (21 October 2025)
-        (r'^(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})$', lambda m: parse_month_date(m[1], m[2], m[3])),
-        
-        # Month DD YYYY (October 21 2025)
-        (r'^([A-Za-z]+)\s+(\d{1,2})\s+(\d{4})$', lambda m: parse_month_date(m[2], m[1], m[3])),
-        
-        # Month DD, YYYY (October 21, 2025)
-        (r'^([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})$', lambda m: parse_month_date(m[2], m[1], m[3])),
-        
-        # YYYY only
-        (r'^(\d{4})$', lambda m: f"{m[1]}-01-01"),
-    ]
-    
-    for pattern, converter in patterns:
-        match = re.match(pattern, date_str, re.IGNORECASE)
-        if match:
-            try:
-                result = converter(match.groups())
-                if result:
-                    # Validate the result is a proper date
-                    datetime.strptime(result, '%Y-%m-%d')
-                    return result
-            except (ValueError, IndexError):
-                continue
-    
-    # Try datetime parsing as fallback with common formats
-    try:
-        # Common date formats to try
-        formats = [
-            '%Y-%m-%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y',
-            '%d %B %Y',
-            '%B %d %Y',
-            '%d %b %Y',
-            '%b %d %Y',
-            '%d %B, %Y',
-            '%B %d, %Y',
-            '%Y'
-        ]
-        
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-    except Exception:
-        pass
-    
-    return None
-
-def parse_month_date(day, month_str, year):
-    """Parse date with month names and return YYYY-MM-DD format"""
-    month_map = {
-        'january': '01', 'jan': '01',
-        'february': '02', 'feb': '02', 
-        'march': '03', 'mar': '03',
-        'april': '04', 'apr': '04',
-        'may': '05',
-        'june': '06', 'jun': '06',
-        'july': '07', 'jul': '07',
-        'august': '08', 'aug': '08',
-        'september': '09', 'sep': '09', 'sept': '09',
-        'october': '10', 'oct': '10',
-        'november': '11', 'nov': '11',
-        'december': '12', 'dec': '12'
+def date_fields(raw_date, reference=None):
+    """validUntil / validFrom / datePrecision / dateAmbiguous for a raw deadline"""
+    # Memoized; deadline strings repeat across records
+    parsed_date = parse_date(str(raw_date) if raw_date else None, reference)
+    return {
+        "validUntil": parsed_date.date if parsed_date else None,  # Standardized date
+        "validFrom": parsed_date.start if parsed_date else None,  # First day of a date range
+        "datePrecision": parsed_date.precision if parsed_date else None,  # day / month / year
+        "dateAmbiguous": parsed_date.ambiguous if parsed_date else False,  # day/month order or year guessed
     }
-    
-    month_lower = month_str.lower()
-    month_num = month_map.get(month_lower)
-    if month_num:
-        return f"{year}-{month_num}-{str(day).zfill(2)}"
-    return None
+
 
 def normalize_entry(entry, source):
     """Normalize different schemas into a unified structure."""
     # Extract raw date first
     raw_date = entry.get("validUntil") or entry.get("date")
+    dates = date_fields(raw_date)
+
+    # Older scraper output only carries the Bulgaria flag
+    eligibility = entry.get("eligibilityMask")
+    if eligibility is None:
+        eligibility = BULGARIA if entry.get("bulgariaEligible", True) else 0
     
-    # Standardize the date
-    standardized_date = standardize_date(str(raw_date) if raw_date else None)
-    
+    url = entry.get("applicationUrl") or entry.get("url")
+
     normalized = {
+        # Stable across runs and sources; older scraper output gets one here
+        "id": entry.get("id") or record_id(source, url, entry.get("title"), entry.get("description")),
         "postNo": entry.get("postNo") or entry.get("card_number"),
         "title": entry.get("title"),
         "title_bg": "",  # Will be filled with translation
         "city": entry.get("city"),
         "country": entry.get("country"),
         "description": entry.get("description"),
+        "originalDescription": entry.get("originalDescription"),  # Filled before boilerplate stripping
         "description_bg": "",  # Will be filled with translation
-        "validUntil": standardized_date,  # Use standardized date
+        "validUntil": dates["validUntil"],  # Use standardized date
         "originalDate": raw_date,  # Keep original for reference
+        "validFrom": dates["validFrom"],
+        "datePrecision": dates["datePrecision"],
+        "dateAmbiguous": dates["dateAmbiguous"],
         "type": entry.get("type") or entry.get("typeOfOpportunity"),
         "modeOfWork": entry.get("modeOfWork"),
         "categories": entry.get("categories", []),
-        "applicationUrl": entry.get("applicationUrl") or entry.get("url"),
+        "applicationUrl": url,
         "bannerImage": entry.get("bannerImage"),
-        "bulgariaEligible": entry.get("bulgariaEligible", True),
+        "bulgariaEligible": bool(eligibility & BULGARIA),
+        "eligibilityMask": eligibility,
         "source": source  # Track which file this came from
     }
 
+    # Reserve title_<code>/description_<code> for every other target language
+    for language in TARGET_LANGUAGES:
+        normalized.setdefault(f"title_{language}", "")
+        normalized.setdefault(f"description_{language}", "")
+
     # Eurodesk has arrays for cities/countries
     if source == "eurodesk_learning.json":
         if not normalized["city"] and "cities" in entry and entry["cities"]:
@@ -169,42 +95,106 @@ def normalize_entry(entry, source):
     return normalized
 
 
-def load_and_normalize(filepath):
-    """Load a JSON file and normalize entries."""
+def load_records(filepath):
+    """Load the raw records of a JSON file."""
     with open(filepath, "r", encoding="utf-8") as f:
         data = json.load(f)
 
     # Some files may contain a single dict, others a list
     if isinstance(data, dict):
         data = [data]
+    return data
 
+
+def load_and_normalize(filepath):
+    """Load a JSON file and normalize entries."""
     source = os.path.basename(filepath)
-    normalized_entries = []
-    
-    for entry in data:
-        normalized_entry = normalize_entry(entry, source)
-        normalized_entries.append(normalized_entry)
-    
-    return normalized_entries
+    return [normalize_entry(entry, source) for entry in load_records(filepath)]
+
+
+def current_pipeline():
+    """Fingerprint of the settings besides the input files that shape output records"""
+    return pipeline_fingerprint(TARGET_LANGUAGES, MODEL, PROMPT_VERSION,
+                                file_hash(CATEGORY_KEYWORDS_FILE), file_hash(LEXICON_FILE))
+
+
+def classify_missing_fields(entries):
+    """
+    Fill empty type / modeOfWork / categories for the whole merged batch at once.
+    Values the scrapers already set are kept; returns how many fields were filled.
+    """
+    missing_values = (None, "", "N/A")
+    pending = [
+        entry for entry in entries
+        if entry.get("type") in missing_values
+        or entry.get("modeOfWork") in missing_values
+        or not entry.get("categories")
+    ]
+    if not pending:
+        return 0
+
+    classifier = BatchClassifier(default_type=None, default_mode=None)
+    results = classifier.classify((entry.get("title"), entry.get("description")) for entry in pending)
+
+    filled = 0
+    for entry, result in zip(pending, results):
+        if entry.get("type") in missing_values and result["type"]:
+            entry["type"] = result["type"]
+            filled += 1
+        if entry.get("modeOfWork") in missing_values and result["modeOfWork"]:
+            entry["modeOfWork"] = result["modeOfWork"]
+            filled += 1
+        if not entry.get("categories") and result["categories"]:
+            entry["categories"] = result["categories"]
+            filled += 1
+    return filled
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Merge the scraper outputs into data/all_opportunities.json")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the merge manifest and reprocess every file and record")
+    args = parser.parse_args()
+
     all_data = []
     date_stats = {
         'total': 0,
         'standardized': 0,
-        'failed': 0
+        'failed': 0,
+        'ranges': 0,
+        'ambiguous': 0
     }
     
     # Create data directory if it doesn't exist
     os.makedirs(DATA_DIR, exist_ok=True)
-    
+
+    # Input hashes and normalized records of the previous run
+    manifest = MergeManifest(current_pipeline(), fresh=args.full)
+    hashes = {file: file_hash(os.path.join(DATA_DIR, file)) for file in FILES}
+    today = date.today()
+    if (not args.full and all(manifest.file_unchanged(file, sha) or (sha is None and file not in manifest.files)
+                              for file, sha in hashes.items())
+            and STORE_FILE.exists() and manifest.previous_outputs(OUTPUT_FILE) and all(manifest.complete)):
+        if manifest.dates_current(today.isoformat()):
+            print(f"♻️ No source file changed since the last merge; {OUTPUT_FILE} is up to date (--full to rebuild)")
+            return
+        print(f"📅 No source file changed, but year-less deadlines were resolved on {manifest.reference_date}; "
+              f"re-resolving them for {today}")
+
     for file in FILES:
         path = os.path.join(DATA_DIR, file)
-        if os.path.exists(path):
-            print(f"✅ Loading {file} ...")
+        if hashes[file] is not None:
             try:
-                entries = load_and_normalize(path)
+                if manifest.file_unchanged(file, hashes[file]):
+                    print(f"♻️ {file} unchanged, reusing normalized records ...")
+                    entries = manifest.cached_records(file)
+                else:
+                    print(f"✅ Loading {file} ...")
+                    entries = manifest.normalize_file(file, hashes[file], load_records(path),
+                                                      lambda entry: normalize_entry(entry, file))
+                # Year-less deadlines are resolved against today, so never reuse stale dates
+                for entry in entries:
+                    entry.update(date_fields(entry.get("originalDate"), today))
                 all_data.extend(entries)
                 
                 # Count date standardization results
@@ -213,6 +203,8 @@ def main():
                         date_stats['total'] += 1
                         if entry['validUntil']:
                             date_stats['standardized'] += 1
+                            date_stats['ranges'] += bool(entry['validFrom'])
+                            date_stats['ambiguous'] += entry['dateAmbiguous']
                         else:
                             date_stats['failed'] += 1
                 
@@ -223,34 +215,85 @@ def main():
                 traceback.print_exc()
         else:
             print(f"⚠️ Missing file: {file}")
+            manifest.forget_file(file)
+
+    # Drop share prompts, footers and disclaimers repeated across a source
+    # before anything is compared or sent for translation
+    boilerplate = strip_entries(all_data)
+    boilerplate.print_report()
+
+    # The same opportunity listed by several sources becomes one record
+    loaded = len(all_data)
+    all_data, duplicate_groups = dedupe_entries(all_data)
+    print(f"\n🔗 Merged {loaded - len(all_data)} duplicate records into {len(duplicate_groups)} "
+          f"({len(all_data)} unique opportunities)")
+    clashes = ensure_unique_ids(all_data)
+    if clashes:
+        print(f"🆔 {clashes} records shared an id with another record and got an id from their title and description")
+
+    # Records whose content is unchanged since the last merge are carried
+    # forward already classified, localized and translated (unless a translation
+    # fell back to the original text, then they are translated again)
+    previous = manifest.previous_outputs(OUTPUT_FILE)
+    output_hashes = [record_hash(entry) for entry in all_data]
+    pending = []
+    for i, content_hash in enumerate(output_hashes):
+        if content_hash in previous:
+            all_data[i] = previous[content_hash]
+        else:
+            pending.append(i)
+    manifest.stats["outputs_reused"] = len(all_data) - len(pending)
+    manifest.stats["outputs_processed"] = len(pending)
+    changed = [all_data[i] for i in pending]
+
+    # Re-classify fields the scrapers left empty, in one batch
+    filled = classify_missing_fields(changed)
+    print(f"\n🏷️ Classified {filled} missing type/mode/category fields")
+
+    # Bulgarian names for type / mode / categories / city / country, offline
+    localize_entries(changed)
+    lexicon = get_lexicon()
+    print(f"📖 Lexicon lookups: {lexicon.hits} found, {lexicon.misses} kept as written")
 
     # Add Bulgarian translations using the translator module
-    print(f"\n🔤 Translating {len(all_data)} entries to Bulgarian...")
+    print(f"\n🔤 Translating {len(changed)} new or changed entries to {', '.join(TARGET_LANGUAGES)}...")
     translation_stats = {
-        'total': len(all_data),
-        'titles_translated': 0,
-        'descriptions_translated': 0
+        'total': len(changed),
+        'titles_translated': dict.fromkeys(TARGET_LANGUAGES, 0),
+        'descriptions_translated': dict.fromkeys(TARGET_LANGUAGES, 0)
     }
     
-    for i, entry in enumerate(all_data):
-        print(f"   Translating entry {i+1}/{len(all_data)}: {entry.get('title', '')[:50]}...")
-        
-        # Translate the entry
-        translated_entry = translate_entry(entry)
-        all_data[i] = translated_entry
-        
-        # Update stats
-        if translated_entry.get('title_bg') and translated_entry['title_bg'] != entry.get('title'):
-            translation_stats['titles_translated'] += 1
-        if translated_entry.get('description_bg') and translated_entry['description_bg'] != entry.get('description'):
-            translation_stats['descriptions_translated'] += 1
-        
-        # Add small delay to avoid API rate limits
-        time.sleep(1)  # 1 second delay between translations
-
-    # Save combined JSON
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
+    originals = [(entry.get('title'), entry.get('description')) for entry in changed]
+    
+    # Translate all entries concurrently; throughput follows the API rate limits
+    changed = translate_entries(changed) if changed else []
+    for i, entry in zip(pending, changed):
+        all_data[i] = entry
+    complete = [True] * len(all_data)
+    if changed:
+        translator = get_translator()
+        for i, entry in zip(pending, changed):
+            complete[i] = translator.is_complete(entry)
+    telemetry = get_telemetry()
+    for source, count in Counter(entry.get('source') for entry in changed).items():
+        telemetry.record_records("translate_title", count, source=source)
+        telemetry.record_records("translate_paragraph", count, source=source)
+    
+    # Update stats
+    for entry, (title, description) in zip(changed, originals):
+        for language in TARGET_LANGUAGES:
+            if entry.get(f'title_{language}') and entry[f'title_{language}'] != title:
+                translation_stats['titles_translated'][language] += 1
+            if entry.get(f'description_{language}') and entry[f'description_{language}'] != description:
+                translation_stats['descriptions_translated'][language] += 1
+
+    # Upsert into the SQLite store, then export the combined JSON from it
+    store = OpportunityStore()
+    store_stats = store.sync(all_data)
+    store.export_json(OUTPUT_FILE)
+    store.close()
+    manifest.save(output_hashes, OUTPUT_FILE, complete, reference_date=today.isoformat(),
+                  relative_dates=any(entry.get("dateAmbiguous") for entry in all_data))
 
     # Print summaries
     if date_stats['total'] > 0:
@@ -259,11 +302,29 @@ def main():
         print(f"   Successfully standardized: {date_stats['standardized']}")
         print(f"   Failed to standardize: {date_stats['failed']}")
         print(f"   Success rate: {(date_stats['standardized']/date_stats['total'])*100:.1f}%")
+        print(f"   Date ranges: {date_stats['ranges']}  Ambiguous (order or year guessed): {date_stats['ambiguous']}")
+        memo = cache_info()
+        print(f"   Parser memo: {memo.hits} hits, {memo.misses} distinct strings parsed")
     
+    manifest.print_stats()
+    print(f"\n🗄️ STORE ({STORE_FILE}): {store_stats['inserted']} inserted, {store_stats['updated']} updated, "
+          f"{store_stats['unchanged']} unchanged, {store_stats['deleted']} removed")
+
     print(f"\n🌍 TRANSLATION SUMMARY:")
     print(f"   Total entries processed: {translation_stats['total']}")
-    print(f"   Titles translated: {translation_stats['titles_translated']}")
-    print(f"   Descriptions translated: {translation_stats['descriptions_translated']}")
+    for language in TARGET_LANGUAGES:
+        print(f"   [{language}] Titles translated: {translation_stats['titles_translated'][language]}  "
+              f"Descriptions translated: {translation_stats['descriptions_translated'][language]}")
+    if changed:
+        translator = get_translator()
+        print(f"   API calls: {translator.api_calls}")
+        print(f"   Already Bulgarian (calls saved): {translator.skipped_bulgarian}")
+        print(f"   Duplicate texts translated once: {translator.deduplicated}")
+        print(f"   Entries left partly untranslated (retried next merge): {complete.count(False)}")
+        translator.memory.flush()
+        translator.memory.print_stats()
+    telemetry.print_report()
+    print(f"   Telemetry report: {telemetry.write_report('merge')}")
 
     print(f"\n🎉 Combined {len(all_data)} records into {OUTPUT_FILE}")
     print(f"✅ All entries now include Bulgarian translations!")
@@ -0,0 +1,178 @@
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from llm_cache import fingerprint
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = BASE_DIR / "data" / "cache"
+MANIFEST_FILE = CACHE_DIR / "merge_manifest.json"
+
+# Bump when normalize_entry or the per-record steps (lexicon, classifier) change their output
+MANIFEST_VERSION = 4
+
+
+def file_hash(path):
+    """sha256 of a file's bytes (None if it does not exist)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def record_hash(record):
+    """Content hash of one JSON record, independent of key order"""
+    payload = json.dumps(record, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class MergeManifest:
+    """
+    What the previous merge saw and produced, kept in data/cache/merge_manifest.json:
+
+    - per input file: its sha256 and, in file order, each raw record's hash
+      with its normalized record, so unchanged files are not parsed again and changed files
+      only normalize records that are new;
+    - the content hash of every output record (before classification, lexicon
+      and translation) in output order, whether its translations are complete,
+      and the output file's sha256, so unchanged, fully translated records can
+      be carried forward from the previous output;
+    - the day of the merge and whether any output deadline was resolved
+      relative to it (a year-less date), so those are re-resolved on a later day.
+
+    A different MANIFEST_VERSION or pipeline fingerprint (target languages,
+    translation prompt, classifier keywords, lexicon) discards the part that
+    would be stale; fresh=True starts from nothing (a full merge).
+    """
+
+    def __init__(self, pipeline, path=MANIFEST_FILE, fresh=False):
+        self.path = Path(path)
+        self.pipeline = pipeline
+        self.files = {}
+        self.outputs = []
+        self.complete = []
+        self.output_hash = None
+        self.reference_date = None
+        self.relative_dates = None
+        self.stats = {"files_reused": 0, "files_changed": 0, "records_reused": 0,
+                      "records_normalized": 0, "outputs_reused": 0, "outputs_processed": 0}
+
+        if fresh or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable merge manifest: {e}")
+            return
+        if saved.get("version") != MANIFEST_VERSION:
+            return
+        self.files = saved.get("files", {})
+        if saved.get("pipeline") == pipeline:
+            self.outputs = saved.get("outputs", [])
+            self.complete = saved.get("complete", [])
+            self.output_hash = saved.get("output_hash")
+            self.reference_date = saved.get("reference_date")
+            self.relative_dates = saved.get("relative_dates")
+
+    def file_unchanged(self, name, sha256):
+        return sha256 is not None and self.files.get(name, {}).get("sha256") == sha256
+
+    def cached_records(self, name):
+        """Copies of the normalized records of an unchanged file"""
+        self.stats["files_reused"] += 1
+        records = [normalized for _, normalized in self.files[name]["records"]]
+        self.stats["records_reused"] += len(records)
+        return copy.deepcopy(records)
+
+    def normalize_file(self, name, sha256, raw_records, normalize):
+        """
+        Normalized records for a changed file: records whose raw content was
+        seen before come from the manifest, the rest go through normalize().
+        """
+        self.stats["files_changed"] += 1
+        previous = dict((key, normalized) for key, normalized in self.files.get(name, {}).get("records", []))
+        current, result = [], []
+        for raw in raw_records:
+            key = record_hash(raw)
+            if key in previous:
+                normalized = previous[key]
+                self.stats["records_reused"] += 1
+            else:
+                normalized = normalize(raw)
+                self.stats["records_normalized"] += 1
+            current.append((key, copy.deepcopy(normalized)))
+            result.append(copy.deepcopy(normalized))
+        self.files[name] = {"sha256": sha256, "records": current}
+        return result
+
+    def forget_file(self, name):
+        self.files.pop(name, None)
+
+    def dates_current(self, today):
+        """False when the previous output has deadlines guessed relative to another day"""
+        return self.relative_dates is False or self.reference_date == today
+
+    def previous_outputs(self, output_file):
+        """
+        {content hash: previous output record} for the records whose translations
+        were complete; empty if the output was changed or removed
+        """
+        if not self.outputs or self.output_hash is None or file_hash(output_file) != self.output_hash:
+            return {}
+        try:
+            with open(output_file, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if len(records) != len(self.outputs) or len(self.complete) != len(self.outputs):
+            return {}
+        return {content_hash: record for content_hash, record, complete
+                in zip(self.outputs, records, self.complete) if complete}
+
+    def save(self, outputs, output_file, complete, reference_date=None, relative_dates=True):
+        """
+        Store the content hashes of the records just written to output_file,
+        whether each one is fully translated, the day they were merged on and
+        whether any deadline depends on that day
+        """
+        self.outputs = outputs
+        self.complete = complete
+        self.output_hash = file_hash(output_file)
+        self.reference_date = reference_date
+        self.relative_dates = relative_dates
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "pipeline": self.pipeline,
+                "files": self.files,
+                "outputs": self.outputs,
+                "complete": self.complete,
+                "output_hash": self.output_hash,
+                "reference_date": self.reference_date,
+                "relative_dates": self.relative_dates,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def print_stats(self):
+        s = self.stats
+        print("\n♻️ INCREMENTAL MERGE")
+        print(f"   Files: {s['files_reused']} unchanged, {s['files_changed']} reloaded")
+        print(f"   Records: {s['records_reused']} reused, {s['records_normalized']} normalized")
+        print(f"   Output: {s['outputs_reused']} carried forward, {s['outputs_processed']} classified/translated")
+
+
+def pipeline_fingerprint(*parts):
+    """Fingerprint of everything besides the input that shapes an output record"""
+    return fingerprint(MANIFEST_VERSION, *parts)
@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Deterministic answers for extraction prompts (picked by hashing the post title)
+CANNED_TYPES = ["exchange", "training", "volunteering", "event", "scholarship", "internship"]
+CANNED_MODES = ["on-site", "remote", "hybrid"]
+CANNED_CATEGORIES = [["Social Causes"], ["Languages", "Culture"], ["Ecology", "Environment"], ["Science"]]
+CANNED_PLACES = [("Sofia", "Bulgaria"), ("Plovdiv", "Bulgaria"), ("Berlin", "Germany"), (None, None)]
+
+BATCH_POST_RE = re.compile(r"### id: (\S+)\s+FIELDS: ([^\n]*)\s+TITLE: ([^\n]*)")
+SINGLE_FIELDS_RE = re.compile(r"^FIELDS: ([^\n]*)", re.MULTILINE)
+SINGLE_TITLE_RE = re.compile(r"TITLE: ([^\n]*)")
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+QUOTED_RE = re.compile(r'(?:Title|Description): "(.*)"', re.DOTALL)
+LANGUAGES_RE = re.compile(r"Target languages: ([^\n]*)")
+LANGUAGE_CODE_RE = re.compile(r"\b([a-z]{2}) \(")
+REPAIR_MARKER = "could not be parsed as JSON"
+
+
+def estimate_tokens(text):
+    return max(1, len(text or "") // 4)
+
+
+def pick(options, key):
+    digest = hashlib.sha256((key or "").encode("utf-8")).digest()
+    return options[digest[0] % len(options)]
+
+
+def canned_fields(title, fields):
+    city, country = pick(CANNED_PLACES, title)
+    values = {
+        "typeOfOpportunity": pick(CANNED_TYPES, title),
+        "modeOfWork": pick(CANNED_MODES, title + "mode"),
+        "categories": pick(CANNED_CATEGORIES, title + "cat"),
+        "city": city,
+        "country": country,
+        "validUntil": "2026-12-31",
+        "bulgariaEligible": True,
+    }
+    return {field: values.get(field) for field in fields}
+
+
+def answer_translation(prompt):
+    """Templated 'translation' ("[ro] text") per requested language; batch prompts keep their numbered keys"""
+    languages = LANGUAGES_RE.search(prompt)
+    codes = LANGUAGE_CODE_RE.findall(languages.group(1)) if languages else ["bg"]
+    match = JSON_OBJECT_RE.search(prompt)
+    if "JSON object mapping a number" in prompt and match:
+        items = json.loads(match.group(0))
+        return json.dumps({key: {code: f"[{code}] {text}" for code in codes} for key, text in items.items()},
+                          ensure_ascii=False)
+    quoted = QUOTED_RE.search(prompt)
+    text = quoted.group(1) if quoted else prompt.strip()
+    return json.dumps({code: f"[{code}] {text}" for code in codes}, ensure_ascii=False)
+
+
+def split_fields(line):
+    return [f.strip() for f in line.split(",") if f.strip()]
+
+
+def answer_extraction(prompt, response_format=None):
+    """Canned fields; batches come back as {"results": [...]} when that schema was requested"""
+    posts = BATCH_POST_RE.findall(prompt)
+    if posts:
+        results = [dict(canned_fields(title.strip(), split_fields(fields)), id=post_id)
+                   for post_id, fields, title in posts]
+        schema_name = ((response_format or {}).get("json_schema") or {}).get("name")
+        return json.dumps({"results": results} if schema_name == "extraction_batch" else results,
+                          ensure_ascii=False)
+    title = SINGLE_TITLE_RE.search(prompt)
+    fields = SINGLE_FIELDS_RE.search(prompt)
+    return json.dumps(canned_fields(title.group(1).strip() if title else "",
+                                    split_fields(fields.group(1)) if fields else []), ensure_ascii=False)
+
+
+def close_json(text):
+    """Best-effort fix of cut-off JSON: drop the unfinished tail and close open brackets"""
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    if start == -1:
+        return None
+    text = text[start:]
+    cuts = [len(text)] + [i for i in range(len(text) - 1, 0, -1) if text[i] == ","][:50]
+    for cut in cuts:
+        head = text[:cut].rstrip().rstrip(",")
+        stack, in_string, escaped = [], False, False
+        for ch in head:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = in_string
+            elif ch == '"':
+                in_string = not in_string
+            elif not in_string and ch in "{[":
+                stack.append(ch)
+            elif not in_string and ch in "}]" and stack:
+                stack.pop()
+        if in_string:
+            continue
+        candidate = head + "".join("}" if ch == "{" else "]" for ch in reversed(stack))
+        try:
+            json.loads(candidate)
+            return candidate
+        except ValueError:
+            continue
+    return None
+
+
+def answer_repair(prompt):
+    """Repair requests get the broken reply back as valid JSON (or an empty object)"""
+    broken = prompt.split("Reply:", 1)[-1].strip()
+    end = max(broken.rfind("}"), broken.rfind("]"))
+    for candidate in (broken[:end + 1] if end != -1 else broken, broken):
+        fixed = close_json(candidate)
+        if fixed is not None:
+            return fixed
+    return "{}"
+
+
+class StandInState:
+    """Knobs and counters shared by all request handler threads"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, rate_limit=0, error_rate=0.0,
+                 malformed_rate=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit          # requests per second, 0 = unlimited
+        self.error_rate = error_rate          # share of random 429s
+        self.malformed_rate = malformed_rate  # share of JSON replies that are broken
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.stats = {"requests": 0, "rate_limited": 0, "malformed": 0}
+
+    def roll(self, rate):
+        with self.lock:
+            return self.random.random() < rate
+
+    def admit(self):
+        """(allowed, remaining, ms until the window resets) for the per-second limit"""
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start, self.window_count = now, 0
+            reset_ms = max(1, int((1.0 - (now - self.window_start)) * 1000))
+            if self.rate_limit and self.window_count >= self.rate_limit:
+                self.stats["rate_limited"] += 1
+                return False, 0, reset_ms
+            self.window_count += 1
+            remaining = self.rate_limit - self.window_count if self.rate_limit else 10000
+            return True, remaining, reset_ms
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions with OpenAI-shaped replies"""
+
+    state = None  # set by make_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        state = self.state
+
+        allowed, remaining, reset_ms = state.admit()
+        limit_headers = {
+            "x-ratelimit-limit-requests": str(state.rate_limit or 10000),
+            "x-ratelimit-remaining-requests": str(remaining),
+            "x-ratelimit-reset-requests": f"{reset_ms}ms",
+        }
+        if not allowed or state.roll(state.error_rate):
+            if allowed:
+                with state.lock:
+                    state.stats["rate_limited"] += 1
+            self.send_json(429, {"error": {
+                "message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"
+            }}, dict(limit_headers, **{"retry-after-ms": str(reset_ms)}))
+            return
+
+        delay = state.latency_ms + (state.random.uniform(-state.jitter_ms, state.jitter_ms) if state.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        messages = request.get("messages") or []
+        system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        prompt = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
+        if "translator" in system.lower():
+            content = answer_translation(prompt)
+        elif REPAIR_MARKER in prompt:
+            content = answer_repair(prompt)
+        else:
+            content = answer_extraction(prompt, request.get("response_format"))
+
+        if content.lstrip().startswith(("{", "[")) and state.roll(state.malformed_rate):
+            with state.lock:
+                state.stats["malformed"] += 1
+            # half stray prose around the JSON, half a reply cut mid-way
+            content = f"Sure! Here is the JSON:\n{content}\nHope this helps." if state.roll(0.5) else content[:-2]
+
+        prompt_tokens = sum(estimate_tokens(m.get("content")) for m in messages)
+        completion_tokens = estimate_tokens(content)
+        self.send_json(200, {
+            "id": f"chatcmpl-standin-{state.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }, limit_headers)
+
+
+def make_server(host="127.0.0.1", port=0, **knobs):
+    """Build a stand-in server (port 0 picks a free port); returns (server, state)"""
+    state = StandInState(**knobs)
+    handler = type("BoundStandInHandler", (StandInHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, state
+
+
+def start_in_background(**knobs):
+    """Run a stand-in on a daemon thread; returns (server, state, base_url)"""
+    server, state = make_server(**knobs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, state, f"http://{host}:{port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in for offline runs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per second (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of random 429 replies")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of broken JSON replies")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, _ = make_server(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                            rate_limit=args.rate_limit, error_rate=args.error_rate,
+                            malformed_rate=args.malformed_rate, seed=args.seed)
+    print(f"🧪 OpenAI stand-in listening on http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,185 @@
+import argparse
+import heapq
+import json
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+
+from eligibility import SUPPORTED_COUNTRIES, COUNTRY_BITS
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+DATASET_FILE = BASE_DIR / "data" / "all_opportunities.json"
+
+# Indexed single-valued record fields, matched case-insensitively
+FIELDS = {
+    "country": "country",
+    "city": "city",
+    "type": "type",
+    "mode": "modeOfWork",
+    "source": "source",
+}
+
+
+def _key(value):
+    return " ".join(str(value).casefold().split()) if value not in (None, "") else None
+
+
+class OpportunityIndex:
+    """
+    The merged dataset in memory with inverted indexes: field value -> set of
+    record positions for country, city, type, modeOfWork, source and every
+    category, one set per supported country's eligibility bit, and the
+    deadlines as a sorted array for bisect range lookups. A query intersects
+    the posting sets starting from the smallest, so it costs about the size of
+    the most selective filter instead of a scan over every record.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.fields = {name: {} for name in FIELDS}
+        self.categories = {}
+        self.eligibility = [set() for _ in SUPPORTED_COUNTRIES]
+
+        dated = []
+        for position, record in enumerate(records):
+            for name, field in FIELDS.items():
+                key = _key(record.get(field))
+                if key:
+                    self.fields[name].setdefault(key, set()).add(position)
+            for category in record.get("categories") or []:
+                key = _key(category)
+                if key:
+                    self.categories.setdefault(key, set()).add(position)
+            mask = record.get("eligibilityMask") or 0
+            while mask:
+                bit = mask & -mask
+                self.eligibility[bit.bit_length() - 1].add(position)
+                mask ^= bit
+            if record.get("validUntil"):
+                dated.append((record["validUntil"], position))
+
+        dated.sort()
+        self.deadlines = [deadline for deadline, _ in dated]
+        self.deadline_positions = [position for _, position in dated]
+
+    @classmethod
+    def load(cls, path=DATASET_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_store(cls, store_path=None):
+        """Index the records of the SQLite store instead of the JSON export"""
+        from store import OpportunityStore, STORE_FILE
+        store = OpportunityStore(store_path or STORE_FILE)
+        try:
+            return cls(store.records())
+        finally:
+            store.close()
+
+    def _deadline_bounds(self, after, before):
+        low = bisect_left(self.deadlines, after) if after else 0
+        high = bisect_right(self.deadlines, before) if before else len(self.deadlines)
+        return low, max(low, high)
+
+    def search(self, country=None, city=None, type=None, mode=None, source=None, categories=(),
+               eligible_in=None, after=None, before=None, limit=None):
+        """
+        Records matching every given filter, in dataset order. categories must
+        all be present; after/before bound validUntil (inclusive, YYYY-MM-DD;
+        records without a deadline are left out); eligible_in is a supported
+        country the opportunity must be open to.
+        """
+        postings = []
+        for name, value in (("country", country), ("city", city), ("type", type),
+                            ("mode", mode), ("source", source)):
+            if value:
+                postings.append(self.fields[name].get(_key(value), set()))
+        for category in categories or ():
+            postings.append(self.categories.get(_key(category), set()))
+        if eligible_in:
+            bit = COUNTRY_BITS.get(eligible_in.strip().lower())
+            postings.append(self.eligibility[bit.bit_length() - 1] if bit else set())
+
+        dated = after or before
+        low, high = self._deadline_bounds(after, before) if dated else (0, 0)
+
+        if not postings:
+            matches = set(self.deadline_positions[low:high]) if dated else None
+        else:
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                if not matches:
+                    break
+                matches &= posting
+            if dated and matches:
+                if len(matches) < high - low:
+                    # cheaper to check the few candidates than to materialise the range
+                    matches = {p for p in matches if self._in_range(self.records[p].get("validUntil"), after, before)}
+                else:
+                    matches &= set(self.deadline_positions[low:high])
+
+        if matches is None:
+            positions = range(len(self.records))[:limit] if limit else range(len(self.records))
+        elif limit:
+            positions = heapq.nsmallest(limit, matches)
+        else:
+            positions = sorted(matches)
+        return [self.records[p] for p in positions]
+
+    @staticmethod
+    def _in_range(deadline, after, before):
+        return bool(deadline) and (not after or deadline >= after) and (not before or deadline <= before)
+
+    def stats(self):
+        return {
+            "records": len(self.records),
+            "dated": len(self.deadlines),
+            "categories": len(self.categories),
+            **{f"{name}_values": len(index) for name, index in self.fields.items()},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter the merged opportunities through in-memory indexes")
+    parser.add_argument("--file", default=str(DATASET_FILE), help="merged JSON dataset")
+    parser.add_argument("--store", action="store_true", help="load from data/opportunities.sqlite instead")
+    parser.add_argument("--country")
+    parser.add_argument("--city")
+    parser.add_argument("--type")
+    parser.add_argument("--mode")
+    parser.add_argument("--source")
+    parser.add_argument("--category", action="append", default=[], help="repeat to require several")
+    parser.add_argument("--eligible-in", help="supported country the opportunity must be open to")
+    parser.add_argument("--after", help="deadline on or after YYYY-MM-DD")
+    parser.add_argument("--before", help="deadline on or before YYYY-MM-DD")
+    parser.add_argument("--open", action="store_true", help="deadline today or later")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print matching records as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = OpportunityIndex.from_store() if args.store else OpportunityIndex.load(args.file)
+    loaded = time.perf_counter()
+    results = index.search(country=args.country, city=args.city, type=args.type, mode=args.mode,
+                           source=args.source, categories=args.category, eligible_in=args.eligible_in,
+                           after=date.today().isoformat() if args.open else args.after,
+                           before=args.before, limit=args.limit)
+    finished = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for record in results:
+            print(f"{record.get('validUntil') or '----------'}  {record.get('id', '')}  {record.get('title')}")
+    print(f"🔎 {len(results)} records in {(finished - loaded) * 1000:.2f} ms "
+          f"(index of {len(index.records)} records built in {(loaded - started) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import random
+import re
+import time
+
+DEFAULT_MAX_CONCURRENCY = 8
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# Clean responses needed before the concurrency limit grows by one
+SUCCESSES_PER_STEP = 10
+
+DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value):
+    """
+    Seconds from an OpenAI reset header ("20ms", "1.5s", "6m0s", "1h2m3s").
+    Plain numbers (Retry-After style) are read as seconds; None if unparseable.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after_seconds(headers):
+    """Server-suggested wait from a 429 response, or None"""
+    if not headers:
+        return None
+    for name in ("retry-after-ms", "retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        if name == "retry-after-ms":
+            try:
+                return float(value) / 1000
+            except ValueError:
+                continue
+        seconds = parse_reset_duration(value)
+        if seconds is not None:
+            return seconds
+    return None
+
+
+class AdaptiveThrottle:
+    """
+    Bounded, self-adjusting concurrency for async API calls.
+
+    At most `limit` requests are in flight. The limit starts at max_concurrency,
+    is halved on every 429 and grows by one after SUCCESSES_PER_STEP clean
+    responses (additive increase, multiplicative decrease). Rate-limit headers
+    (x-ratelimit-remaining-* / x-ratelimit-reset-*) pause new requests until the
+    window resets once the remaining quota would not cover the requests in
+    flight, so throughput follows the account quota instead of a fixed sleep.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, base_backoff=BASE_BACKOFF,
+                 max_backoff=MAX_BACKOFF):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.successes = 0
+        self._condition = None
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "pauses": 0,
+            "min_limit": self.limit,
+        }
+
+    def _get_condition(self):
+        # created lazily so the throttle can be built outside a running loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: self.in_flight < self.limit)
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0:
+                    self.in_flight += 1
+                    self.stats["requests"] += 1
+                    return
+            await asyncio.sleep(wait)
+
+    async def release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def slot(self):
+        """async with throttle.slot(): ... one request"""
+        return _Slot(self)
+
+    def pause(self, seconds):
+        if seconds and seconds > 0:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.stats["pauses"] += 1
+
+    def observe_headers(self, headers):
+        """Pause until the window resets when the remaining quota runs low"""
+        if not headers:
+            return
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                remaining = int(float(remaining))
+            except ValueError:
+                continue
+            # tokens: keep a rough margin of 1k tokens per request in flight
+            needed = self.in_flight if kind == "requests" else self.in_flight * 1000
+            if remaining <= needed:
+                self.pause(parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}")))
+
+    def on_success(self):
+        self.successes += 1
+        if self.successes >= SUCCESSES_PER_STEP and self.limit < self.max_concurrency:
+            self.limit += 1
+            self.successes = 0
+
+    def on_rate_limited(self, retry_after=None):
+        self.stats["rate_limited"] += 1
+        self.successes = 0
+        self.limit = max(1, self.limit // 2)
+        self.stats["min_limit"] = min(self.stats["min_limit"], self.limit)
+        if retry_after:
+            self.pause(retry_after)
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+        cap = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+class _Slot:
+    def __init__(self, throttle):
+        self.throttle = throttle
+
+    async def __aenter__(self):
+        await self.throttle.acquire()
+        return self.throttle
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.throttle.release()
+        return False
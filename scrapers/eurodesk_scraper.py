@@ -2,6 +2,7 @@ import os
 import re
 import time
 import json
+import sys
 import tkinter as tk
 import undetected_chromedriver as uc
 from pathlib import Path
@@ -24,9 +25,18 @@ CITIES_FILE = CONFIG_DIR / "world_cities.json"
 # Output file
 OUTPUT_FILE = DATA_DIR / "eurodesk_learning.json"
 
+# Add project root to path to import shared modules
+sys.path.append(str(BASE_DIR))
+
+from eligibility import mask_for
+from identity import record_id
+
 # Target URL
 URL = "https://programmes.eurodesk.eu/learning"
 
+# Country selected in the "eligible-country" filter
+ELIGIBLE_COUNTRY = "Bulgaria"
+
 # tweak waits if needed
 SHORT_WAIT = 1
 MEDIUM_WAIT = 2
@@ -239,7 +249,8 @@ def close_popup(driver):
         except Exception:
             pass
 
-def scrape_popup_data(driver, card_number, mode_of_work, category_keywords, countries, cities):
+def scrape_popup_data(driver, card_number, mode_of_work, category_keywords, countries, cities,
+                      eligible_countries=None):
     """Scrape a single popup and return structured dict including modeOfWork."""
     time.sleep(LONG_WAIT)  # allow popup to load
     data = {}
@@ -258,6 +269,7 @@ def scrape_popup_data(driver, card_number, mode_of_work, category_keywords, coun
         
         data['url'] = extract_url_specific(driver)
         data['description'] = extract_description_specific(driver)
+        data['id'] = record_id("eurodesk", data['url'], data['title'], data['description'])
         data['typeOfOpportunity'] = extract_category_specific(driver)
         data['bannerImage'] = extract_banner_image(driver)
 
@@ -275,6 +287,8 @@ def scrape_popup_data(driver, card_number, mode_of_work, category_keywords, coun
 
         data['card_number'] = card_number
         data['modeOfWork'] = mode_of_work
+        data['eligibleCountries'] = list(eligible_countries or [ELIGIBLE_COUNTRY])
+        data['eligibilityMask'] = mask_for(data['eligibleCountries'])
     except Exception as e:
         data = {"error": str(e), "card_number": card_number, "modeOfWork": mode_of_work}
     return data
@@ -312,6 +326,23 @@ def set_country(driver, country_name):
     except Exception as e:
         print(f"Failed to select country {country_name}:", e)
 
+def get_country_options(driver):
+    """Visible names of every selectable option in the eligible-country filter"""
+    try:
+        wait = WebDriverWait(driver, 10)
+        country_select = wait.until(EC.presence_of_element_located((By.NAME, "eligible-country")))
+        names = []
+        for option in Select(country_select).options:
+            name = option.text.strip()
+            # skip the "any country" placeholder
+            if name and option.get_attribute("value"):
+                names.append(name)
+        print(f"🌍 Found {len(names)} eligible-country options")
+        return names
+    except Exception as e:
+        print("Failed to read country options:", e)
+        return []
+
 def reset_mode_filters(driver):
     """Reset both Online and Onsite filters to unchecked state"""
     online_css = "input[name='format[online]']"
@@ -450,15 +481,149 @@ def process_all_cards_for_mode(driver, category_keywords, mode_of_work):
     print(f"\n✅ [{mode_of_work}] Completed scraping {len(scraped_data)} items (stopped at card {i+1})")
     return scraped_data
 
+def card_identity(card):
+    """Identity of a listing card, read from the card itself without opening its popup"""
+    for attr in ("data-id", "data-program", "onclick"):
+        value = card.get_attribute(attr)
+        if value:
+            return value
+    for link in card.find_elements(By.TAG_NAME, "a"):
+        href = link.get_attribute("href")
+        if href:
+            return href
+    return " ".join(card.text.split())
+
+def process_cards_for_country(driver, category_keywords, mode_of_work, country,
+                              items_by_identity, upcoming, stats):
+    """
+    Walk the current listing for one country. Cards already scraped under another
+    country only get this country added to their eligibleCountries; new cards are
+    opened once. Stops at the first UPCOMING card, like process_all_cards_for_mode.
+    """
+    countries, cities = load_countries_and_cities()
+    cards = driver.find_elements(By.CSS_SELECTOR, "[data-role='card']")
+    print(f"[{country} / {mode_of_work}] Found {len(cards)} cards in listing")
+
+    for i in range(len(cards)):
+        try:
+            # re-find cards each iteration - page may re-render
+            current_cards = driver.find_elements(By.CSS_SELECTOR, "[data-role='card']")
+            if i >= len(current_cards):
+                break
+            card = current_cards[i]
+            identity = card_identity(card)
+            stats["listing_cards"] += 1
+
+            if identity in upcoming:
+                print(f"  🛑 Card {i+1} is a known UPCOMING post. Stopping this listing.")
+                break
+
+            item = items_by_identity.get(identity)
+            if item is not None:
+                if country not in item["eligibleCountries"]:
+                    item["eligibleCountries"].append(country)
+                continue
+
+            # First time we see this card: open its popup once
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
+            time.sleep(SHORT_WAIT)
+            driver.execute_script("arguments[0].click();", card)
+            time.sleep(LONG_WAIT)
+
+            item = scrape_popup_data(driver, card_number=len(items_by_identity) + 1,
+                                     mode_of_work=mode_of_work,
+                                     category_keywords=category_keywords,
+                                     countries=countries, cities=cities,
+                                     eligible_countries=[country])
+            stats["popups_opened"] += 1
+            close_popup(driver)
+            time.sleep(SHORT_WAIT)
+
+            if item is None:
+                upcoming.add(identity)
+                print(f"  🛑 First UPCOMING post detected at card {i+1}. Stopping this listing.")
+                break
+
+            if "error" in item:
+                # not remembered, so the card is opened again from the next listing it appears in
+                print(f"  ⚠️ Could not read card {i+1}: {item['error']}")
+                continue
+
+            items_by_identity[identity] = item
+            print(f"  ✅ Scraped new card {i+1} ({len(items_by_identity)} unique so far)")
+
+        except Exception as e:
+            print(f"❌ Error processing card {i+1} [{country} / {mode_of_work}]: {e}")
+            try:
+                close_popup(driver)
+            except Exception:
+                pass
+            continue
+
+def run_multi_country(driver, category_keywords, eligible_countries=None):
+    """
+    Single browser run over many eligible-country filters.
+    eligible_countries=None means every option in the eligible-country select.
+    """
+    countries = eligible_countries or get_country_options(driver)
+
+    items_by_identity = {}
+    upcoming = set()
+    stats = {
+        "listing_cards": 0,
+        "popups_opened": 0,
+    }
+
+    for country in countries:
+        print("\n" + "="*50)
+        print(f"🌍 Country: {country}")
+        print("="*50)
+        set_country(driver, country)
+
+        for mode in ("Online", "Onsite"):
+            set_mode_filter(driver, mode)
+            click_see_results(driver)
+            time.sleep(5)
+
+            count = wait_for_results_to_load(driver, timeout=12)
+            print(f"📊 [{country} / {mode}] Cards after filtering: {count}")
+
+            process_cards_for_country(driver, category_keywords, mode, country,
+                                      items_by_identity, upcoming, stats)
+
+    items = list(items_by_identity.values())
+    for item in items:
+        item["eligibilityMask"] = mask_for(item["eligibleCountries"])
+
+    combined = dedupe_combined(items)
+    save_json(combined, OUTPUT_FILE)
+
+    print("\n" + "="*60)
+    print("📊 MULTI-COUNTRY SUMMARY")
+    print("="*60)
+    print(f"🌍 Countries covered: {len(countries)}")
+    print(f"🗂️  Listing cards seen: {stats['listing_cards']}")
+    print(f"🪟 Popups opened: {stats['popups_opened']}")
+    print(f"✨ Unique items saved: {len(combined)}")
+    return combined
+
 # ---------------------------
 # Dedup & Save
 # ---------------------------
 def dedupe_combined(items):
-    seen = set()
+    """
+    One item per URL (or title and date); duplicates add their eligible
+    countries to the kept item. Cards that failed to scrape are dropped.
+    """
+    seen = {}
     unique = []
     duplicates = []
+    failed = 0
     
     for it in items:
+        if "error" in it:
+            failed += 1
+            continue
         key = None
         url = it.get("url", "")
         title = it.get("title", "")
@@ -470,11 +635,19 @@ def dedupe_combined(items):
             key = f"{title}||{date}"
             
         if key not in seen:
-            seen.add(key)
+            seen[key] = it
             unique.append(it)
         else:
+            kept = seen[key]
+            eligible = kept.setdefault("eligibleCountries", [])
+            for country in it.get("eligibleCountries", []):
+                if country not in eligible:
+                    eligible.append(country)
+            kept["eligibilityMask"] = mask_for(eligible)
             duplicates.append({"key": key, "title": title, "date": date})
     
+    if failed:
+        print(f"⚠️ Dropped {failed} card(s) that could not be scraped")
     if duplicates:
         print(f"🔍 Found {len(duplicates)} duplicate(s):")
         for dup in duplicates:
@@ -522,7 +695,12 @@ def wait_for_page_ready(driver, timeout=10):
 # ---------------------------
 # Main workflow - CORRECTED
 # ---------------------------
-def main():
+def main(countries=None, multi_country=False):
+    """
+    Default: one run filtered on ELIGIBLE_COUNTRY.
+    multi_country=True: one run over `countries` (or every eligible-country option),
+    opening each distinct card once and recording every country it appears under.
+    """
     driver = simple_init()
     
     try:
@@ -563,13 +741,18 @@ def main():
         # Set base filters once
         ensure_young_people_checked(driver)
         click_more_filters(driver)
-        set_country(driver, "Bulgaria")
 
         # Load category keywords
         category_keywords = load_json_file(CATEGORY_KEYWORDS_FILE) or {}
         if not category_keywords:
             print("⚠️ Warning: category_keywords is empty or missing")
 
+        if multi_country:
+            run_multi_country(driver, category_keywords, countries)
+            return
+
+        set_country(driver, ELIGIBLE_COUNTRY)
+
         all_results = []
 
         # Process Online first
@@ -636,4 +819,13 @@ def main():
             pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape Eurodesk learning opportunities")
+    parser.add_argument("--all-countries", action="store_true",
+                        help="scrape every eligible-country option in a single run")
+    parser.add_argument("--countries", nargs="+",
+                        help="scrape only these eligible-country options in a single run")
+    args = parser.parse_args()
+
+    main(countries=args.countries, multi_country=bool(args.all_countries or args.countries))
\ No newline at end of file
@@ -2,6 +2,7 @@ import json
 import re
 import time
 import os
+import sys
 import tkinter as tk
 import undetected_chromedriver as uc
 from pathlib import Path
@@ -11,6 +12,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from datetime import datetime
 
+# Add project root to path to import shared modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classifier import BatchClassifier
+from eligibility import BULGARIA, countries_from_mask, eligibility_mask
+from identity import record_id
+
 
 class EuropeanYouthPortalScraper:
 
@@ -18,6 +26,8 @@ class EuropeanYouthPortalScraper:
         self.driver = None
         self.max_load_more = max_load_more
         self.all_opportunities = []
+        # Substring matching, like the per-post checks this scraper always used
+        self.classifier = BatchClassifier(default_type='volunteering', substrings=True)
 
         # Resolve project root reliably (fallback to cwd if __file__ isn't available)
         try:
@@ -148,8 +158,8 @@ class EuropeanYouthPortalScraper:
             print(f"❌ Error extracting URLs: {e}")
             return []
 
-    def check_bulgaria_eligible(self):
-        """Robust check if Bulgaria is eligible for the opportunity"""
+    def check_eligibility(self):
+        """Robust eligibility check; returns a bitmask over eligibility.SUPPORTED_COUNTRIES"""
         try:
             # Try a few different XPaths commonly used on the site
             candidates = []
@@ -181,32 +191,20 @@ class EuropeanYouthPortalScraper:
 
             if not candidates:
                 print("❌ No participants section found")
-                return False
+                return 0
 
-            countries_text = ' '.join(candidates).lower()
+            countries_text = ' '.join(candidates)
             print(f"🔍 Countries (raw): {countries_text[:200]}{'...' if len(countries_text)>200 else ''}")
 
-            # Simple checks
-            if 'bulgaria' in countries_text:
-                return True
-
-            global_terms = [
-                'all countries', 'all nationalities', 'worldwide', 'global',
-                'europe', 'european', 'eu countries', 'european union',
-                'any country', 'any nationality', 'erasmus', 'erasmus+', 'erasmus plus', 'youth programme countries',
-                'eu residents'
-            ]
-            if any(term in countries_text for term in global_terms):
-                return True
-
-            return False
+            # One pass over the section sets the bit of every country / group mentioned
+            return eligibility_mask(countries_text)
 
         except NoSuchElementException:
             print("❌ No participants section (NoSuchElementException)")
-            return False
+            return 0
         except Exception as e:
             print(f"⚠️ Error while checking eligibility: {e}")
-            return False
+            return 0
 
     def extract_title(self):
         """Extract opportunity title"""
@@ -313,42 +311,11 @@ class EuropeanYouthPortalScraper:
 
     def extract_opportunity_type(self, post_title, description):
         """Extract type of opportunity"""
-        text = f"{post_title or ''} {description or ''}".lower()
-
-        type_keywords = {
-            'competition': ['competition', 'contest', 'prize', 'award', 'challenge', 'tournament'],
-            'exchange': ['exchange', 'cultural exchange', 'youth exchange', 'student exchange'],
-            'event': ['event', 'conference', 'summit', 'workshop', 'seminar', 'forum', 'meeting'],
-            'scholarship': ['scholarship', 'grant', 'funding', 'financial aid', 'stipend'],
-            'erasmus': ['erasmus', 'erasmus+', 'erasmus plus'],
-            'volunteering': ['volunteering', 'volunteer', 'solidarity']
-        }
-
-        for opp_type, keywords in type_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return opp_type
-
-        return 'volunteering'
+        return self.classifier.classify_one(post_title, description)["type"]
 
     def extract_mode_of_work(self, description):
         """Extract mode of work"""
-        if not description:
-            return 'on-site'
-
-        text = description.lower()
-
-        remote_terms = ['remote', 'virtual', 'digital', 'zoom', 'webinar', 'from home']
-        onsite_terms = ['on-site', 'onsite', 'in-person', 'physical', 'venue', 'location', 'face-to-face']
-        hybrid_terms = ['hybrid', 'both online and in-person', 'online and onsite', 'partially remote']
-
-        if any(term in text for term in hybrid_terms):
-            return 'hybrid'
-        elif any(term in text for term in remote_terms):
-            return 'remote'
-        elif any(term in text for term in onsite_terms):
-            return 'on-site'
-
-        return 'on-site'
+        return self.classifier.classify_one(None, description)["modeOfWork"]
 
     def scrape_single_opportunity(self, url, opportunity_number):
         """Scrape data from a single opportunity URL"""
@@ -372,13 +339,15 @@ class EuropeanYouthPortalScraper:
 
             time.sleep(1)
 
-            # Check Bulgaria eligibility first
-            is_eligible = self.check_bulgaria_eligible()
+            # Check eligibility first
+            eligibility = self.check_eligibility()
+            is_eligible = bool(eligibility & BULGARIA)
+            print(f"🌍 Eligible countries: {len(countries_from_mask(eligibility))}")
             print(f"🇧🇬 Bulgaria eligible: {is_eligible}")
 
-            # Only proceed if Bulgaria is eligible
-            if not is_eligible:
-                print("🚫 Skipping - Bulgaria not eligible")
+            # Only proceed if at least one supported country is eligible
+            if not eligibility:
+                print("🚫 Skipping - no supported country eligible")
                 return None
 
             # Extract all data
@@ -396,6 +365,7 @@ class EuropeanYouthPortalScraper:
             print(f"💼 Mode: {mode_of_work}")
 
             opportunity_data = {
+                "id": record_id("european_youth", url, title, description),
                 "postNo": opportunity_number,
                 "title": title,
                 "city": city,
@@ -407,7 +377,8 @@ class EuropeanYouthPortalScraper:
                 "categories": categories,
                 "applicationUrl": url,
                 "bannerImage": banner_image,
-                "bulgariaEligible": is_eligible
+                "bulgariaEligible": is_eligible,
+                "eligibilityMask": eligibility
             }
 
             print(f"✅ Successfully processed Opportunity {opportunity_number}")
@@ -418,7 +389,7 @@ class EuropeanYouthPortalScraper:
             return None
 
     def save_to_json(self, filename="european_youth_portal_bulgaria_eligible.json"):
-        """Save data to JSON file in data folder"""
+        """Save data to JSON file in data folder (any supported country is eligible; see bulgariaEligible)"""
         try:
             # Create data folder if it doesn't exist
             os.makedirs(self.data_folder, exist_ok=True)
@@ -431,7 +402,7 @@ class EuropeanYouthPortalScraper:
                 json.dump(self.all_opportunities, f, indent=2, ensure_ascii=False)
 
             print(f"💾 Data saved to: {file_path}")
-            print(f"📊 Total Bulgaria-eligible opportunities saved: {len(self.all_opportunities)}")
+            print(f"📊 Total eligible opportunities saved: {len(self.all_opportunities)}")
 
         except Exception as e:
             print(f"❌ Error saving to JSON: {e}")
@@ -477,13 +448,13 @@ class EuropeanYouthPortalScraper:
                 # Add delay between requests
                 time.sleep(1.5)
 
-            # Save only Bulgaria-eligible data
+            # Save only eligible data
             self.save_to_json()
 
             print(f"\n{'='*50}")
             print(f"🎉 SCRAPING COMPLETED!")
             print(f"📊 Total opportunities processed: {len(opportunity_urls)}")
-            print(f"🇧🇬 Bulgaria-eligible opportunities found: {successful_opportunities}")
+            print(f"🌍 Eligible opportunities found: {successful_opportunities}")
             print(f"💾 Data saved to: {os.path.join(self.data_folder, 'european_youth_portal_bulgaria_eligible.json')}")
             print(f"{'='*50}")
 
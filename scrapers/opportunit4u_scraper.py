@@ -16,6 +16,32 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)  # Go up one level from scrapers/
 config_dir = os.path.join(project_root, "config")
 data_dir = os.path.join(project_root, "data")
+sys.path.append(project_root)
+
+from classifier import BatchClassifier, TYPE_KEYWORDS, MODE_KEYWORDS
+from eligibility import ALL_SUPPORTED, BULGARIA, EligibilityMatcher
+from identity import record_id
+
+# Posts addressed to a role rather than a nationality are open to every country
+ROLE_TERMS = {
+    term: ALL_SUPPORTED for term in
+    ['youth workers', 'trainers', 'youth leaders', 'youth project managers', 'volunteering mentors']
+}
+
+# This site's own tables, as its posts have always been classified: no
+# volunteering type (untyped posts are 'event'), no 'meeting' keyword (a missing
+# comma used to glue it to 'volunteering') and 'remote' is not a mode keyword;
+# keywords match as substrings (see BatchClassifier's substrings mode)
+OPPORTUNIT4U_TYPE_KEYWORDS = {
+    'competition': TYPE_KEYWORDS['competition'],
+    'exchange': TYPE_KEYWORDS['exchange'],
+    'event': ['event', 'conference', 'summit', 'workshop', 'seminar', 'forum'],
+    'scholarship': TYPE_KEYWORDS['scholarship'],
+    'erasmus': TYPE_KEYWORDS['erasmus'],
+}
+OPPORTUNIT4U_MODE_KEYWORDS = {
+    label: [term for term in keywords if term != 'remote'] for label, keywords in MODE_KEYWORDS.items()
+}
 
 class Opportunit4uScraper:
     def __init__(self, max_load_more):
@@ -23,6 +49,8 @@ class Opportunit4uScraper:
         self.max_load_more = max_load_more
         self.all_opportunities = []
         self.bulgaria_eligible_count = 0
+        self.eligible_count = 0
+        self.eligibility_matcher = EligibilityMatcher(extra_rules=ROLE_TERMS)
         
         # Set paths based on project structure
         self.project_root = project_root
@@ -33,6 +61,11 @@ class Opportunit4uScraper:
         self.categories_path = os.path.join(self.config_dir, "category_keywords.json")
         self.countries_path = os.path.join(self.config_dir, "country.json")
         self.cities_path = os.path.join(self.config_dir, "world_cities.json")
+        
+        # Shared keyword classifier (type, mode of work, categories) with this site's tables
+        self.classifier = BatchClassifier(type_keywords=OPPORTUNIT4U_TYPE_KEYWORDS,
+                                          mode_keywords=OPPORTUNIT4U_MODE_KEYWORDS,
+                                          default_type='event', substrings=True)
 
     def setup_driver(self):
         """Initialize undetected-chrome driver with dynamic screen dimensions and enforced zoom."""
@@ -173,39 +206,22 @@ class Opportunit4uScraper:
                 continue
         return None
     
-    def check_bulgaria_eligible(self, description):
-        """Check if Bulgaria is eligible for the opportunity"""
+    def check_eligibility(self, description):
+        """Eligibility bitmask over eligibility.SUPPORTED_COUNTRIES from the eligibility section"""
         try:
             if not description:
-                return False
+                return 0
                 
-            description_lower = description.lower()
-            eligibility_index = description_lower.find('eligibility')
+            eligibility_index = description.lower().find('eligibility')
             if eligibility_index == -1:
-                return False
+                return 0
                 
-            eligibility_section = description_lower[eligibility_index:eligibility_index + 2000]
-            
-            if 'bulgaria' in eligibility_section:
-                return True
-            
-            inclusive_terms = [
-                'all countries', 'all nationalities', 'worldwide', 'global',
-                'europe', 'european', 'eu countries', 'european union',
-                'any country', 'any nationality', 'all nationalities',
-                'erasmus', 'erasmus+', 'erasmus plus', 'youth programme countries',
-                'youth workers', 'trainers', 'youth leaders', 'youth project managers', 'volunteering mentors',
-            ]
-            
-            for term in inclusive_terms:
-                if term in eligibility_section:
-                    return True
-                    
-            return False
+            eligibility_section = description[eligibility_index:eligibility_index + 2000]
+            return self.eligibility_matcher.mask(eligibility_section)
             
         except Exception as e:
-            # print(f"⚠️ Error checking Bulgaria eligibility: {e}")
-            return False
+            # print(f"⚠️ Error checking eligibility: {e}")
+            return 0
     
     def extract_location_from_title(self, post_title):
         """Extract city and country from post title"""
@@ -245,60 +261,15 @@ class Opportunit4uScraper:
     
     def extract_opportunity_type(self, post_title, description):
         """Extract type of opportunity"""
-        text = f"{post_title.lower()} {description.lower() if description else ''}"
-        
-        type_keywords = {
-            'competition': ['competition', 'contest', 'prize', 'award', 'challenge', 'tournament'],
-            'exchange': ['exchange', 'cultural exchange', 'youth exchange', 'student exchange'],
-            'event': ['event', 'conference', 'summit', 'workshop', 'seminar', 'forum', 'meeting' 'volunteering'],
-            'scholarship': ['scholarship', 'grant', 'funding', 'financial aid', 'stipend'],
-            'erasmus': ['erasmus', 'erasmus+', 'erasmus plus']
-        }
-        
-        for opp_type, keywords in type_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return opp_type
-        
-        return 'event'
+        return self.classifier.classify_one(post_title, description)["type"]
     
     def extract_mode_of_work(self, description):
         """Extract mode of work"""
-        if not description:
-            return 'on-site'
-        
-        text = description.lower()
-        
-        remote_terms = ['virtual', 'digital', 'zoom', 'webinar', 'from home']
-        onsite_terms = ['on-site', 'onsite', 'in-person', 'physical', 'venue', 'location', 'face-to-face']
-        hybrid_terms = ['hybrid', 'both online and in-person', 'online and onsite', 'partially remote']
-        
-        if any(term in text for term in hybrid_terms):
-            return 'hybrid'
-        elif any(term in text for term in remote_terms):
-            return 'remote'
-        elif any(term in text for term in onsite_terms):
-            return 'on-site'
-        
-        return 'on-site'
+        return self.classifier.classify_one(None, description)["modeOfWork"]
     
     def extract_categories(self, post_title, description):
         """Extract categories from title and description"""
-        try:
-            with open(self.categories_path, 'r', encoding='utf-8') as f:
-                category_data = json.load(f)
-            
-            text = f"{post_title.lower()} {description.lower() if description else ''}"
-            matched_categories = []
-            
-            for category, keywords in category_data.items():
-                if any(keyword in text for keyword in keywords):
-                    matched_categories.append(category)
-            
-            return matched_categories
-            
-        except Exception as e:
-            print(f"Error extracting categories: {e}")
-            return []
+        return self.classifier.classify_one(post_title, description)["categories"]
         
     def extract_banner_image(self):
         """Extract banner image URL from the specified section"""
@@ -335,24 +306,26 @@ class Opportunit4uScraper:
             deadline = self.get_deadline_date()
             description = self.extract_description()
             
-            # Check Bulgaria eligibility - THIS IS THE KEY CHECK
-            is_eligible = self.check_bulgaria_eligible(description)
+            # Check eligibility - THIS IS THE KEY CHECK
+            eligibility = self.check_eligibility(description)
+            is_eligible = bool(eligibility & BULGARIA)
             
-            # ONLY PROCEED IF BULGARIA IS ELIGIBLE
-            if not is_eligible:
-                # print("🚫 Skipping - Bulgaria not eligible")
+            # ONLY PROCEED IF A SUPPORTED COUNTRY IS ELIGIBLE
+            if not eligibility:
+                # print("🚫 Skipping - no supported country eligible")
                 return None
             
-            # Extract location (only if Bulgaria is eligible)
+            # Extract location (only if eligible)
             city, country = self.extract_location_from_title(post_title)
             
-            # Extract additional fields (only if Bulgaria is eligible)
+            # Extract additional fields (only if eligible)
             opportunity_type = self.extract_opportunity_type(post_title, description)
             mode_of_work = self.extract_mode_of_work(description)
             categories = self.extract_categories(post_title, description)
             banner_image = self.extract_banner_image()
 
             opportunity_data = {
+                "id": record_id("opportunit4u", post_url, post_title, description),
                 "postNo": post_number,
                 "title": post_title,
                 "city": city,
@@ -364,10 +337,14 @@ class Opportunit4uScraper:
                 "categories": categories,
                 "applicationUrl": application_url,
                 "bannerImage": banner_image ,
+                "bulgariaEligible": is_eligible,
+                "eligibilityMask": eligibility,
             }
             
-            self.bulgaria_eligible_count += 1
-            print(f"✅ Saved Post {post_number} (Bulgaria Eligible)")
+            self.eligible_count += 1
+            if is_eligible:
+                self.bulgaria_eligible_count += 1
+            print(f"✅ Saved Post {post_number} (Eligible, Bulgaria: {is_eligible})")
             return opportunity_data
             
         except Exception as e:
@@ -375,7 +352,7 @@ class Opportunit4uScraper:
             return None
     
     def save_to_json(self, filename="opportunit4u_data.json"):
-        """Save only Bulgaria-eligible data to JSON file"""
+        """Save only eligible data to JSON file"""
         try:
             # Create data folder if it doesn't exist
             os.makedirs(self.data_folder, exist_ok=True)
@@ -386,7 +363,7 @@ class Opportunit4uScraper:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(self.all_opportunities, f, indent=2, ensure_ascii=False)
             print(f"💾 Data saved to {file_path}")
-            print(f"📊 Total Bulgaria-eligible opportunities: {len(self.all_opportunities)}")
+            print(f"📊 Total eligible opportunities: {len(self.all_opportunities)}")
         except Exception as e:
             print(f"❌ Error saving to JSON: {e}")
     
@@ -416,12 +393,13 @@ class Opportunit4uScraper:
                 # Add delay between posts to be respectful
                 time.sleep(2)
             
-            # Save only Bulgaria-eligible data
+            # Save only eligible data
             self.save_to_json()
             
             print(f"\n{'='*50}")
             print(f"🎉 SCRAPING COMPLETED!")
             print(f"📊 Total posts processed: {total_posts}")
+            print(f"🌍 Eligible opportunities found: {self.eligible_count}")
             print(f"🇧🇬 Bulgaria-eligible opportunities found: {self.bulgaria_eligible_count}")
             print(f"💾 Saved to: {os.path.join(self.data_folder, 'opportunit4u_data.json')}")
             print(f"{'='*50}")
@@ -11,8 +11,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from datetime import datetime
-import openai
-from openai import OpenAI
 
 # ---------------------------
 # Project paths
@@ -24,41 +22,120 @@ DATA_DIR = BASE_DIR / "data"
 # Add config directory to path
 sys.path.append(str(CONFIG_DIR))
 
-# Import API key from config/config.py
-try:
-    from config import OPENAI_API_KEY
-except ImportError as e:
-    print("❌ Could not import OPENAI_API_KEY from config/config.py")
-    print(f"Error: {e}")
-    OPENAI_API_KEY = None
+# Add project root to path to import shared modules
+sys.path.append(str(BASE_DIR))
+
+from eligibility import BULGARIA, eligibility_mask
+from tiered_extractor import EXTRACTION_FIELDS, TieredExtractor, compress_description, estimate_tokens
+from llm_cache import ExtractionCache, fingerprint, parse_json_reply
+from batch_extraction import BatchExtractor
+from llm_gateway import get_gateway
+from telemetry import get_telemetry
+from boilerplate import BoilerplateDetector
+from identity import record_id
+
+TYPE_CHOICES = [
+    "competition", "exchange", "event", "scholarship", "erasmus", "volunteering",
+    "training", "internship", "fellowship", "conference", "workshop"
+]
+MODE_CHOICES = ["remote", "on-site", "hybrid"]
+
+CATEGORIES_LIST = [
+    "Programming", "Business and Entrepreneurship", "Marketing, Advertising, PR", 
+    "Journalism", "Trade and Sales", "Psychology", "Cinema and Theater", 
+    "Finance and Banking", "Design", "Music and Arts", "Social Causes", 
+    "Medicine and Pharmacy", "Ecology", "Languages", "Career Guidance", 
+    "Science", "Politics", "Architecture and Civil Engineering", 
+    "Accelerator programs", "Health", "Environment"
+]
+
+# One short hint per extracted field; allowed values and formats travel in the
+# JSON schema below, not in the prompt text. The LLM is only asked for the
+# fields the local rules could not settle
+FIELD_INSTRUCTIONS = {
+    "typeOfOpportunity": "typeOfOpportunity: kind of opportunity",
+    "modeOfWork": "modeOfWork: remote, on-site or hybrid",
+    "categories": "categories: up to 3 that best match its focus",
+    "city": "city: where it takes place (host city; university/organisation city for scholarships and remote work)",
+    "country": "country: country of that city",
+    "validUntil": "validUntil: application deadline",
+    "bulgariaEligible": ("bulgariaEligible: true if Bulgaria, all countries, worldwide, European or international "
+                         "applicants may apply; false if only other countries are listed"),
+}
+
+FIELD_SCHEMAS = {
+    "typeOfOpportunity": {"type": "string", "enum": TYPE_CHOICES},
+    "modeOfWork": {"type": "string", "enum": MODE_CHOICES},
+    "categories": {"type": "array", "items": {"type": "string", "enum": CATEGORIES_LIST}, "maxItems": 3},
+    "city": {"type": ["string", "null"]},
+    "country": {"type": ["string", "null"]},
+    "validUntil": {"type": ["string", "null"], "pattern": r"^\d{4}-\d{2}-\d{2}$",
+                   "description": "YYYY-MM-DD"},
+    "bulgariaEligible": {"type": "boolean"},
+}
+
+# Structured output: one object per post, or {"results": [...]} for a batch.
+# Not strict, since each prompt asks for a different subset of the fields
+EXTRACTION_FORMAT = {"type": "json_schema", "json_schema": {
+    "name": "extraction",
+    "strict": False,
+    "schema": {"type": "object", "properties": FIELD_SCHEMAS, "additionalProperties": False},
+}}
+BATCH_EXTRACTION_FORMAT = {"type": "json_schema", "json_schema": {
+    "name": "extraction_batch",
+    "strict": False,
+    "schema": {
+        "type": "object",
+        "properties": {"results": {"type": "array", "items": {
+            "type": "object",
+            "properties": dict(FIELD_SCHEMAS, id={"type": "string"}),
+            "required": ["id"],
+            "additionalProperties": False,
+        }}},
+        "required": ["results"],
+        "additionalProperties": False,
+    },
+}}
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+REPAIR_PROMPT = """Your previous reply could not be parsed as JSON. Return it as valid JSON matching the schema, keeping every value. Reply:
+{reply}"""
+MAX_REPAIR_TOKENS = 3500
+
+# json_schema response formats need gpt-4o-mini or newer
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You extract structured data from opportunity posts into JSON."
+
+# Bump PROMPT_REVISION for wording changes outside FIELD_INSTRUCTIONS; any change
+# here, in the instructions or in the schema invalidates the extraction cache
+PROMPT_REVISION = 3
+PROMPT_VERSION = fingerprint(PROMPT_REVISION, SYSTEM_PROMPT, FIELD_INSTRUCTIONS, FIELD_SCHEMAS)
 
 class SmokinyaScraper:
-    def __init__(self):
+    def __init__(self, batch_mode=True, health_check=False, cache=None):
         self.driver = None
+        self.batch_mode = batch_mode
         self.all_opportunities = []
         self.data_folder = DATA_DIR   # always points to /data
-        self.client = self.setup_openai_client()
+        # shared OpenAI access; the client is created on the first extraction
+        self.gateway = get_gateway()
+        if health_check:
+            self.gateway.health_check()
+        # Cached LLM answers for posts whose text has not changed
+        self.cache = cache if cache is not None else ExtractionCache(model=MODEL, prompt_version=PROMPT_VERSION)
+        # Local rules first; only low-confidence fields go to OpenAI
+        self.extractor = TieredExtractor(self.build_extraction_prompt, self.complete_extraction,
+                                         allowed_categories=CATEGORIES_LIST, cache=self.cache)
+        # Several posts per request with one shared instruction header
+        self.batch_extractor = BatchExtractor(self.build_batch_extraction_prompt, self.complete_raw,
+                                              self.validate_extraction, repair=self.repair_reply)
+        # Footers and share prompts repeated across posts never reach OpenAI
+        self.boilerplate = BoilerplateDetector()
+        # Estimated prompt tokens with raw vs compressed descriptions
+        self.uncompressed_tokens = {}
+        self.prompt_stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0, "repairs": 0}
         
-    def setup_openai_client(self):
-        """Setup OpenAI client with API key"""
-        if not OPENAI_API_KEY:
-            print("❌ OPENAI_API_KEY not found in config.py")
-            return None
-        
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            # Test the connection
-            test_response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Say 'OK'"}],
-                max_tokens=5
-            )
-            print("✅ OpenAI client configured successfully")
-            return client
-        except Exception as e:
-            print(f"❌ Failed to setup OpenAI client: {e}")
-            return None
-    
     def setup_driver(self):
         """Initialize undetected-chrome driver with dynamic screen dimensions and enforced zoom."""
         try:
@@ -145,81 +222,122 @@ class SmokinyaScraper:
             print(f"⚠️ Could not extract banner image: {e}")
             return "No image found"
     
-    def extract_opportunity_data_with_openai(self, description, title):
-        """Use OpenAI to extract structured data from opportunity description"""
-        if not self.client:
-            print("❌ OpenAI client not available")
-            return None
-            
-        try:
-            categories_list = [
-                "Programming", "Business and Entrepreneurship", "Marketing, Advertising, PR", 
-                "Journalism", "Trade and Sales", "Psychology", "Cinema and Theater", 
-                "Finance and Banking", "Design", "Music and Arts", "Social Causes", 
-                "Medicine and Pharmacy", "Ecology", "Languages", "Career Guidance", 
-                "Science", "Politics", "Architecture and Civil Engineering", 
-                "Accelerator programs", "Health", "Environment"
-            ]
-            
-            prompt = f"""
-            Analyze this opportunity and extract structured data as JSON:
-            
-            TITLE: {title}
-            DESCRIPTION: {description}
-            
-            EXTRACT THESE FIELDS:
-            
-            1. typeOfOpportunity: Choose from: competition, exchange, event, scholarship, erasmus, volunteering, training, internship, fellowship, conference, workshop
-            
-            2. modeOfWork: Choose from: remote, on-site, hybrid
-            
-            3. categories: Select from this EXACT list (choose maximum 3 most relevant):
-            {json.dumps(categories_list, indent=2)}
-            - ONLY use these exact category names
-            - Choose categories that best match the opportunity's focus
-            
-            4. city: The city where the opportunity physically takes place
-            - Look for: "hosted in [city]", "venue: [city]", "based in [city]", "location: [city]"
-            - For scholarships: the university/organization's city
-            - For events: the host city
-            - For remote: the organization's headquarters city
-            
-            5. country: The country where the opportunity is located
-            - Same logic as city but for country level
-            
-            6. validUntil: Application deadline in YYYY-MM-DD format
-            - Look for: "deadline", "apply by", "application until", "closing date"
-            
-            7. bulgariaEligible: true/false
-            - true if: mentions Bulgaria specifically, says "all countries", "worldwide", "European", "international"
-            - false if: lists specific countries excluding Bulgaria
-            
-            Return ONLY valid JSON, no other text.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You extract structured data from opportunities. Return only JSON. For categories, strictly use only the provided list names."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=1800,
-                timeout=30
+    def _track_prompt(self, prompt, uncompressed_prompt):
+        """Remember how big a prompt would have been with the raw descriptions"""
+        self.uncompressed_tokens[prompt] = estimate_tokens(uncompressed_prompt)
+        return prompt
+    
+    def build_extraction_prompt(self, title, description, fields=EXTRACTION_FIELDS):
+        """Compact extraction prompt asking only for the given fields"""
+        def render(text):
+            hints = "\n".join(f"- {FIELD_INSTRUCTIONS[field]}" for field in fields)
+            return f"FIELDS: {', '.join(fields)}\n{hints}\nTITLE: {title}\nTEXT: {text}"
+        return self._track_prompt(render(compress_description(description)), render(description))
+    
+    def build_batch_extraction_prompt(self, items):
+        """One shared hint header, then every post with the fields it still needs"""
+        needed = [f for f in EXTRACTION_FIELDS if any(f in item["fields"] for item in items)]
+        hints = "\n".join(f"- {FIELD_INSTRUCTIONS[field]}" for field in needed)
+        
+        def render(compress):
+            posts = "\n".join(
+                f"### id: {item['id']}\nFIELDS: {', '.join(item['fields'])}\nTITLE: {item['title']}\n"
+                f"TEXT: {compress_description(item['description']) if compress else item['description']}"
+                for item in items
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            extracted_data = json.loads(result_text)
-            
-            print("✅ OpenAI extraction successful")
-            return extracted_data
-            
-        except Exception as e:
-            print(f"❌ OpenAI extraction error: {e}")
+            return (f"For each post return an object with its id and exactly its FIELDS, "
+                    f"as {{\"results\": [...]}}.\n{hints}\n{posts}")
+        return self._track_prompt(render(True), render(False))
+    
+    def complete_raw(self, prompt, max_tokens=1800, response_format=BATCH_EXTRACTION_FORMAT, stage="extraction"):
+        """Send a prompt to OpenAI; returns (reply text, finish_reason) or None on API error"""
+        sent_tokens = estimate_tokens(prompt)
+        self.prompt_stats["calls"] += 1
+        self.prompt_stats["tokens_before"] += self.uncompressed_tokens.get(prompt, sent_tokens)
+        self.prompt_stats["tokens_after"] += sent_tokens
+        # prompts built only to size a batch are never sent
+        self.uncompressed_tokens.clear()
+        
+        response = self.gateway.complete(
+            label=stage,
+            stage=stage,
+            source="smokinya",
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            response_format=response_format,
+            temperature=0.1,
+            max_tokens=max_tokens,
+            timeout=30
+        )
+        if response is None:
             return None
+        choice = response.choices[0]
+        return (choice.message.content or "").strip(), choice.finish_reason
     
-    def scrape_single_post(self, post_url, post_number):
-        """Scrape data from a single post URL"""
+    def repair_reply(self, broken, response_format=BATCH_EXTRACTION_FORMAT):
+        """Ask the model once to turn its unparseable reply into valid JSON"""
+        self.prompt_stats["repairs"] += 1
+        print("🔧 Reply was not valid JSON, asking for a repaired copy")
+        max_tokens = min(MAX_REPAIR_TOKENS, 2 * estimate_tokens(broken) + 50)
+        return self.complete_raw(REPAIR_PROMPT.format(reply=broken), max_tokens=max_tokens,
+                                 response_format=response_format, stage="extraction_repair")
+    
+    def complete_extraction(self, prompt):
+        """Send an extraction prompt to OpenAI and parse the JSON reply (repairing it once if needed)"""
+        reply = self.complete_raw(prompt, response_format=EXTRACTION_FORMAT)
+        if reply is None:
+            return None
+        
+        extracted_data = parse_json_reply(reply[0])
+        if not isinstance(extracted_data, dict):
+            repaired = self.repair_reply(reply[0], EXTRACTION_FORMAT)
+            extracted_data = parse_json_reply(repaired[0]) if repaired else None
+        if not isinstance(extracted_data, dict):
+            print("❌ OpenAI extraction error: reply is not a JSON object")
+            return None
+        print("✅ OpenAI extraction successful")
+        return extracted_data
+    
+    def print_prompt_report(self):
+        s = self.prompt_stats
+        saved = s["tokens_before"] - s["tokens_after"]
+        print("\n✂️ PROMPT COMPRESSION")
+        print(f"   Extraction calls: {s['calls']} (repair requests: {s['repairs']})")
+        if s["calls"]:
+            print(f"   Prompt tokens per call (est.): {s['tokens_before'] // s['calls']} before, "
+                  f"{s['tokens_after'] // s['calls']} after compression")
+        print(f"   Prompt tokens saved (est.): {saved}")
+    
+    def validate_extraction(self, answer, fields):
+        """Check one extracted element; returns the cleaned fields or None"""
+        cleaned = {}
+        for field in fields:
+            if field not in answer:
+                return None
+            value = answer[field]
+            if field == "typeOfOpportunity" and value not in TYPE_CHOICES:
+                return None
+            if field == "modeOfWork" and value not in MODE_CHOICES:
+                return None
+            if field == "categories":
+                if not isinstance(value, list):
+                    return None
+                value = [c for c in value if c in CATEGORIES_LIST][:3]
+            if field in ("city", "country", "validUntil") and value is not None and not isinstance(value, str):
+                return None
+            if field == "validUntil" and value is not None and not DATE_RE.match(value):
+                # a deadline the model could not put in YYYY-MM-DD is as good as none
+                value = None
+            if field == "bulgariaEligible" and not isinstance(value, bool):
+                return None
+            cleaned[field] = value
+        return cleaned
+    
+    def collect_post(self, post_url, post_number):
+        """Open a post and read the raw fields (no extraction yet)"""
         try:
             print(f"\n{'='*50}")
             print(f"📝 Processing Post {post_number}")
@@ -241,60 +359,94 @@ class SmokinyaScraper:
             print(f"🔗 Application URL: {application_url}")
             print(f"📄 Description length: {len(description) if description else 0}")
             
-            # Use OpenAI to extract structured data
-            extracted_data = self.extract_opportunity_data_with_openai(description, title)
-            
-            if not extracted_data:
-                print("❌ Failed to extract data with OpenAI")
-                return None
-            
-            print(f"📍 Location: {extracted_data.get('city')}, {extracted_data.get('country')}")
-            print(f"🎯 Type: {extracted_data.get('typeOfOpportunity')}")
-            print(f"💼 Mode: {extracted_data.get('modeOfWork')}")
-            print(f"📂 Categories: {extracted_data.get('categories', [])}")
-            print(f"📅 Deadline: {extracted_data.get('validUntil')}")
-            print(f"🇧🇬 Bulgaria Eligible: {extracted_data.get('bulgariaEligible')}")
-
-            
-            # Only save if Bulgaria is eligible
-            if not extracted_data.get('bulgariaEligible'):
-                print("🚫 Skipping - Bulgaria not eligible")
-                return None
-            
-            # Create opportunity data
-            opportunity_data = {
+            return {
+                "id": record_id("smokinya", post_url, title, description),
                 "postNo": post_number,
                 "title": title,
-                "city": extracted_data.get("city"),
-                "country": extracted_data.get("country"),
                 "description": description,
-                "validUntil": extracted_data.get("validUntil"),
-                "type": extracted_data.get("typeOfOpportunity"),
-                "modeOfWork": extracted_data.get("modeOfWork"),
-                "categories": extracted_data.get("categories", []),
                 "applicationUrl": application_url,
-                # "postUrl": post_url,
                 "bannerImage": banner_image,
-                "bulgariaEligible": extracted_data.get("bulgariaEligible", False)
             }
             
-            print(f"✅ Successfully processed Post {post_number}")
-            return opportunity_data
-            
+        except Exception as e:
+            print(f"❌ Error processing Post {post_number}: {e}")
+            return None
+    
+    def build_opportunity(self, post, extracted_data):
+        """Combine raw post fields with extracted data; None if no supported country is eligible"""
+        post_number = post["postNo"]
+        description = post["description"]
+        
+        llm_fields = [f for f, source in extracted_data["fieldSources"].items() if source == "llm"]
+        print(f"\n🧠 Post {post_number} - fields from OpenAI: {llm_fields or 'none'}")
+        print(f"📍 Location: {extracted_data.get('city')}, {extracted_data.get('country')}")
+        print(f"🎯 Type: {extracted_data.get('typeOfOpportunity')}")
+        print(f"💼 Mode: {extracted_data.get('modeOfWork')}")
+        print(f"📂 Categories: {extracted_data.get('categories', [])}")
+        print(f"📅 Deadline: {extracted_data.get('validUntil')}")
+        print(f"🇧🇬 Bulgaria Eligible: {extracted_data.get('bulgariaEligible')}")
+        
+        # Countries named in the post; the model's answer on Bulgaria wins over free-text group hits
+        eligibility = eligibility_mask(description, section=False)
+        if extracted_data.get('bulgariaEligible'):
+            eligibility |= BULGARIA
+        elif extracted_data.get('bulgariaEligible') is False and extracted_data["fieldSources"].get("bulgariaEligible") == "llm":
+            eligibility &= ~BULGARIA
+        
+        # Only save if a supported country is eligible
+        if not eligibility:
+            print("🚫 Skipping - no supported country eligible")
+            return None
+        
+        # Create opportunity data
+        opportunity_data = {
+            "id": post["id"],
+            "postNo": post_number,
+            "title": post["title"],
+            "city": extracted_data.get("city"),
+            "country": extracted_data.get("country"),
+            "description": description,
+            "validUntil": extracted_data.get("validUntil"),
+            "type": extracted_data.get("typeOfOpportunity"),
+            "modeOfWork": extracted_data.get("modeOfWork"),
+            "categories": extracted_data.get("categories", []),
+            "applicationUrl": post["applicationUrl"],
+            # "postUrl": post_url,
+            "bannerImage": post["bannerImage"],
+            "bulgariaEligible": bool(eligibility & BULGARIA),
+            "eligibilityMask": eligibility
+        }
+        
+        print(f"✅ Successfully processed Post {post_number}")
+        return opportunity_data
+    
+    def scrape_single_post(self, post_url, post_number):
+        """Scrape data from a single post URL"""
+        post = self.collect_post(post_url, post_number)
+        if not post:
+            return None
+        
+        try:
+            # posts seen so far are the corpus for boilerplate detection
+            self.boilerplate.learn("smokinya", [post["description"]])
+            description = self.boilerplate.strip("smokinya", post["description"])
+            # Local heuristics first, OpenAI only for uncertain fields
+            extracted_data = self.extractor.extract(post["title"], description)
+            return self.build_opportunity(post, extracted_data)
         except Exception as e:
             print(f"❌ Error processing Post {post_number}: {e}")
             return None
     
     def save_to_json(self, filename="smokinya_bulgaria_eligible.json"):
-        """Save Bulgaria-eligible data to JSON file in /data"""
+        """Save eligible posts (any supported country; see bulgariaEligible) to JSON file in /data"""
         try:
             self.data_folder.mkdir(parents=True, exist_ok=True)
             file_path = self.data_folder / filename
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(self.all_opportunities, f, indent=2, ensure_ascii=False)
 
-            print(f"💾 Bulgaria-eligible data saved to: {file_path}")
-            print(f"📊 Total Bulgaria-eligible opportunities saved: {len(self.all_opportunities)}")
+            print(f"💾 Data saved to: {file_path}")
+            print(f"📊 Total eligible opportunities saved: {len(self.all_opportunities)}")
 
         except Exception as e:
             print(f"❌ Error saving to JSON: {e}")
@@ -325,28 +477,63 @@ class SmokinyaScraper:
             
             # Process each post
             successful_posts = 0
-            for i, post_link in enumerate(post_links, 1):
-                opportunity_data = self.scrape_single_post(post_link, i)
-                if opportunity_data:
-                    self.all_opportunities.append(opportunity_data)
-                    successful_posts += 1
+            if self.batch_mode:
+                # Read every post first, then extract with a few batched LLM requests
+                posts = []
+                for i, post_link in enumerate(post_links, 1):
+                    post = self.collect_post(post_link, i)
+                    if post:
+                        posts.append(post)
+                    time.sleep(2)
                 
-                # Add delay between requests
-                time.sleep(2)
-            
-            # Save only Bulgaria-eligible data
+                # Learn boilerplate across all posts, strip it before extraction;
+                # the saved opportunities keep the full description
+                self.boilerplate.learn("smokinya", [post["description"] for post in posts])
+                extracted = self.extractor.extract_many(
+                    [(post["postNo"], post["title"], self.boilerplate.strip("smokinya", post["description"]))
+                     for post in posts],
+                    self.batch_extractor
+                )
+                for post, extracted_data in zip(posts, extracted):
+                    opportunity_data = self.build_opportunity(post, extracted_data)
+                    if opportunity_data:
+                        self.all_opportunities.append(opportunity_data)
+                        successful_posts += 1
+            else:
+                for i, post_link in enumerate(post_links, 1):
+                    opportunity_data = self.scrape_single_post(post_link, i)
+                    if opportunity_data:
+                        self.all_opportunities.append(opportunity_data)
+                        successful_posts += 1
+                    
+                    # Add delay between requests
+                    time.sleep(2)
+            
+            # Save only eligible data
             self.save_to_json()
             
             print(f"\n{'='*50}")
             print(f"🎉 SCRAPING COMPLETED!")
             print(f"📊 Total posts processed: {len(post_links)}")
-            print(f"🇧🇬 Bulgaria-eligible opportunities found: {successful_posts}")
+            print(f"🌍 Eligible opportunities found: {successful_posts}")
+            self.extractor.print_report()
+            if self.batch_mode:
+                self.batch_extractor.print_report()
+            self.print_prompt_report()
+            self.boilerplate.print_report()
+            self.cache.print_stats()
+            telemetry = get_telemetry()
+            telemetry.record_records("extraction", len(post_links), source="smokinya")
+            telemetry.record_cache_hits("extraction", self.cache.hits, source="smokinya")
+            telemetry.print_report()
+            print(f"⏱️ Telemetry report: {telemetry.write_report('smokinya')}")
             print(f"💾 Data saved to: {os.path.join(self.data_folder, 'smokinya_bulgaria_eligible.json')}")
             print(f"{'='*50}")
             
         except Exception as e:
             print(f"❌ Error in main execution: {e}")
         finally:
+            self.cache.close()
             if self.driver:
                 self.driver.quit()
                 print("🔚 Driver closed")
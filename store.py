@@ -0,0 +1,238 @@
+import argparse
+import json
+import sqlite3
+import time
+from datetime import date
+from pathlib import Path
+
+from eligibility import mask_for
+from merge_manifest import record_hash
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+STORE_FILE = DATA_DIR / "opportunities.sqlite"
+
+# Rows per executemany() call inside the single upsert transaction
+BATCH_SIZE = 500
+
+# Record fields copied into indexed columns
+COLUMNS = {
+    "source": "source",
+    "country": "country",
+    "city": "city",
+    "type": "type",
+    "mode_of_work": "modeOfWork",
+    "valid_until": "validUntil",
+    "eligibility_mask": "eligibilityMask",
+}
+
+
+def _column_values(entry):
+    values = [entry.get(field) for field in COLUMNS.values()]
+    values[-1] = values[-1] or 0  # records without a mask are open to no supported country
+    return values
+
+
+def _batches(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class OpportunityStore:
+    """
+    Merged opportunities in an embedded SQLite database (data/opportunities.sqlite).
+
+    One row per record id with the fields used for filtering (source, country,
+    city, type, modeOfWork, validUntil, eligibility mask) in indexed columns, the
+    full record as JSON and its content hash; categories live in a join table.
+    sync() writes a whole merge in one transaction and only touches rows whose
+    content changed; the JSON export is generated from the store.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS opportunities (
+                id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                source TEXT,
+                country TEXT,
+                city TEXT,
+                type TEXT,
+                mode_of_work TEXT,
+                valid_until TEXT,
+                eligibility_mask INTEGER NOT NULL DEFAULT 0,
+                content_hash TEXT NOT NULL,
+                record TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_opportunities_source ON opportunities(source);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_country ON opportunities(country COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_city ON opportunities(city COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_type ON opportunities(type);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_mode ON opportunities(mode_of_work);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_valid_until ON opportunities(valid_until);
+            CREATE INDEX IF NOT EXISTS idx_opportunities_position ON opportunities(position);
+            CREATE TABLE IF NOT EXISTS opportunity_categories (
+                category TEXT NOT NULL,
+                opportunity_id TEXT NOT NULL REFERENCES opportunities(id) ON DELETE CASCADE,
+                PRIMARY KEY (category, opportunity_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_categories_opportunity ON opportunity_categories(opportunity_id);
+        """)
+        self.conn.commit()
+
+    def sync(self, entries):
+        """
+        Make the store hold exactly these records, in this order: new ids are
+        inserted, changed records updated, records no longer present deleted.
+        Everything happens in one transaction; returns the counts.
+        """
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        existing = {record_id: (content_hash, position) for record_id, content_hash, position
+                    in self.conn.execute("SELECT id, content_hash, position FROM opportunities")}
+        now = time.time()
+
+        upserts, moves, categories = [], [], []
+        for position, entry in enumerate(entries):
+            content_hash = record_hash(entry)
+            previous, previous_position = existing.pop(entry["id"], (None, None))
+            if previous == content_hash:
+                stats["unchanged"] += 1
+                if previous_position != position:
+                    moves.append((position, entry["id"]))
+                continue
+            stats["inserted" if previous is None else "updated"] += 1
+            upserts.append((entry["id"], position, *_column_values(entry),
+                            content_hash, json.dumps(entry, ensure_ascii=False), now))
+            categories.extend((category, entry["id"]) for category in dict.fromkeys(entry.get("categories") or []))
+
+        stale = [(record_id,) for record_id in existing]
+        stats["deleted"] = len(stale)
+        columns = ", ".join(COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS)
+
+        with self.conn:
+            for batch in _batches(stale):
+                self.conn.executemany("DELETE FROM opportunities WHERE id = ?", batch)
+            for batch in _batches(upserts):
+                self.conn.executemany(
+                    f"INSERT INTO opportunities (id, position, {columns}, content_hash, record, updated_at) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in COLUMNS)}, ?, ?, ?) "
+                    f"ON CONFLICT(id) DO UPDATE SET position = excluded.position, {updates}, "
+                    "content_hash = excluded.content_hash, record = excluded.record, updated_at = excluded.updated_at",
+                    batch
+                )
+                self.conn.executemany("DELETE FROM opportunity_categories WHERE opportunity_id = ?",
+                                      [(row[0],) for row in batch])
+            for batch in _batches(categories):
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO opportunity_categories (category, opportunity_id) VALUES (?, ?)", batch
+                )
+            for batch in _batches(moves):
+                self.conn.executemany("UPDATE opportunities SET position = ? WHERE id = ?", batch)
+        return stats
+
+    def records(self):
+        """Every stored record, in merge order"""
+        return [json.loads(row[0]) for row in
+                self.conn.execute("SELECT record FROM opportunities ORDER BY position")]
+
+    def export_json(self, filepath):
+        """Write the stored records as one JSON array; returns the number written"""
+        records = self.records()
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        return len(records)
+
+    def find(self, country=None, city=None, category=None, source=None, type=None, mode=None,
+             eligible_in=None, after=None, before=None, limit=None):
+        """
+        Records matching every given filter, in merge order. after/before bound
+        validUntil (inclusive, YYYY-MM-DD; records without a deadline are left
+        out); eligible_in checks the eligibility mask for a supported country.
+        """
+        where, params = [], []
+        for column, value in (("country", country), ("city", city)):
+            if value:
+                where.append(f"o.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        for column, value in (("source", source), ("type", type), ("mode_of_work", mode)):
+            if value:
+                where.append(f"o.{column} = ?")
+                params.append(value)
+        if category:
+            where.append("o.id IN (SELECT opportunity_id FROM opportunity_categories WHERE category = ?)")
+            params.append(category)
+        if eligible_in:
+            where.append("(o.eligibility_mask & ?) != 0")
+            params.append(mask_for([eligible_in]))
+        if after:
+            where.append("o.valid_until >= ?")
+            params.append(after)
+        if before:
+            where.append("o.valid_until <= ?")
+            params.append(before)
+
+        sql = "SELECT o.record FROM opportunities o"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY o.position"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def stats(self):
+        count = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            "records": count("SELECT COUNT(*) FROM opportunities"),
+            "categories": count("SELECT COUNT(DISTINCT category) FROM opportunity_categories"),
+            "sources": dict(self.conn.execute("SELECT source, COUNT(*) FROM opportunities GROUP BY source")),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or export the opportunity store")
+    parser.add_argument("action", choices=["find", "export", "stats"])
+    parser.add_argument("file", nargs="?", help="JSON file for export")
+    parser.add_argument("--country")
+    parser.add_argument("--city")
+    parser.add_argument("--category")
+    parser.add_argument("--source")
+    parser.add_argument("--type")
+    parser.add_argument("--mode")
+    parser.add_argument("--eligible-in", help="supported country the opportunity must be open to")
+    parser.add_argument("--after", help="deadline on or after YYYY-MM-DD")
+    parser.add_argument("--before", help="deadline on or before YYYY-MM-DD")
+    parser.add_argument("--open", action="store_true", help="deadline today or later")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    if args.action == "export" and not args.file:
+        parser.error("export needs a JSON file")
+
+    store = OpportunityStore()
+    if args.action == "export":
+        print(f"📤 Exported {store.export_json(args.file)} records to {args.file}")
+    elif args.action == "stats":
+        print(json.dumps(store.stats(), indent=2, ensure_ascii=False))
+    else:
+        after = date.today().isoformat() if args.open else args.after
+        started = time.perf_counter()
+        results = store.find(country=args.country, city=args.city, category=args.category, source=args.source,
+                             type=args.type, mode=args.mode, eligible_in=args.eligible_in,
+                             after=after, before=args.before, limit=args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        for record in results:
+            print(f"{record.get('validUntil') or '----------'}  {record['id']}  {record.get('title')}")
+        print(f"🔎 {len(results)} records in {elapsed:.1f} ms")
+    store.close()
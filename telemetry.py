@@ -0,0 +1,135 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+REPORTS_DIR = BASE_DIR / "data" / "reports"
+
+# USD per 1k tokens (prompt, completion); unknown models are reported without cost
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None for an empty list)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Telemetry:
+    """
+    Per-run record of every LLM call: wall latency from the call to its result
+    (all attempts), the part of it spent queued behind the throttle or backing
+    off ("wait"), prompt and completion tokens, retries, errors and cache hits,
+    tagged by stage ("translate_title", "extraction", ...) and source. report()
+    aggregates p50/p95 wall latency, total wait, token totals, tokens per
+    record and estimated cost.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.calls = []
+        self.cache_hits = {}
+        self.records = {}
+
+    def record_call(self, stage, source=None, model=None, latency=0.0, wait=0.0, prompt_tokens=0,
+                    completion_tokens=0, retries=0, error=None):
+        self.calls.append({
+            "stage": stage,
+            "source": source,
+            "model": model,
+            "latency": latency,
+            "wait": wait,
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "retries": retries,
+            "error": error,
+        })
+
+    def record_cache_hits(self, stage, count, source=None):
+        key = (stage, source)
+        self.cache_hits[key] = self.cache_hits.get(key, 0) + count
+
+    def record_records(self, stage, count, source=None):
+        """Number of records a stage worked on (for tokens per record)"""
+        key = (stage, source)
+        self.records[key] = self.records.get(key, 0) + count
+
+    def _summarize(self, calls, records, cache_hits):
+        latencies = [c["latency"] for c in calls]
+        prompt_tokens = sum(c["prompt_tokens"] for c in calls)
+        completion_tokens = sum(c["completion_tokens"] for c in calls)
+        cost = 0.0
+        for c in calls:
+            prices = MODEL_PRICES.get(c["model"])
+            if prices:
+                cost += c["prompt_tokens"] / 1000 * prices[0] + c["completion_tokens"] / 1000 * prices[1]
+        summary = {
+            "calls": len(calls),
+            "errors": sum(1 for c in calls if c["error"]),
+            "retries": sum(c["retries"] for c in calls),
+            "cache_hits": cache_hits,
+            "latency_p50": round(percentile(latencies, 50) or 0.0, 3),
+            "latency_p95": round(percentile(latencies, 95) or 0.0, 3),
+            "latency_total": round(sum(latencies), 3),
+            "wait_total": round(sum(c["wait"] for c in calls), 3),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_cost_usd": round(cost, 4),
+            "records": records,
+        }
+        if records:
+            summary["tokens_per_record"] = round((prompt_tokens + completion_tokens) / records, 1)
+        return summary
+
+    def report(self):
+        keys = sorted({(c["stage"], c["source"]) for c in self.calls} | set(self.cache_hits) | set(self.records),
+                      key=lambda k: (k[0], k[1] or ""))
+        stages = {}
+        for stage, source in keys:
+            calls = [c for c in self.calls if c["stage"] == stage and c["source"] == source]
+            name = f"{stage}:{source}" if source else stage
+            stages[name] = self._summarize(calls, self.records.get((stage, source), 0),
+                                           self.cache_hits.get((stage, source), 0))
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "duration": round(time.time() - self.started, 1),
+            "total": self._summarize(self.calls, 0, sum(self.cache_hits.values())),
+            "stages": stages,
+        }
+
+    def write_report(self, name="llm_run"):
+        """Save the report as data/reports/<name>_<timestamp>.json and return the path"""
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPORTS_DIR / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def print_report(self):
+        print("\n⏱️ LLM TELEMETRY")
+        for name, s in self.report()["stages"].items():
+            print(f"   {name}: {s['calls']} calls, p50 {s['latency_p50']}s, p95 {s['latency_p95']}s "
+                  f"({s['wait_total']}s waiting), "
+                  f"{s['prompt_tokens']}+{s['completion_tokens']} tokens, {s['errors']} errors, "
+                  f"{s['retries']} retries, {s['cache_hits']} cache hits")
+
+
+_telemetry = None
+
+
+def get_telemetry():
+    """Process-wide telemetry collector"""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry()
+    return _telemetry
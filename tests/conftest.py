@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Root modules are imported directly, as the scrapers do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
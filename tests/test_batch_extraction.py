@@ -0,0 +1,31 @@
+from collections import deque
+
+from batch_extraction import BatchExtractor, parse_json_array
+
+
+def test_reply_shapes_parse_to_one_array():
+    assert parse_json_array('```json\n[{"id": "1"}]\n```') == [{"id": "1"}]
+    assert parse_json_array('Here you go: {"results": [{"id": "1"}]}') == [{"id": "1"}]
+    assert parse_json_array('{"1": {"type": "Training"}}') == [{"type": "Training", "id": "1"}]
+    assert parse_json_array("no json here") is None
+
+
+def test_batches_fill_the_prompt_budget_building_each_post_once():
+    built = []
+
+    def build_prompt(items):
+        built.append(len(items))
+        return "HEADER " * 20 + "".join("post " * 40 for _ in items)
+
+    items = [{"id": str(i), "title": "", "description": "", "fields": ["type"]} for i in range(10)]
+    extractor = BatchExtractor(build_prompt, None, lambda answer, fields: answer,
+                               max_prompt_tokens=250, max_batch_size=10)
+    pending = deque(items)
+    sizes = []
+    while pending:
+        sizes.append(len(extractor._next_batch(pending)))
+
+    # header 35 tokens + 50 per post: four posts fit in 250
+    assert sizes == [4, 4, 2]
+    assert sum(1 for size in built if size == 1) == len(items)
+    assert max(built) <= 1
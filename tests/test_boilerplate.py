@@ -0,0 +1,33 @@
+from boilerplate import MIN_DOCUMENTS, BoilerplateDetector, strip_entries
+
+FOOTER = "Follow us on social media and share this post with your friends!"
+KEY_LINE = "Participants from all programme countries are welcome."
+
+
+def entries(count, source="eurodesk_learning.json"):
+    return [{"source": source, "description": f"Opportunity number {i} in detail.\n{FOOTER}\n{KEY_LINE}"}
+            for i in range(count)]
+
+
+def test_repeated_paragraphs_are_stripped_only_from_min_documents_on():
+    few = entries(MIN_DOCUMENTS - 1)
+    strip_entries(few)
+    assert all(FOOTER in entry["description"] for entry in few)
+
+    many = entries(MIN_DOCUMENTS)
+    detector = strip_entries(many)
+    for i, entry in enumerate(many):
+        assert entry["description"] == f"Opportunity number {i} in detail.\n{KEY_LINE}"
+        assert FOOTER in entry["originalDescription"]
+    assert detector.report()["eurodesk_learning.json"]["paragraphs_removed"] == MIN_DOCUMENTS
+
+
+def test_key_lines_and_whole_documents_are_never_stripped():
+    detector = BoilerplateDetector()
+    detector.learn("source", [f"{FOOTER}\n{KEY_LINE}"] * 10)
+    assert not detector.is_boilerplate("source", KEY_LINE)
+    assert detector.is_boilerplate("source", FOOTER)
+    # other sources learn their own boilerplate
+    assert not detector.is_boilerplate("other", FOOTER)
+    # a document that is nothing but boilerplate is kept as it is
+    assert detector.strip("source", FOOTER) == FOOTER
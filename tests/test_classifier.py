@@ -0,0 +1,35 @@
+from classifier import BatchClassifier
+
+CATEGORIES = {"Technology": ["AI", "coding"], "Sports": ["sport"]}
+
+
+def test_tokens_by_default():
+    classifier = BatchClassifier(category_keywords=CATEGORIES)
+    result = classifier.classify_one("Coding bootcamp", "Prevention of sports injuries, fully remote")
+    assert result["type"] == "volunteering"  # default: no keyword token ("prevention" is not "event")
+    assert result["modeOfWork"] == "remote"
+    assert result["categories"] == ["Technology", "Sports"]
+
+
+def test_substrings_match_inside_words():
+    classifier = BatchClassifier(type_keywords={"event": ["event"], "competition": ["award"]},
+                                 mode_keywords={"remote": ["digital"]}, category_keywords=CATEGORIES,
+                                 default_type="other", substrings=True)
+    result = classifier.classify_one("Awarded projects", "Prevention day on digitalisation")
+    assert result["type"] == "event"
+    assert result["modeOfWork"] == "remote"
+    assert result["categories"] == []
+
+
+def test_capitalised_keywords_match_as_whole_words():
+    classifier = BatchClassifier(category_keywords=CATEGORIES, substrings=True)
+    assert classifier.classify_one("Training", "said the team")["categories"] == []
+    assert classifier.classify_one("AI bootcamp", None)["categories"] == ["Technology"]
+    assert classifier.classify_one("Intro to ai", "with sports")["categories"] == ["Technology", "Sports"]
+
+
+def test_overlapping_keywords_all_count():
+    classifier = BatchClassifier(type_keywords={"exchange": ["youth exchange"], "event": ["exchange"]},
+                                 category_keywords={}, substrings=True)
+    scores = classifier.score([("Youth exchanges", "")])["type"]
+    assert scores.tolist() == [[1.0, 1.0]]
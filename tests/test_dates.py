@@ -0,0 +1,29 @@
+from datetime import date
+
+from dates import parse_date
+
+REFERENCE = date(2025, 10, 19)
+
+
+def parsed(text):
+    return parse_date(text, REFERENCE)
+
+
+def test_words_in_running_text_are_not_months():
+    assert parsed("Applications may be submitted until 15 March 2026") == ("2026-03-15", "day", False, None)
+    assert parsed("Find out more: deadline 10 March 2026") == ("2026-03-10", "day", False, None)
+    assert parsed("Deadline in May") is None
+
+
+def test_ranges_need_a_dash_or_range_word():
+    assert parsed("Ages 18-30, deadline 1 May 2026") == ("2026-05-01", "day", False, None)
+    assert parsed("Deadline 15.03.2026, results 01.05.2026").start is None
+    assert parsed("1–15 October 2025") == ("2025-10-15", "day", False, "2025-10-01")
+    assert parsed("15 December - 10 January 2026") == ("2026-01-10", "day", False, "2025-12-15")
+
+
+def test_ordinals_and_other_languages():
+    assert parsed("15th of March 2026").date == "2026-03-15"
+    assert parsed("1-ви май 2026").date == "2026-05-01"
+    assert parsed("5 de mayo de 2026").date == "2026-05-05"
+    assert parsed("31 May") == ("2025-05-31", "day", True, None)
@@ -0,0 +1,63 @@
+import random
+
+from dedupe import MinHasher, dedupe_entries, find_duplicates, shingles, similarity
+
+PHRASES = ["apply now", "deadline soon", "erasmus plus youth exchange", "for young people aged 18 30"]
+
+
+def random_post(rng, words=150):
+    vocabulary = [f"word{i}" for i in range(20000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_unrelated_posts_sharing_a_phrase_are_not_grouped():
+    rng = random.Random(0)
+    entries = [{"title": f"Post {i}", "description": f"{random_post(rng)} {' '.join(rng.sample(PHRASES, 2))}"}
+               for i in range(1000)]
+    assert find_duplicates(entries) == []
+
+
+def test_single_shared_shingle_gives_low_similarity():
+    rng = random.Random(1)
+    hasher = MinHasher()
+    a = shingles(random_post(rng) + " apply now here")
+    b = shingles(random_post(rng) + " apply now here")
+    assert similarity(hasher.signature(a), hasher.signature(b)) < 0.1
+
+
+def test_near_duplicates_across_sources_are_merged():
+    rng = random.Random(2)
+    text = random_post(rng)
+    edited = text.split()
+    edited[10] = "changed"
+    entries = [
+        {"title": "Youth exchange", "description": text, "source": "opportunit4u_data.json",
+         "applicationUrl": "https://example.org/p/1?utm_source=fb", "categories": ["A"], "eligibilityMask": 1},
+        {"title": "Youth exchange", "description": " ".join(edited), "source": "eurodesk_learning.json",
+         "applicationUrl": "http://www.example.org/p/1/", "categories": ["B"], "eligibilityMask": 4},
+        {"title": "Other", "description": random_post(rng), "source": "eurodesk_learning.json"},
+    ]
+    result, groups = dedupe_entries(entries)
+    assert len(groups) == 1 and len(result) == 2
+    merged = result[0]
+    assert merged["source"] == "eurodesk_learning.json"
+    assert merged["sources"] == ["eurodesk_learning.json", "opportunit4u_data.json"]
+    assert merged["categories"] == ["B", "A"] and merged["eligibilityMask"] == 5
+
+
+def test_different_deadlines_are_never_merged():
+    rng = random.Random(3)
+    text = random_post(rng)
+    entries = [{"title": "Same", "description": text, "validUntil": "2026-01-01"},
+               {"title": "Same", "description": text, "validUntil": "2026-02-01"}]
+    assert find_duplicates(entries) == []
+
+
+def test_a_generic_apply_url_does_not_merge_different_posts():
+    rng = random.Random(4)
+    shared = random_post(rng, words=60)
+    entries = [{"title": f"Post {i}", "description": f"{shared} {random_post(rng, words=60)}",
+                "applicationUrl": "https://forms.example.org/apply"} for i in range(3)]
+    assert find_duplicates(entries) == []
+    # two posts with overlapping boilerplate and their own shared URL are not enough either
+    assert find_duplicates(entries[:2]) == []
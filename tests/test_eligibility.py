@@ -0,0 +1,18 @@
+from eligibility import BULGARIA, eligibility_mask, mask_for
+
+
+def test_group_words_in_free_text_need_eligibility_wording():
+    assert eligibility_mask("Funded by the European Commission.", section=False) == 0
+    assert eligibility_mask("Erasmus+ funded youth exchange in Spain.", section=False) == 0
+    assert eligibility_mask("Open to young people from all European countries.", section=False) & BULGARIA
+
+
+def test_country_names_in_free_text_need_eligibility_wording():
+    text = "Training course in Portugal. Participants from Bulgaria, Romania and Greece can apply."
+    assert eligibility_mask(text, section=False) == mask_for(["Bulgaria", "Romania", "Greece"])
+    assert eligibility_mask("Portugal", section=True) == mask_for(["Portugal"])
+
+
+def test_eligibility_sections_accept_group_words():
+    assert eligibility_mask("Participants from: Europe") & BULGARIA
+    assert eligibility_mask("Erasmus+ programme countries", section=False) & BULGARIA
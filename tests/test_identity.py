@@ -0,0 +1,33 @@
+from identity import ensure_unique_ids, record_id
+
+
+def shared_url_records():
+    url = "https://example.org/opportunities"
+    return [
+        {"id": record_id("eurodesk", url), "title": "Youth exchange in Spain", "description": "Climate"},
+        {"id": record_id("eurodesk", url), "title": "Training course in Malta", "description": "Media"},
+        {"id": record_id("eurodesk", "https://example.org/other"), "title": "Volunteering", "description": ""},
+    ]
+
+
+def test_shared_url_ids_do_not_depend_on_record_order():
+    forward = shared_url_records()
+    backward = shared_url_records()[::-1]
+    assert ensure_unique_ids(forward) == 2
+    assert ensure_unique_ids(backward) == 2
+    ids = {entry["title"]: entry["id"] for entry in forward}
+    assert ids == {entry["title"]: entry["id"] for entry in backward}
+    assert ids["Youth exchange in Spain"] == record_id("eurodesk", None, "Youth exchange in Spain", "Climate")
+    assert ids["Volunteering"] == record_id("eurodesk", "https://example.org/other")
+
+
+def test_identical_texts_are_numbered_by_content():
+    records = [
+        {"id": "smokinya-abc", "title": "Camp", "description": "", "validUntil": "2026-05-01"},
+        {"id": "smokinya-abc", "title": "Camp", "description": "", "validUntil": "2026-06-01"},
+    ]
+    ensure_unique_ids(records)
+    reordered = [dict(record, id="smokinya-abc") for record in records[::-1]]
+    ensure_unique_ids(reordered)
+    assert len({record["id"] for record in records}) == 2
+    assert sorted((r["validUntil"], r["id"]) for r in records) == sorted((r["validUntil"], r["id"]) for r in reordered)
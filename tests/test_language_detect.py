@@ -0,0 +1,12 @@
+from language_detect import BULGARIAN_TRIGRAMS, is_bulgarian
+
+
+def test_trigrams_are_three_characters():
+    assert all(len(gram) == 3 for gram in BULGARIAN_TRIGRAMS)
+
+
+def test_bulgarian_and_russian_descriptions():
+    assert is_bulgarian("Възможност за младежи: ще бъде организиран обмен, въпроси на имейла.")
+    assert is_bulgarian("ТЕКУЩО")
+    assert not is_bulgarian("Это программа для молодых людей, которые также могут подать заявку.")
+    assert not is_bulgarian("Youth exchange in Sofia")
@@ -0,0 +1,20 @@
+from lexicon import Lexicon
+
+
+def test_place_names_outside_the_lexicon_are_kept():
+    lexicon = Lexicon()
+    # already Cyrillic or another script: kept as written
+    assert lexicon.lookup("city", "Пловдивска област") == "Пловдивска област"
+    assert lexicon.lookup("city", "Αθήνα") == "Αθήνα"
+    # placeholders are not places
+    for value in ("N/A", "Not specified", "Remote", "Unknown"):
+        assert lexicon.lookup("city", value) == value
+    # Latin names missing from the lexicon stay in Latin script
+    for value in ("Brisbane", "Riverside", "Bad Homburg", "Łódź"):
+        assert lexicon.lookup("city", value) == value
+
+
+def test_cyrillic_lexicon_values_are_found():
+    lexicon = Lexicon()
+    assert lexicon.lookup("city", "Sofia") == "София"
+    assert lexicon.lookup("city", "София") == "София"
@@ -0,0 +1,44 @@
+from llm_cache import ExtractionCache
+
+
+def test_key_covers_text_fields_prompt_and_model(tmp_path):
+    cache = ExtractionCache("gpt", "v1", path=tmp_path / "cache.sqlite")
+    key = cache.make_key("Title", "Description", ["type", "mode"])
+
+    assert key == cache.make_key("Title", "Description", ["mode", "type"])
+    assert key != cache.make_key("Title", "Description", ["type"])
+    assert key != cache.make_key("Title", "Other description", ["type", "mode"])
+    assert key != ExtractionCache("gpt", "v2", path=tmp_path / "other.sqlite").make_key(
+        "Title", "Description", ["type", "mode"])
+    assert key != ExtractionCache("gpt-mini", "v1", path=tmp_path / "third.sqlite").make_key(
+        "Title", "Description", ["type", "mode"])
+
+
+def test_a_new_prompt_version_drops_cached_results(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ExtractionCache("gpt", "v1", path=path)
+    cache.put("Title", "Description", {"type": "Training"})
+    cache.close()
+
+    reopened = ExtractionCache("gpt", "v1", path=path)
+    assert reopened.get("Title", "Description") == {"type": "Training"}
+    reopened.close()
+
+    changed = ExtractionCache("gpt", "v2", path=path)
+    assert changed.get("Title", "Description") is None
+    assert changed.stats()["entries"] == 0
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ExtractionCache("gpt", "v1", path=tmp_path / "cache.sqlite", max_entries=2)
+    cache.put("one", "", {"n": 1})
+    cache.put("two", "", {"n": 2})
+    assert cache.get("one", "") == {"n": 1}
+    cache.put("two", "", {"n": 2})
+    cache.put("three", "", {"n": 3})
+
+    assert cache.get("one", "") is None
+    assert cache.get("two", "") == {"n": 2}
+    assert cache.get("three", "") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+    assert cache.size == cache.count() == 2
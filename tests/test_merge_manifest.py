@@ -0,0 +1,29 @@
+from merge_manifest import MergeManifest
+
+
+def test_year_less_deadlines_go_stale_the_next_day(tmp_path):
+    output = tmp_path / "all_opportunities.json"
+    output.write_text("[]", encoding="utf-8")
+
+    manifest = MergeManifest("pipeline", path=tmp_path / "manifest.json")
+    manifest.save([], output, [], reference_date="2026-03-01", relative_dates=True)
+    reloaded = MergeManifest("pipeline", path=tmp_path / "manifest.json")
+    assert reloaded.dates_current("2026-03-01")
+    assert not reloaded.dates_current("2026-03-02")
+
+    manifest.save([], output, [], reference_date="2026-03-01", relative_dates=False)
+    reloaded = MergeManifest("pipeline", path=tmp_path / "manifest.json")
+    assert reloaded.dates_current("2026-03-02")
+
+
+def test_manifest_without_a_reference_date_is_not_current(tmp_path):
+    assert not MergeManifest("pipeline", path=tmp_path / "missing.json").dates_current("2026-03-01")
+
+
+def test_incomplete_translations_are_not_carried_forward(tmp_path):
+    output = tmp_path / "all_opportunities.json"
+    output.write_text('[{"title": "A"}, {"title": "B"}]', encoding="utf-8")
+
+    MergeManifest("pipeline", path=tmp_path / "manifest.json").save(["hash-a", "hash-b"], output, [True, False])
+    previous = MergeManifest("pipeline", path=tmp_path / "manifest.json").previous_outputs(output)
+    assert previous == {"hash-a": {"title": "A"}}
@@ -0,0 +1,38 @@
+from eligibility import mask_for
+from query import OpportunityIndex
+
+RECORDS = [
+    {"id": "a", "country": "Bulgaria", "type": "Volunteering", "categories": ["Education"],
+     "validUntil": "2026-05-01", "eligibilityMask": mask_for(["Bulgaria"])},
+    {"id": "b", "country": "bulgaria ", "type": "Training", "categories": ["Education", "Sport"],
+     "validUntil": "2026-07-01"},
+    {"id": "c", "country": "Greece", "type": "Volunteering", "categories": ["Education"],
+     "validUntil": "2026-06-01", "eligibilityMask": mask_for(["Bulgaria", "Greece"])},
+    {"id": "d", "country": "Bulgaria", "type": "Volunteering", "categories": ["education"]},
+]
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def test_filters_intersect_case_insensitively_in_dataset_order():
+    index = OpportunityIndex(RECORDS)
+    assert ids(index.search(country="BULGARIA")) == ["a", "b", "d"]
+    assert ids(index.search(type="volunteering", categories=["Education"])) == ["a", "c", "d"]
+    assert ids(index.search(categories=["Education", "Sport"])) == ["b"]
+    assert ids(index.search(eligible_in="Bulgaria")) == ["a", "c"]
+    assert ids(index.search(eligible_in="Atlantis")) == []
+    assert ids(index.search(country="Bulgaria", limit=2)) == ["a", "b"]
+    assert ids(index.search()) == ["a", "b", "c", "d"]
+
+
+def test_deadline_ranges_are_inclusive_and_skip_undated_records():
+    index = OpportunityIndex(RECORDS)
+    assert ids(index.search(after="2026-06-01")) == ["b", "c"]
+    assert ids(index.search(before="2026-06-01")) == ["a", "c"]
+    assert ids(index.search(after="2026-05-02", before="2026-06-30")) == ["c"]
+    assert ids(index.search(after="2026-08-01")) == []
+    # few candidates are checked one by one, many are intersected with the range
+    assert ids(index.search(country="Greece", after="2026-01-01")) == ["c"]
+    assert ids(index.search(categories=["Education"], before="2026-06-01")) == ["a", "c"]
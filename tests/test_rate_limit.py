@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from rate_limit import SUCCESSES_PER_STEP, AdaptiveThrottle, parse_reset_duration, retry_after_seconds
+
+
+def test_a_429_halves_the_limit_and_successes_win_it_back_one_by_one():
+    throttle = AdaptiveThrottle(max_concurrency=8)
+    throttle.on_rate_limited()
+    assert throttle.limit == 4
+    throttle.on_rate_limited()
+    assert throttle.limit == 2 and throttle.stats["min_limit"] == 2
+
+    for _ in range(SUCCESSES_PER_STEP - 1):
+        throttle.on_success()
+    assert throttle.limit == 2
+    throttle.on_success()
+    assert throttle.limit == 3
+
+    # a 429 mid-way resets the success streak
+    for _ in range(SUCCESSES_PER_STEP - 1):
+        throttle.on_success()
+    throttle.on_rate_limited()
+    throttle.on_success()
+    assert throttle.limit == 1
+
+    for _ in range(SUCCESSES_PER_STEP * 20):
+        throttle.on_success()
+    assert throttle.limit == 8
+
+
+def test_retry_after_pauses_new_requests():
+    async def run():
+        throttle = AdaptiveThrottle(max_concurrency=2)
+        throttle.on_rate_limited(retry_after=0.2)
+        started = time.monotonic()
+        async with throttle.slot():
+            return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.15
+
+
+def test_reset_headers_are_read_as_seconds():
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == 0.02
+    assert retry_after_seconds({"retry-after-ms": "1500"}) == 1.5
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({}) is None
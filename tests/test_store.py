@@ -0,0 +1,44 @@
+import json
+
+from eligibility import mask_for
+from store import OpportunityStore
+
+
+def record(record_id, **fields):
+    return {"id": record_id, "title": f"Title {record_id}", "source": "eurodesk_learning.json", **fields}
+
+
+def test_sync_and_export_keep_merge_order(tmp_path):
+    store = OpportunityStore(tmp_path / "store.sqlite")
+    first = [record("a"), record("b"), record("c")]
+    assert store.sync(first) == {"inserted": 3, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    # next merge: reordered, one record changed, one removed, one new
+    second = [record("c"), record("d"), record("a", title="Changed")]
+    assert store.sync(second) == {"inserted": 1, "updated": 1, "unchanged": 1, "deleted": 1}
+    assert [r["id"] for r in store.records()] == ["c", "d", "a"]
+
+    output = tmp_path / "all_opportunities.json"
+    assert store.export_json(output) == 3
+    assert json.loads(output.read_text(encoding="utf-8")) == second
+    store.close()
+
+
+def test_find_combines_filters_in_merge_order(tmp_path):
+    store = OpportunityStore(tmp_path / "store.sqlite")
+    store.sync([
+        record("a", country="Bulgaria", categories=["Education"], validUntil="2026-05-01",
+               eligibilityMask=mask_for(["Bulgaria"])),
+        record("b", country="bulgaria", categories=["Education", "Sport"], validUntil="2026-07-01"),
+        record("c", country="Greece", categories=["Education"], validUntil="2026-06-01",
+               eligibilityMask=mask_for(["Bulgaria", "Greece"])),
+        record("d", country="Bulgaria", categories=["Education"]),
+    ])
+
+    ids = lambda records: [r["id"] for r in records]
+    assert ids(store.find(country="BULGARIA")) == ["a", "b", "d"]
+    assert ids(store.find(category="Education", eligible_in="Bulgaria")) == ["a", "c"]
+    assert ids(store.find(after="2026-06-01")) == ["b", "c"]
+    assert ids(store.find(category="Education", before="2026-06-01")) == ["a", "c"]
+    assert ids(store.find(country="Bulgaria", limit=1)) == ["a"]
+    store.close()
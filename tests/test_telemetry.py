@@ -0,0 +1,34 @@
+import openai_standin
+from llm_gateway import LLMGateway
+from rate_limit import AdaptiveThrottle
+from telemetry import Telemetry
+
+
+def test_percentiles_use_wall_latency_and_report_waiting_separately():
+    telemetry = Telemetry()
+    for latency, wait in [(0.2, 0.0), (0.3, 0.0), (2.5, 2.0)]:
+        telemetry.record_call("translate_title", latency=latency, wait=wait)
+
+    summary = telemetry.report()["total"]
+    assert summary["latency_p50"] == 0.3
+    assert summary["latency_p95"] == 2.5
+    assert summary["wait_total"] == 2.0
+
+
+def test_backoff_after_a_429_counts_as_wall_latency():
+    server, state, url = openai_standin.start_in_background(latency_ms=20, rate_limit=1)
+    telemetry = Telemetry()
+    gateway = LLMGateway(api_key="x", base_url=url, telemetry=telemetry)
+    gateway.backoff = AdaptiveThrottle(max_concurrency=1, base_backoff=0.01)
+    request = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "Translate: Hello"}]}
+    try:
+        assert gateway.complete(**request) is not None
+        # the second request in the same second is rate limited and retried after the window resets
+        assert gateway.complete(**request) is not None
+    finally:
+        server.shutdown()
+
+    first, second = telemetry.calls
+    assert first["retries"] == 0 and second["retries"] >= 1
+    assert second["wait"] > 0.1
+    assert second["latency"] > second["wait"]
@@ -0,0 +1,18 @@
+from tiered_extractor import compress_description
+
+
+def test_only_whole_share_prompts_are_dropped():
+    description = "\n".join([
+        "Youth exchange on climate action in Varna.",
+        "Share your project idea with us by 1 May 2026.",
+        "Follow-up meetings take place online.",
+        "Share on Facebook | Twitter | LinkedIn",
+        "Follow us on Instagram",
+        "Последвайте ни във Facebook",
+        "https://example.org/share",
+    ])
+    assert compress_description(description).splitlines() == [
+        "Youth exchange on climate action in Varna.",
+        "Share your project idea with us by 1 May 2026.",
+        "Follow-up meetings take place online.",
+    ]
@@ -0,0 +1,44 @@
+import sqlite3
+
+from translation_memory import TranslationMemory
+
+
+def test_translations_are_stored_per_language(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite")
+    memory.put("Youth  exchange", "title", "gpt", "v1", "Младежки обмен")
+    memory.put("Youth exchange", "title", "gpt", "v1", "Échange de jeunes", language="fr")
+
+    assert memory.get("Youth exchange", "title", "gpt", "v1") == "Младежки обмен"
+    assert memory.get("Youth exchange", "title", "gpt", "v1", language="fr") == "Échange de jeunes"
+    assert memory.get("Youth exchange", "title", "gpt", "v2") is None
+    assert memory.stats()["hits"] == 2 and memory.stats()["misses"] == 1
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite", max_entries=2)
+    memory.put("one", "title", "gpt", "v1", "едно")
+    memory.put("two", "title", "gpt", "v1", "две")
+    memory.get("one", "title", "gpt", "v1")
+    memory.put("three", "title", "gpt", "v1", "три")
+
+    assert memory.get("two", "title", "gpt", "v1") is None
+    assert memory.get("one", "title", "gpt", "v1") == "едно"
+    assert memory.stats()["evictions"] == 1
+
+
+def test_rows_from_before_language_keys_are_rekeyed(tmp_path):
+    path = tmp_path / "memory.sqlite"
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE translations (
+            key TEXT PRIMARY KEY, source TEXT NOT NULL, text_type TEXT NOT NULL, model TEXT NOT NULL,
+            prompt_version TEXT NOT NULL, translation TEXT NOT NULL, created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO translations VALUES ('old-key', 'Youth exchange', 'title', 'gpt', 'v1', "
+                 "'Младежки обмен', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    assert TranslationMemory(path).get("Youth exchange", "title", "gpt", "v1") == "Младежки обмен"
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import openai_standin
+from llm_gateway import LLMGateway
+from rate_limit import AdaptiveThrottle
+from telemetry import Telemetry
+from translation_memory import TranslationMemory
+from translator import BulgarianTranslator
+
+
+def reply(data):
+    message = SimpleNamespace(content=json.dumps(data, ensure_ascii=False))
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_batch_reply_with_missing_items_falls_back_for_the_whole_batch(tmp_path):
+    translator = BulgarianTranslator(memory=TranslationMemory(tmp_path / "memory.sqlite"), gateway=object(),
+                                     languages=["bg"])
+    batch = ["Youth exchange", "Training course", "Summer camp"]
+    complete = {"1": {"bg": "Младежки обмен"}, "2": {"bg": "Обучителен курс"}, "3": {"bg": "Летен лагер"}}
+    assert translator.parse_batch_reply(reply(complete), batch, ["bg"])["Summer camp"] == {"bg": "Летен лагер"}
+    # one item dropped: the numbering can no longer be trusted for any of them
+    shifted = {"1": {"bg": "Обучителен курс"}, "2": {"bg": "Летен лагер"}}
+    assert translator.parse_batch_reply(reply(shifted), batch, ["bg"]) == {}
+
+
+class NoApi:
+    available = False
+
+    async def aclose(self):
+        pass
+
+
+def test_entries_without_an_api_are_marked_incomplete(tmp_path):
+    translator = BulgarianTranslator(memory=TranslationMemory(tmp_path / "memory.sqlite"), gateway=NoApi(),
+                                     languages=["bg"])
+    english = {"source": "eurodesk", "title": "Youth exchange", "description": "Ten days in Spain.\n\nFree travel."}
+    bulgarian = {"source": "smokinya", "title": "Младежки обмен в Испания", "description": "No description found"}
+    translator.translate_entries([english, bulgarian])
+    assert english["title_bg"] == "Youth exchange"
+    assert not translator.is_complete(english)
+    assert translator.is_complete(bulgarian)
+
+
+def test_identical_concurrent_requests_share_one_gateway_call(tmp_path):
+    server, state, url = openai_standin.start_in_background(latency_ms=100)
+    gateway = LLMGateway(api_key="x", base_url=url, telemetry=Telemetry())
+    translator = BulgarianTranslator(memory=TranslationMemory(tmp_path / "memory.sqlite"), gateway=gateway,
+                                     languages=["bg"])
+
+    async def run():
+        throttle = AdaptiveThrottle(max_concurrency=4)
+        try:
+            return await asyncio.gather(*(
+                translator.translate_text_async(text, "title", throttle)
+                for text in ["Youth exchange", "Youth  exchange ", "Youth exchange"]
+            ))
+        finally:
+            await gateway.aclose()
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        server.shutdown()
+    assert state.stats["requests"] == 1
+    assert translator.deduplicated == 2
+    assert results[0] == results[1] == results[2] == {"bg": "[bg] Youth exchange"}
+
+
+class ReversedBatches:
+    """Gateway answering numbered batches in reverse key order (bg upper-cased, ro prefixed)"""
+    available = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, **request):
+        self.calls += 1
+        prompt = request["messages"][-1]["content"]
+        items = json.loads(prompt[prompt.index("{"):prompt.rindex("}") + 1])
+        return reply({key: {"bg": items[key].upper(), "ro": f"ro:{items[key]}"} for key in reversed(list(items))})
+
+
+def test_paragraph_chunks_are_reassembled_in_order_for_every_language(tmp_path):
+    gateway = ReversedBatches()
+    translator = BulgarianTranslator(memory=TranslationMemory(tmp_path / "memory.sqlite"), gateway=gateway,
+                                     languages=["bg", "ro"])
+    description = "First paragraph.\n\nSecond paragraph.\n• Third bullet\n2026\n  First paragraph."
+    result = translator.translate_description(description)
+    assert result["bg"] == "FIRST PARAGRAPH.\n\nSECOND PARAGRAPH.\n• THIRD BULLET\n2026\n  FIRST PARAGRAPH."
+    assert result["ro"] == "ro:First paragraph.\n\nro:Second paragraph.\nro:• Third bullet\n2026\n  ro:First paragraph."
+    # every paragraph in both languages from a single request
+    assert gateway.calls == 1 and translator.is_complete({"title": "", "description": description})
+
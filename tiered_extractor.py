@@ -0,0 +1,410 @@
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+from classifier import BatchClassifier, MODE_KEYWORDS, TYPE_KEYWORDS
+from eligibility import BULGARIA, eligibility_mask
+from llm_cache import estimate_tokens
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+CONFIG_DIR = BASE_DIR / "config"
+COUNTRIES_FILE = CONFIG_DIR / "country.json"
+CITIES_FILE = CONFIG_DIR / "world_cities.json"
+
+# Fields the smokinya extraction prompt asks for, in prompt order
+EXTRACTION_FIELDS = [
+    "typeOfOpportunity", "modeOfWork", "categories",
+    "city", "country", "validUntil", "bulgariaEligible",
+]
+
+DEFAULT_THRESHOLD = 0.75
+
+# Shared English keywords plus the Bulgarian wording used on smokinya.com
+LOCAL_TYPE_KEYWORDS = {
+    'competition': TYPE_KEYWORDS['competition'] + ['конкурс', 'състезание', 'награда'],
+    'exchange': TYPE_KEYWORDS['exchange'] + ['младежки обмен', 'обмен'],
+    'internship': ['internship', 'trainee', 'стаж', 'стажант', 'стажантска програма'],
+    'training': ['training course', 'training', 'обучение', 'курс'],
+    'fellowship': ['fellowship'],
+    'conference': ['conference', 'конференция'],
+    'workshop': ['workshop', 'уъркшоп', 'работилница'],
+    'event': TYPE_KEYWORDS['event'] + ['събитие', 'семинар', 'форум'],
+    'scholarship': TYPE_KEYWORDS['scholarship'] + ['стипендия', 'грант', 'финансиране'],
+    'erasmus': TYPE_KEYWORDS['erasmus'] + ['еразъм'],
+    'volunteering': TYPE_KEYWORDS['volunteering'] + ['доброволчество', 'доброволец', 'доброволци'],
+}
+
+LOCAL_MODE_KEYWORDS = {
+    'hybrid': MODE_KEYWORDS['hybrid'] + ['хибриден', 'хибридно'],
+    'remote': MODE_KEYWORDS['remote'] + ['online', 'онлайн', 'дистанционно'],
+    'on-site': MODE_KEYWORDS['on-site'] + ['присъствено', 'на място'],
+}
+
+MONTHS = {
+    'january': 1, 'jan': 1, 'януари': 1,
+    'february': 2, 'feb': 2, 'февруари': 2,
+    'march': 3, 'mar': 3, 'март': 3,
+    'april': 4, 'apr': 4, 'април': 4,
+    'may': 5, 'май': 5,
+    'june': 6, 'jun': 6, 'юни': 6,
+    'july': 7, 'jul': 7, 'юли': 7,
+    'august': 8, 'aug': 8, 'август': 8,
+    'september': 9, 'sep': 9, 'sept': 9, 'септември': 9,
+    'october': 10, 'oct': 10, 'октомври': 10,
+    'november': 11, 'nov': 11, 'ноември': 11,
+    'december': 12, 'dec': 12, 'декември': 12,
+}
+
+_MONTH_ALTERNATION = "|".join(sorted(MONTHS, key=len, reverse=True))
+DATE_PATTERNS = [
+    # 2025-10-21
+    (re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"), lambda m: (m[1], m[2], m[3])),
+    # 21/10/2025, 21.10.2025
+    (re.compile(r"\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b"), lambda m: (m[3], m[2], m[1])),
+    # 21 October 2025, 21-ви октомври 2025 г.
+    (re.compile(r"\b(\d{1,2})(?:st|nd|rd|th|-?ви|-?ри|-?ти)?\s+(?:of\s+)?(" + _MONTH_ALTERNATION + r")\.?,?\s+(\d{4})",
+                re.IGNORECASE), lambda m: (m[3], MONTHS[m[2].lower()], m[1])),
+    # October 21, 2025
+    (re.compile(r"\b(" + _MONTH_ALTERNATION + r")\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})", re.IGNORECASE),
+     lambda m: (m[3], MONTHS[m[1].lower()], m[2])),
+]
+
+DEADLINE_CUE = re.compile(
+    r"deadline|apply by|apply until|application until|applications close|closing date|"
+    r"краен срок|срок за кандидатстване|кандидатствай до|до дата",
+    re.IGNORECASE
+)
+
+LOCATION_CUE = r"(?:in|at|hosted in|held in|based in|venue:?|location:?|в|във|град)\s+"
+
+
+# Description budget for LLM prompts (estimated tokens)
+DESCRIPTION_TOKEN_BUDGET = 700
+# Opening lines always kept; they usually say what the opportunity is
+LEAD_LINES = 3
+
+# Share/follow/link-only lines carry nothing the extraction needs. A line is noise
+# only if it is nothing but a prompt ("Share on Facebook | LinkedIn", "Follow us"),
+# so content such as "Share your project idea with us" is kept
+NOISE_CUE = r"(?:share|follow|like|subscribe|click here|read more|сподели(?:те)?|последвай(?:те)?|абонирай(?:те)?)"
+NOISE_FILLER = (
+    r"(?:this|post|article|page|opportunity|us|on|via|in|to|our|the|newsletter|channel|and|or|with|friends|"
+    r"facebook|twitter|x|linkedin|instagram|whatsapp|telegram|viber|messenger|pinterest|reddit|youtube|tiktok|"
+    r"e-?mail|copy link|print|ни|се|в|във|на|и|за|нас|нашия|бюлетин)"
+)
+NOISE_LINE_RE = re.compile(
+    rf"^[\W_]*{NOISE_CUE}(?:[\W_]+{NOISE_FILLER})*[\W_]*$|^https?://\S+$",
+    re.IGNORECASE
+)
+KEY_LINE_RE = re.compile(
+    DEADLINE_CUE.pattern + r"|eligib|participants?|countr|online|remote|hybrid|venue|location|hosted|held in|"
+    r"\b\d{4}\b|участни|държав|страни|онлайн|място|град",
+    re.IGNORECASE
+)
+
+
+def compress_description(description, max_tokens=DESCRIPTION_TOKEN_BUDGET):
+    """
+    Shorter description for LLM prompts: whitespace collapsed, repeated and
+    share/link-only lines dropped. Over budget, the opening lines and lines with
+    deadline, location or eligibility cues are kept, in their original order.
+    """
+    lines = []
+    seen = set()
+    for line in (description or "").splitlines():
+        line = " ".join(line.split())
+        if not line or line.lower() in seen or NOISE_LINE_RE.search(line) or not re.search(r"\w", line):
+            continue
+        seen.add(line.lower())
+        lines.append(line)
+    text = "\n".join(lines)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max_tokens * 4
+    lead = list(range(min(LEAD_LINES, len(lines))))
+    key = [i for i, line in enumerate(lines) if i >= LEAD_LINES and KEY_LINE_RE.search(line)]
+    keep = set()
+    used = 0
+    for i in lead + key:
+        cost = len(lines[i]) + 1
+        if used + cost <= budget:
+            keep.add(i)
+            used += cost
+    if not keep:
+        return text[:budget]
+    return "\n".join(lines[i] for i in sorted(keep))
+
+
+def _load_gazetteer(path, key):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            names = json.load(f).get(key, [])
+    except Exception as e:
+        print(f"⚠️ Could not load {path}: {e}")
+        names = []
+    return sorted({n.lower() for n in names if n}, key=len, reverse=True)
+
+
+def _name_pattern(names):
+    if not names:
+        return None
+    return re.compile(r"(?<!\w)(" + "|".join(re.escape(n) for n in names) + r")(?!\w)", re.IGNORECASE)
+
+
+class LocalExtractor:
+    """
+    Rule and gazetteer based extraction of the smokinya fields.
+    Every field comes back as (value, confidence) with confidence in [0, 1].
+    """
+
+    def __init__(self, allowed_categories=None):
+        self.classifier = BatchClassifier(type_keywords=LOCAL_TYPE_KEYWORDS,
+                                          mode_keywords=LOCAL_MODE_KEYWORDS,
+                                          default_type=None, default_mode=None)
+        self.allowed_categories = set(allowed_categories) if allowed_categories else None
+        self.country_pattern = _name_pattern(_load_gazetteer(COUNTRIES_FILE, "countries"))
+        self.city_pattern = _name_pattern(_load_gazetteer(CITIES_FILE, "cities"))
+
+    @staticmethod
+    def _hit_confidence(scores, labels):
+        """Confidence of the first label with hits; lowered when other labels also hit"""
+        hits = [(label, score) for label, score in zip(labels, scores) if score > 0]
+        if not hits:
+            return None, 0.0
+        label, score = hits[0]
+        confidence = min(0.95, 0.55 + 0.15 * float(score))
+        if len(hits) > 1:
+            confidence -= 0.2
+        return label, round(confidence, 2)
+
+    def _classify(self, title, description):
+        scores = self.classifier.score([(title, description)])
+        opp_type = self._hit_confidence(scores["type"][0], self.classifier.type_labels)
+        mode = self._hit_confidence(scores["mode"][0], self.classifier.mode_labels)
+
+        row = scores["categories"].getrow(0)
+        categories = [self.classifier.category_labels[i] for i in sorted(row.indices)]
+        if self.allowed_categories is not None:
+            categories = [c for c in categories if c in self.allowed_categories]
+        categories = categories[:3]
+        category_confidence = 0.8 if categories else 0.0
+        return opp_type, mode, (categories, category_confidence)
+
+    def _place(self, pattern, title, description):
+        """Most likely place name; a location cue or a title mention raises confidence"""
+        if pattern is None:
+            return None, 0.0
+        text = f"{title or ''}\n{description or ''}"
+        found = {m.group(1).lower() for m in pattern.finditer(text)}
+        if not found:
+            return None, 0.0
+
+        for name in sorted(found, key=len, reverse=True):
+            if re.search(LOCATION_CUE + re.escape(name) + r"(?!\w)", text, re.IGNORECASE):
+                return name.title(), 0.9
+        if len(found) == 1:
+            name = found.pop()
+            in_title = bool(title) and name in title.lower()
+            return name.title(), 0.85 if in_title else 0.7
+        return None, 0.3
+
+    def _deadline(self, description):
+        """First parseable date, preferring one that follows a deadline cue"""
+        text = description or ""
+        cue = DEADLINE_CUE.search(text)
+        windows = []
+        if cue:
+            windows.append((text[cue.start():cue.start() + 200], 0.9))
+        windows.append((text, 0.5))
+
+        for window, confidence in windows:
+            for pattern, parts in DATE_PATTERNS:
+                for match in pattern.finditer(window):
+                    try:
+                        year, month, day = parts(match)
+                        date = datetime(int(year), int(month), int(day))
+                        return date.strftime("%Y-%m-%d"), confidence
+                    except (ValueError, KeyError):
+                        continue
+        return None, 0.0
+
+    def _eligibility(self, title, description):
+        mask = eligibility_mask(f"{title or ''}\n{description or ''}", section=False)
+        if mask & BULGARIA:
+            named = re.search(r"(?<!\w)(bulgaria|българия)(?!\w)", description or "", re.IGNORECASE)
+            return True, 0.95 if named else 0.8
+        if mask:
+            # Countries are listed and Bulgaria is not among them
+            return False, 0.7
+        if re.search(r"(?<!\w)(българия|български)", description or "", re.IGNORECASE):
+            return True, 0.8
+        return None, 0.0
+
+    def extract(self, title, description):
+        opp_type, mode, categories = self._classify(title, description)
+        return {
+            "typeOfOpportunity": opp_type,
+            "modeOfWork": mode,
+            "categories": categories,
+            "city": self._place(self.city_pattern, title, description),
+            "country": self._place(self.country_pattern, title, description),
+            "validUntil": self._deadline(description),
+            "bulgariaEligible": self._eligibility(title, description),
+        }
+
+
+class TieredExtractor:
+    """
+    Local rules first, LLM only for what they could not settle.
+
+    build_prompt(title, description, fields) -> prompt text
+    complete(prompt) -> dict parsed from the model reply, or None on failure
+
+    Fields whose local confidence is below `threshold` are sent to the LLM in a
+    prompt that asks only for those fields; when every field is confident the
+    call is skipped. Savings are measured against the full-field prompt.
+    An optional llm_cache.ExtractionCache answers repeated posts without a call.
+    """
+
+    def __init__(self, build_prompt, complete, allowed_categories=None,
+                 threshold=DEFAULT_THRESHOLD, fields=None, cache=None):
+        self.build_prompt = build_prompt
+        self.complete = complete
+        self.cache = cache
+        self.threshold = threshold
+        self.fields = list(fields or EXTRACTION_FIELDS)
+        self.local = LocalExtractor(allowed_categories=allowed_categories)
+        self.stats = {
+            "posts": 0,
+            "llm_calls": 0,
+            "llm_calls_avoided": 0,
+            "llm_failures": 0,
+            "cache_hits": 0,
+            "fields_local": 0,
+            "fields_llm": 0,
+            "prompt_tokens_sent": 0,
+            "prompt_tokens_avoided": 0,
+        }
+
+    def _plan(self, title, description):
+        """Local pass + cache lookup; returns (result, sources, fields still needing the LLM)"""
+        self.stats["posts"] += 1
+        guesses = self.local.extract(title, description)
+
+        uncertain = [f for f in self.fields if guesses[f][1] < self.threshold]
+        result = {field: guesses[field][0] for field in self.fields}
+        sources = {field: "local" for field in self.fields}
+
+        if not uncertain:
+            full_tokens = estimate_tokens(self.build_prompt(title, description, self.fields))
+            self.stats["llm_calls_avoided"] += 1
+            self.stats["prompt_tokens_avoided"] += full_tokens
+            return result, sources, []
+
+        answer = self.cache.get(title, description, uncertain) if self.cache else None
+        if answer is not None:
+            full_tokens = estimate_tokens(self.build_prompt(title, description, self.fields))
+            self.stats["cache_hits"] += 1
+            self.stats["llm_calls_avoided"] += 1
+            self.stats["prompt_tokens_avoided"] += full_tokens
+            self._apply(result, sources, uncertain, answer)
+            return result, sources, []
+
+        return result, sources, uncertain
+
+    def _apply(self, result, sources, fields, answer):
+        """Merge LLM answers over local guesses; a missing answer keeps the local guesses"""
+        if answer is None:
+            # keep the low-confidence local guesses rather than dropping the post
+            self.stats["llm_failures"] += 1
+            return
+        for field in fields:
+            if field in answer:
+                result[field] = answer[field]
+                sources[field] = "llm"
+
+    def _finish(self, result, sources):
+        llm_fields = sum(1 for source in sources.values() if source == "llm")
+        self.stats["fields_llm"] += llm_fields
+        self.stats["fields_local"] += len(self.fields) - llm_fields
+        result["fieldSources"] = sources
+        return result
+
+    def extract(self, title, description):
+        """Return the extracted fields plus `fieldSources` (field -> "local" / "llm")"""
+        result, sources, uncertain = self._plan(title, description)
+
+        if uncertain:
+            full_tokens = estimate_tokens(self.build_prompt(title, description, self.fields))
+            prompt = self.build_prompt(title, description, uncertain)
+            prompt_tokens = estimate_tokens(prompt)
+            self.stats["llm_calls"] += 1
+            self.stats["prompt_tokens_sent"] += prompt_tokens
+            self.stats["prompt_tokens_avoided"] += max(0, full_tokens - prompt_tokens)
+
+            answer = self.complete(prompt)
+            if answer is not None and self.cache:
+                self.cache.put(title, description, answer, uncertain)
+            self._apply(result, sources, uncertain, answer)
+
+        return self._finish(result, sources)
+
+    def extract_many(self, posts, batch_extractor):
+        """
+        Extract a list of (post_id, title, description) with batched LLM requests.
+        batch_extractor is a batch_extraction.BatchExtractor; returns results in input order.
+        """
+        planned = []
+        pending = []
+        for post_id, title, description in posts:
+            result, sources, uncertain = self._plan(title, description)
+            planned.append((post_id, title, description, result, sources, uncertain))
+            if uncertain:
+                pending.append({"id": str(post_id), "title": title,
+                                "description": description, "fields": uncertain})
+
+        if pending:
+            full_tokens = sum(estimate_tokens(self.build_prompt(item["title"], item["description"], self.fields))
+                              for item in pending)
+            requests_before = batch_extractor.stats["requests"]
+            tokens_before = batch_extractor.stats["prompt_tokens_sent"]
+
+            answers = batch_extractor.run(pending)
+
+            requests = batch_extractor.stats["requests"] - requests_before
+            tokens_sent = batch_extractor.stats["prompt_tokens_sent"] - tokens_before
+            self.stats["llm_calls"] += requests
+            self.stats["llm_calls_avoided"] += max(0, len(pending) - requests)
+            self.stats["prompt_tokens_sent"] += tokens_sent
+            self.stats["prompt_tokens_avoided"] += max(0, full_tokens - tokens_sent)
+        else:
+            answers = {}
+
+        results = []
+        for post_id, title, description, result, sources, uncertain in planned:
+            if uncertain:
+                answer = answers.get(str(post_id))
+                if answer is not None and self.cache:
+                    self.cache.put(title, description, answer, uncertain)
+                self._apply(result, sources, uncertain, answer)
+            results.append(self._finish(result, sources))
+        return results
+
+    def report(self):
+        return dict(self.stats)
+
+    def print_report(self):
+        s = self.stats
+        print("\n📊 EXTRACTION SUMMARY")
+        print(f"   Posts processed: {s['posts']}")
+        print(f"   LLM calls made: {s['llm_calls']} (failed: {s['llm_failures']})")
+        print(f"   LLM calls avoided: {s['llm_calls_avoided']} (cache hits: {s['cache_hits']})")
+        print(f"   Fields resolved locally: {s['fields_local']}")
+        print(f"   Fields resolved by LLM: {s['fields_llm']}")
+        print(f"   Prompt tokens sent (est.): {s['prompt_tokens_sent']}")
+        print(f"   Prompt tokens avoided (est.): {s['prompt_tokens_avoided']}")
@@ -0,0 +1,145 @@
+import argparse
+import hashlib
+import json
+import time
+import unicodedata
+from pathlib import Path
+
+from llm_cache import SQLiteLRUCache
+
+# ---------------------------
+# Project paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = BASE_DIR / "data" / "cache"
+TRANSLATION_MEMORY_FILE = CACHE_DIR / "translation_memory.sqlite"
+
+DEFAULT_MAX_ENTRIES = 200000
+DEFAULT_LANGUAGE = "bg"
+
+
+def normalize_source(text):
+    """NFC-normalise and collapse whitespace so cosmetic differences share one entry"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def memory_key(source, text_type, model, prompt_version, language=DEFAULT_LANGUAGE):
+    payload = json.dumps([normalize_source(source), text_type, model, prompt_version, language], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory(SQLiteLRUCache):
+    """
+    On-disk translation memory backed by SQLite.
+
+    One row per (normalized source text, text_type, model, prompt version, target
+    language); the primary key is a hash of those values so lookups hit the
+    index, and a newly added language never touches the others' rows. Rows
+    carry a last_access time for least-recently-used eviction once the memory
+    grows past max_entries. Entries written under an older prompt version are
+    never returned and age out through the same eviction.
+    """
+
+    TABLE = "translations"
+    VALUE_COLUMN = "translation"
+    TITLE = "🧠 TRANSLATION MEMORY"
+    COLUMNS = ("key", "source", "text_type", "model", "prompt_version", "translation",
+               "created_at", "last_access", "language")
+
+    def __init__(self, path=TRANSLATION_MEMORY_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__(path, max_entries)
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                text_type TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                language TEXT NOT NULL DEFAULT 'bg'
+            )
+        """)
+        # memories written before per-language keys only held Bulgarian; their keys
+        # left the language out, so recompute them under the current scheme
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(translations)")]
+        if "language" not in columns:
+            self.conn.execute("ALTER TABLE translations ADD COLUMN language TEXT NOT NULL DEFAULT 'bg'")
+            rows = self.conn.execute("SELECT key, source, text_type, model, prompt_version FROM translations").fetchall()
+            self.conn.executemany("UPDATE translations SET key = ? WHERE key = ?", [
+                (memory_key(source, text_type, model, prompt_version), key)
+                for key, source, text_type, model, prompt_version in rows
+            ])
+
+    def get(self, source, text_type, model, prompt_version, language=DEFAULT_LANGUAGE):
+        """Stored translation or None"""
+        return self._lookup(memory_key(source, text_type, model, prompt_version, language))
+
+    def put(self, source, text_type, model, prompt_version, translation, language=DEFAULT_LANGUAGE):
+        now = time.time()
+        self._store(self.COLUMNS, (memory_key(source, text_type, model, prompt_version, language),
+                                   normalize_source(source), text_type, model, prompt_version, translation,
+                                   now, now, language))
+
+    def export_jsonl(self, filepath):
+        """Write every entry as one JSON object per line; returns the number written"""
+        count = 0
+        with open(filepath, "w", encoding="utf-8") as f:
+            rows = self.conn.execute(
+                "SELECT source, text_type, model, prompt_version, translation, language FROM translations"
+            )
+            for source, text_type, model, prompt_version, translation, language in rows:
+                f.write(json.dumps({
+                    "source": source,
+                    "text_type": text_type,
+                    "model": model,
+                    "prompt_version": prompt_version,
+                    "language": language,
+                    "translation": translation,
+                }, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, filepath):
+        """Load entries written by export_jsonl (existing keys are overwritten)"""
+        count = 0
+        now = time.time()
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                language = item.get("language", DEFAULT_LANGUAGE)
+                key = memory_key(item["source"], item["text_type"], item["model"], item["prompt_version"], language)
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO translations ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                    (key, normalize_source(item["source"]), item["text_type"], item["model"],
+                     item["prompt_version"], item["translation"], now, now, language)
+                )
+                count += 1
+        self.size = self.count()
+        self._evict()
+        self.conn.commit()
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or import the translation memory")
+    parser.add_argument("action", choices=["export", "import", "stats"])
+    parser.add_argument("file", nargs="?", help="JSONL file for export/import")
+    args = parser.parse_args()
+    if args.action != "stats" and not args.file:
+        parser.error(f"{args.action} needs a JSONL file")
+
+    memory = TranslationMemory()
+    if args.action == "export":
+        print(f"📤 Exported {memory.export_jsonl(args.file)} entries to {args.file}")
+    elif args.action == "import":
+        print(f"📥 Imported {memory.import_jsonl(args.file)} entries from {args.file}")
+    else:
+        print(json.dumps(memory.stats(), indent=2))
+    memory.close()
@@ -1,8 +1,16 @@
+import asyncio
 import json
 import os
+import re
 import sys
 from pathlib import Path
-from openai import OpenAI
+
+from language_detect import is_bulgarian
+from llm_cache import estimate_tokens, fingerprint, parse_json_reply
+from llm_gateway import get_gateway
+from telemetry import get_telemetry
+from rate_limit import AdaptiveThrottle, DEFAULT_MAX_CONCURRENCY
+from translation_memory import TranslationMemory, normalize_source
 
 # ---------------------------
 # Project paths (same as your other files)
@@ -14,134 +22,613 @@ DATA_DIR = BASE_DIR / "data"
 # Add the project root directory to path
 sys.path.append(str(BASE_DIR))
 
-# Import API key from config.config
-try:
-    from config.config import OPENAI_API_KEY
-    print("✅ Successfully imported OPENAI_API_KEY from config")
-except ImportError as e:
-    print("❌ Could not import OPENAI_API_KEY from config/config.py")
-    print(f"Error: {e}")
-    OPENAI_API_KEY = None
+
+MODEL = "gpt-3.5-turbo"
+SYSTEM_PROMPT = "You are a professional translator of educational and opportunity content. You reply with JSON only."
+
+# Target languages by code; every entry gets title_<code> and description_<code>
+LANGUAGE_NAMES = {
+    "bg": "Bulgarian", "ro": "Romanian", "el": "Greek", "mk": "Macedonian", "sr": "Serbian",
+    "tr": "Turkish", "de": "German", "fr": "French", "es": "Spanish", "it": "Italian",
+}
+TARGET_LANGUAGES = ["bg"]
+
+TITLE_PROMPT = """
+                Translate this opportunity title into each target language. Keep it concise and natural.
+                Target languages: {languages}
+                Return ONLY a JSON object with the language codes as keys and the translations as values.
+                
+                Title: "{text}"
+                """
+
+DESCRIPTION_PROMPT = """
+                Translate this opportunity description into each target language.
+                Keep the meaning accurate and maintain a professional tone.
+                Target languages: {languages}
+                Return ONLY a JSON object with the language codes as keys and the translations as values.
+                
+                Description: "{text}"
+                """
+
+BATCH_PROMPT = """
+                Translate each of these opportunity {label} into each target language. Keep the meaning accurate and natural.
+                Target languages: {languages}
+                The input is a JSON object mapping a number to a text.
+                Return ONLY a JSON object with the same {count} numbers as keys; each value is an object
+                with the language codes as keys and the translations as values.
+                
+                {items}
+                """
+
+# Part of every translation memory key: editing a prompt retires old entries.
+# The language is a separate part of the key, so adding one keeps the others
+PROMPT_VERSION = fingerprint(SYSTEM_PROMPT, TITLE_PROMPT, DESCRIPTION_PROMPT, BATCH_PROMPT)
+
+# Budgets for one translate_many request
+BATCH_MAX_ITEMS = 40
+BATCH_MAX_PROMPT_TOKENS = 2500
+BATCH_MAX_OUTPUT_TOKENS = 3000
+
+# Placeholder texts that are never sent for translation
+SKIP_TEXTS = [
+    "No description found", "No title found", "No description",
+    "N/A", "No image found", "No URL found", "No date found"
+]
+
+# Descriptions are translated paragraph by paragraph (lines and inline bullets);
+# a paragraph longer than MAX_CHUNK_CHARS is cut further on sentence ends
+MAX_CHUNK_CHARS = 2500
+PARAGRAPH_SPLIT_RE = re.compile(r"(\s*\n\s*|\s+(?=[•▪●◦‣]\s))")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])(\s+)")
+LETTER_RE = re.compile(r"[^\W\d_]")
+
+def split_description(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Split a description into paragraph / bullet chunks.
+    Returns a list alternating chunk, separator, chunk, ... so that
+    "".join(pieces) gives back the original text.
+    """
+    pieces = []
+    for i, piece in enumerate(PARAGRAPH_SPLIT_RE.split(text)):
+        if i % 2 or len(piece) <= max_chars:
+            pieces.append(piece)
+            continue
+        # oversized paragraph: pack whole sentences into chunks of max_chars
+        sentences = SENTENCE_SPLIT_RE.split(piece)
+        chunk = sentences[0]
+        for j in range(1, len(sentences), 2):
+            separator, sentence = sentences[j], sentences[j + 1]
+            if len(chunk) + len(separator) + len(sentence) > max_chars:
+                pieces.extend([chunk, separator])
+                chunk = sentence
+            else:
+                chunk += separator + sentence
+        pieces.append(chunk)
+    return pieces
+
+
+def translatable_chunks(pieces):
+    """Chunks of split_description output that contain words"""
+    return [piece for piece in pieces[0::2] if LETTER_RE.search(piece)]
+
+
+def join_translated(pieces, translations):
+    return "".join(translations.get(piece, piece) if i % 2 == 0 else piece for i, piece in enumerate(pieces))
+
+
+def describe_languages(languages):
+    """"bg (Bulgarian), ro (Romanian)" for the prompts"""
+    return ", ".join(f"{code} ({LANGUAGE_NAMES.get(code, code)})" for code in languages)
+
+
+def pick_languages(value, languages):
+    """{language: translation} for the requested languages found in one reply value"""
+    if isinstance(value, str) and len(languages) == 1:
+        value = {languages[0]: value}
+    if not isinstance(value, dict):
+        return {}
+    return {language: value[language].strip().strip('"\' ') for language in languages
+            if isinstance(value.get(language), str) and value[language].strip()}
+
+
+def fill_languages(found, text, languages):
+    """Complete a partial {language: translation}, keeping the original text where nothing was found"""
+    found = found or {}
+    return {language: found.get(language, text) for language in languages}
 
 
 class BulgarianTranslator:
-    def __init__(self):
-        self.client = self.setup_openai_client()
+    """
+    Translates titles and descriptions into one or more target languages
+    (Bulgarian by default). Every request asks for all missing languages of a
+    text at once and gets a JSON object keyed by language code; the translation
+    memory holds each language separately, so adding a language only requests
+    that one. Results are {language: translation} dicts.
+    """
+    
+    def __init__(self, memory=None, gateway=None, languages=None):
+        # shared OpenAI access; no client or request until the first translation
+        self.gateway = gateway if gateway is not None else get_gateway()
+        self.memory = memory if memory is not None else TranslationMemory()
+        self.languages = list(languages or TARGET_LANGUAGES)
+        self.api_calls = 0
+        self.skipped_bulgarian = 0
+        # texts answered by another copy of the same string in this run
+        self.deduplicated = 0
+        # (text_type, normalized text, languages) -> future of a request already in flight
+        self.in_flight = {}
+        # normalized texts that kept their original wording in some language (no API, errors)
+        self.untranslated = set()
         
-    def setup_openai_client(self):
-        """Setup OpenAI client with API key"""
-        if not OPENAI_API_KEY:
-            print("❌ OPENAI_API_KEY not found in config.py")
-            return None
+    def _fill(self, found, text, languages):
+        """fill_languages, remembering texts that had to fall back to the original"""
+        found = found or {}
+        if text and text not in SKIP_TEXTS and any(language not in found for language in languages):
+            self.untranslated.add(normalize_source(text))
+        return fill_languages(found, text, languages)
+    
+    def is_complete(self, entry):
+        """True unless the entry's title or a description paragraph fell back to the original text"""
+        texts = [entry.get('title')]
+        if entry.get('description'):
+            texts.extend(translatable_chunks(split_description(entry['description'])))
+        return not any(text and normalize_source(text) in self.untranslated for text in texts)
+    
+    def already_bulgarian(self, text):
+        """True (and counted as a saved call) if the text needs no translation"""
+        if is_bulgarian(text):
+            self.skipped_bulgarian += 1
+            return True
+        return False
+    
+    def cached_translation(self, text, text_type, languages, source=None):
+        """
+        Answer without the API when possible: placeholder texts, text that is
+        already Bulgarian and translation memory hits.
+        Returns ({language: translation} found, languages still to translate).
+        """
+        if not text or text in SKIP_TEXTS:
+            return {language: text for language in languages}, []
         
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            # Test the connection with a simple request
-            test_response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Translate 'hello' to Bulgarian"}],
-                max_tokens=10
-            )
-            print("✅ OpenAI translator client configured successfully")
-            return client
-        except Exception as e:
-            print(f"❌ Failed to setup OpenAI translator client: {e}")
-            return None
+        found, missing = {}, []
+        for language in languages:
+            if language == "bg" and self.already_bulgarian(text):
+                found[language] = text
+                continue
+            # Unchanged text from a previous run: no API call
+            remembered = self.memory.get(text, text_type, MODEL, PROMPT_VERSION, language)
+            if remembered is not None:
+                get_telemetry().record_cache_hits(f"translate_{text_type}", 1, source=source)
+                found[language] = remembered
+            else:
+                missing.append(language)
+        return found, missing
     
-    def translate_text(self, text, text_type="text"):
+    def remember(self, text, text_type, translations):
+        for language, translation in translations.items():
+            self.memory.put(text, text_type, MODEL, PROMPT_VERSION, translation, language)
+    
+    def translate(self, text, text_type="text", languages=None, source=None):
         """
-        Translate text to Bulgarian using OpenAI GPT
+        Translate text into every target language using OpenAI GPT
         text_type: "title" or "description" for better context
+        source: scraper the text came from, for telemetry
+        Returns {language: translation}; the original text stands in for failures.
         """
-        if not text or not self.client:
-            return text
+        languages = list(languages or self.languages)
+        if text_type == "description":
+            return self.translate_description(text, languages, source)
         
-        # Skip translation for common placeholder texts
-        skip_texts = [
-            "No description found", "No title found", "No description", 
-            "N/A", "No image found", "No URL found", "No date found"
-        ]
-        if text in skip_texts:
-            return text
+        found, missing = self.cached_translation(text, text_type, languages, source)
+        if missing and self.gateway.available:
+            found.update(self.request_translation(text, text_type, missing, source))
+        return self._fill(found, text, languages)
+    
+    def translate_text(self, text, text_type="text", language="bg"):
+        """Translation of text into a single language"""
+        return self.translate(text, text_type, [language])[language]
+    
+    def build_request(self, text, text_type, languages):
+        """Chat completion arguments for one text in all given languages"""
+        # Create context-based prompt
+        if text_type == "title":
+            prompt = TITLE_PROMPT.format(text=text, languages=describe_languages(languages))
+            per_language = 100
+        else:  # description paragraph (split_description keeps chunks small)
+            prompt = DESCRIPTION_PROMPT.format(text=text, languages=describe_languages(languages))
+            per_language = 2 * estimate_tokens(text) + 50
         
+        return {
+            "model": MODEL,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+            "max_tokens": min(4000, per_language * len(languages)),
+        }
+    
+    def parse_reply(self, response, languages):
+        return pick_languages(parse_json_reply(response.choices[0].message.content), languages)
+    
+    def request_translation(self, text, text_type, languages, source=None):
+        """One round-trip to the API for all given languages; {language: translation} it answered"""
+        self.api_calls += 1
+        response = self.gateway.complete(label=text_type, stage=f"translate_{text_type}", source=source,
+                                         **self.build_request(text, text_type, languages))
+        translations = self.parse_reply(response, languages) if response is not None else {}
+        self.remember(text, text_type, translations)
+        return translations
+    
+    async def request_text_async(self, text, text_type, languages, throttle, source=None):
+        """One single-text request (no memory or in-flight lookup); original text on failure"""
+        self.api_calls += 1
+        response = await self.gateway.complete_async(self.build_request(text, text_type, languages), throttle,
+                                                     text_type, stage=f"translate_{text_type}", source=source)
+        translations = self.parse_reply(response, languages) if response is not None else {}
+        self.remember(text, text_type, translations)
+        return self._fill(translations, text, languages)
+    
+    def claim(self, text, text_type, languages):
+        """
+        In-flight coalescing: return the future of an identical request that is
+        already running, or register a new future for the caller (and return None).
+        The caller must resolve its future with settle().
+        """
+        key = (text_type, normalize_source(text), tuple(languages))
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            self.deduplicated += 1
+            return pending
+        self.in_flight[key] = asyncio.get_running_loop().create_future()
+        return None
+    
+    def settle(self, text, text_type, languages, translations):
+        future = self.in_flight.pop((text_type, normalize_source(text), tuple(languages)), None)
+        if future is not None and not future.done():
+            future.set_result(translations)
+    
+    async def translate_text_async(self, text, text_type, throttle, languages=None):
+        """Async translate(); the original text stands in for failures"""
+        languages = list(languages or self.languages)
+        found, missing = self.cached_translation(text, text_type, languages)
+        if not missing:
+            return found
+        
+        pending = self.claim(text, text_type, missing)
+        if pending is not None:
+            found.update(await pending)
+            return found
+        translations = fill_languages({}, text, missing)
         try:
-            # Create context-based prompt
-            if text_type == "title":
-                prompt = f"""
-                Translate this opportunity title to Bulgarian. Keep it concise and natural.
-                Return ONLY the Bulgarian translation, no explanations.
-                
-                Title: "{text}"
-                
-                Bulgarian translation:
-                """
-            else:  # description
-                # Limit description length to avoid token limits
-                if len(text) > 3000:
-                    text = text[:3000] + "..."
-                
-                prompt = f"""
-                Translate this opportunity description to Bulgarian. 
-                Keep the meaning accurate and maintain a professional tone.
-                Return ONLY the Bulgarian translation, no explanations.
-                
-                Description: "{text}"
-                
-                Bulgarian translation:
-                """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional translator specializing in English to Bulgarian translation for educational and opportunity content."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=2000 if text_type == "description" else 100
+            translations = await self.request_text_async(text, text_type, missing, throttle)
+        finally:
+            self.settle(text, text_type, missing, translations)
+        found.update(translations)
+        return found
+    
+    def plan_batches(self, texts, language_count=1):
+        """
+        Group texts into batches that fit the prompt and output token budgets.
+        Each target language takes roughly twice the tokens of the input.
+        """
+        batches = []
+        batch, prompt_tokens, output_tokens = [], 0, 0
+        for text in texts:
+            item_tokens = estimate_tokens(text) + 4
+            item_output = language_count * (2 * estimate_tokens(text) + 6) + 4
+            if batch and (len(batch) >= BATCH_MAX_ITEMS
+                          or prompt_tokens + item_tokens > BATCH_MAX_PROMPT_TOKENS
+                          or output_tokens + item_output > BATCH_MAX_OUTPUT_TOKENS):
+                batches.append((batch, output_tokens))
+                batch, prompt_tokens, output_tokens = [], 0, 0
+            batch.append(text)
+            prompt_tokens += item_tokens
+            output_tokens += item_output
+        if batch:
+            batches.append((batch, output_tokens))
+        return batches
+    
+    def build_batch_request(self, batch, text_type, output_tokens, languages):
+        items = json.dumps({str(i): text for i, text in enumerate(batch, 1)}, ensure_ascii=False, indent=0)
+        label = {"title": "titles", "paragraph": "description paragraphs"}.get(text_type, "texts")
+        prompt = BATCH_PROMPT.format(label=label, count=len(batch), items=items,
+                                     languages=describe_languages(languages))
+        return {
+            "model": MODEL,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+            "max_tokens": min(BATCH_MAX_OUTPUT_TOKENS, output_tokens + 20),
+        }
+    
+    def parse_batch_reply(self, response, batch, languages):
+        """
+        {text: {language: translation}} for every batch item the reply answered;
+        empty when the reply has a different number of items than the batch
+        """
+        data = parse_json_reply(response.choices[0].message.content)
+        if isinstance(data, list) and len(data) == len(batch):
+            data = {str(i): value for i, value in enumerate(data, 1)}
+        if not isinstance(data, dict):
+            print(f"⚠️ Batch reply for {len(batch)} texts was not a JSON object")
+            return {}
+        if len(data) != len(batch):
+            # items may have shifted; translate the whole batch one text at a time instead
+            print(f"⚠️ Batch reply has {len(data)} items for {len(batch)} texts - falling back per item")
+            return {}
+        
+        answers = {}
+        for i, text in enumerate(batch, 1):
+            translations = pick_languages(data.get(str(i)), languages)
+            if translations:
+                answers[text] = translations
+        return answers
+    
+    def _remember_batch(self, texts, text_type, languages, source=None):
+        """
+        Group texts by normalized form and split them into ({normalized:
+        {language: translation}} known without the API, {missing languages:
+        distinct texts}). Texts only lacking a newly added language are grouped
+        under that language alone.
+        """
+        known, missing, seen = {}, {}, set()
+        for text in texts:
+            key = normalize_source(text)
+            if key in seen:
+                self.deduplicated += 1
+                continue
+            seen.add(key)
+            if not key:
+                known[key] = {language: text for language in languages}
+                continue
+            found, languages_missing = self.cached_translation(text, text_type, languages, source)
+            known[key] = found
+            if languages_missing:
+                missing.setdefault(tuple(languages_missing), []).append(text)
+        return known, missing
+    
+    def translate_many(self, texts, text_type="title", languages=None, source=None):
+        """
+        Translate a list of texts, several per request as a numbered JSON object
+        with every missing language per item. Copies that only differ in
+        whitespace are translated once. Batch size follows the token estimate;
+        languages missing from a reply fall back to one request per text.
+        Returns {language: translation} dicts in the input order.
+        """
+        languages = list(languages or self.languages)
+        known, missing = self._remember_batch(texts, text_type, languages, source)
+        if missing and self.gateway.available:
+            for group_languages, group in missing.items():
+                group_languages = list(group_languages)
+                for batch, output_tokens in self.plan_batches(group, len(group_languages)):
+                    answers = {}
+                    if len(batch) > 1:
+                        self.api_calls += 1
+                        response = self.gateway.complete(
+                            label=f"{len(batch)} {text_type}s",
+                            stage=f"translate_{text_type}",
+                            source=source,
+                            **self.build_batch_request(batch, text_type, output_tokens, group_languages)
+                        )
+                        if response is not None:
+                            answers = self.parse_batch_reply(response, batch, group_languages)
+                    for text in batch:
+                        translations = answers.get(text, {})
+                        self.remember(text, text_type, translations)
+                        rest = [language for language in group_languages if language not in translations]
+                        if rest:
+                            translations.update(self.request_translation(text, text_type, rest, source))
+                        known[normalize_source(text)].update(translations)
+        return [self._fill(known.get(normalize_source(text)), text, languages) for text in texts]
+    
+    async def translate_many_async(self, texts, text_type, throttle, languages=None, source=None):
+        """
+        Async translate_many; batches run concurrently behind the throttle.
+        Texts another task is already translating wait for that result instead
+        of being sent again.
+        """
+        languages = list(languages or self.languages)
+        known, missing = self._remember_batch(texts, text_type, languages, source)
+        owned, waiting = {}, []
+        for group_languages, group in missing.items():
+            for text in group:
+                pending = self.claim(text, text_type, group_languages)
+                if pending is None:
+                    owned.setdefault(group_languages, []).append(text)
+                else:
+                    waiting.append((normalize_source(text), pending))
+        
+        async def run_batch(batch, output_tokens, group_languages):
+            answers = {}
+            try:
+                if len(batch) > 1:
+                    request = self.build_batch_request(batch, text_type, output_tokens, group_languages)
+                    self.api_calls += 1
+                    response = await self.gateway.complete_async(request, throttle, f"{len(batch)} {text_type}s",
+                                                                 stage=f"translate_{text_type}", source=source)
+                    if response is not None:
+                        answers = self.parse_batch_reply(response, batch, group_languages)
+                for text in batch:
+                    translations = answers.get(text, {})
+                    self.remember(text, text_type, translations)
+                    rest = [language for language in group_languages if language not in translations]
+                    if rest:
+                        translations.update(await self.request_text_async(text, text_type, rest, throttle, source))
+                    known[normalize_source(text)].update(translations)
+                    self.settle(text, text_type, group_languages, translations)
+            finally:
+                # never leave waiters hanging if this batch blew up
+                for text in batch:
+                    self.settle(text, text_type, group_languages, fill_languages({}, text, group_languages))
+        
+        runs = [run_batch(batch, tokens, list(group_languages))
+                for group_languages, group in owned.items()
+                for batch, tokens in self.plan_batches(group, len(group_languages))]
+        if runs:
+            await asyncio.gather(*runs)
+        for key, pending in waiting:
+            known[key].update(await pending)
+        return [self._fill(known.get(normalize_source(text)), text, languages) for text in texts]
+    
+    def description_languages(self, text, languages):
+        """Languages a whole description still needs (Bulgarian text is kept as is)"""
+        if "bg" in languages and self.already_bulgarian(text):
+            return [language for language in languages if language != "bg"]
+        return list(languages)
+    
+    def translate_description(self, text, languages=None, source=None):
+        """
+        Translate a description paragraph by paragraph. Paragraphs are batched,
+        cached one by one in the translation memory and reassembled in order.
+        """
+        languages = list(languages or self.languages)
+        if not text or text in SKIP_TEXTS:
+            return {language: text for language in languages}
+        needed = self.description_languages(text, languages)
+        if not needed:
+            return {language: text for language in languages}
+        pieces = split_description(text)
+        chunks = translatable_chunks(pieces)
+        translated = self.translate_many(chunks, "paragraph", needed, source)
+        result = {language: text for language in languages}
+        for language in needed:
+            result[language] = join_translated(
+                pieces, {chunk: t[language] for chunk, t in zip(chunks, translated)}
             )
-            
-            translated_text = response.choices[0].message.content.strip()
-            
-            # Clean up any quotes or extra spaces
-            translated_text = translated_text.strip('"\' ')
-            
-            return translated_text
-            
-        except Exception as e:
-            print(f"⚠️ Translation error for {text_type}: {e}")
-            return text
+        return result
+    
+    async def translate_descriptions_async(self, descriptions, throttle, languages=None, source=None):
+        """
+        Translate many descriptions at once: paragraphs of all descriptions are
+        pooled, so boilerplate shared across posts is translated a single time,
+        and the paragraph batches run concurrently.
+        """
+        languages = list(languages or self.languages)
+        layouts, needs = [], []
+        for text in descriptions:
+            needed = self.description_languages(text, languages) if text and text not in SKIP_TEXTS else []
+            layouts.append(split_description(text) if needed else None)
+            needs.append(tuple(needed))
+        
+        # one pool of paragraphs per set of needed languages
+        pools = {}
+        for pieces, needed in zip(layouts, needs):
+            if pieces:
+                pools.setdefault(needed, []).extend(translatable_chunks(pieces))
+        pools = {needed: list(dict.fromkeys(chunks)) for needed, chunks in pools.items()}
+        for needed, unique in pools.items():
+            print(f"📄 {source or 'unknown'}: {len(unique)} distinct description paragraphs for {', '.join(needed)}")
+        
+        translated = await asyncio.gather(*(
+            self.translate_many_async(unique, "paragraph", throttle, list(needed), source)
+            for needed, unique in pools.items()
+        ))
+        translations = {needed: dict(zip(unique, result))
+                        for (needed, unique), result in zip(pools.items(), translated)}
+        
+        results = []
+        for pieces, needed, text in zip(layouts, needs, descriptions):
+            result = {language: text for language in languages}
+            for language in needed:
+                result[language] = join_translated(
+                    pieces, {chunk: t[language] for chunk, t in translations[needed].items()}
+                )
+            results.append(result)
+        return results
+    
+    async def translate_entries_async(self, entries, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        throttle = AdaptiveThrottle(max_concurrency=max_concurrency)
+        # one group per source so telemetry splits translation cost by scraper;
+        # texts shared across sources are still sent once (in-flight claims)
+        groups = {}
+        for entry in entries:
+            groups.setdefault(entry.get('source'), []).append(entry)
+        
+        async def translate_group(source, group):
+            titles = [entry.get('title') for entry in group]
+            descriptions = [entry.get('description') for entry in group]
+            if not self.gateway.available:
+                return (self.translate_many(titles, "title", source=source),
+                        [self.translate_description(text, source=source) for text in descriptions])
+            # Titles (batched) and description paragraphs share the throttle
+            return await asyncio.gather(
+                self.translate_many_async(titles, "title", throttle, source=source),
+                self.translate_descriptions_async(descriptions, throttle, source=source),
+            )
+        
+        try:
+            results = await asyncio.gather(*(translate_group(source, group) for source, group in groups.items()))
+        finally:
+            await self.gateway.aclose()
+        
+        # results come back in input order within each group
+        for group, (titles, descriptions) in zip(groups.values(), results):
+            for entry, title, description in zip(group, titles, descriptions):
+                for language in self.languages:
+                    if entry.get('title'):
+                        entry[f'title_{language}'] = title[language]
+                    if entry.get('description'):
+                        entry[f'description_{language}'] = description[language]
+        
+        s = throttle.stats
+        print(f"🚦 Requests: {s['requests']}  Rate limited: {s['rate_limited']}  "
+              f"Pauses: {s['pauses']}  Lowest concurrency: {s['min_limit']}")
+        return entries
+    
+    def translate_entries(self, entries, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Translate many entries concurrently; returns them in the input order"""
+        if not self.gateway.available:
+            print("⚠️ OpenAI client not available - using translation memory only")
+        return asyncio.run(self.translate_entries_async(entries, max_concurrency))
     
     def translate_entry(self, entry):
-        """Add Bulgarian translations to an entry"""
-        if not self.client:
-            print("❌ OpenAI client not available for translation")
-            return entry
+        """Add translations in every target language to an entry"""
+        if not self.gateway.available:
+            print("⚠️ OpenAI client not available - using translation memory only")
         
         print(f"🔤 Translating: {entry.get('title', '')[:50]}...")
         
-        # Translate title
-        if entry.get('title'):
-            entry['title_bg'] = self.translate_text(entry['title'], "title")
-        
-        # Translate description
-        if entry.get('description'):
-            entry['description_bg'] = self.translate_text(entry['description'], "description")
+        for field, text_type in (("title", "title"), ("description", "description")):
+            if entry.get(field):
+                for language, translation in self.translate(entry[field], text_type,
+                                                            source=entry.get("source")).items():
+                    entry[f"{field}_{language}"] = translation
         
         return entry
 
-# Singleton instance
-translator = BulgarianTranslator()
+# Singleton instance, created on first use so importing this module opens nothing
+_translator = None
+
+def get_translator():
+    """Process-wide translator, created on first use"""
+    global _translator
+    if _translator is None:
+        _translator = BulgarianTranslator()
+    return _translator
 
 def translate_to_bulgarian(text, text_type="text"):
     """Convenience function for single text translation"""
-    return translator.translate_text(text, text_type)
+    return get_translator().translate_text(text, text_type, "bg")
 
 def translate_entry(entry):
     """Convenience function for entry translation"""
-    return translator.translate_entry(entry)
+    return get_translator().translate_entry(entry)
+
+def translate_many(texts, text_type="title", languages=None):
+    """Convenience function for batched translation of short texts ({language: translation} each)"""
+    return get_translator().translate_many(texts, text_type, languages)
+
+def translate_entries(entries, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Convenience function for concurrent translation of many entries"""
+    return get_translator().translate_entries(entries, max_concurrency)
 
 if __name__ == "__main__":
     # Test the translator
     test_text = "Youth exchange program in Sofia"
     translated = translate_to_bulgarian(test_text, "title")
-    print(f"Test translation: '{test_text}' -> '{translated}'")
\ No newline at end of file
+    print(f"Test translation: '{test_text}' -> '{translated}'")